@@ -0,0 +1,95 @@
+"""
+Benchmark CLI cold start: wall time, import time and modules imported by
+``main.py --help``, against a run that imports every package export (what
+eager package __init__ files would cost).
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs N] [--top N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+
+PACKAGES = (
+    "src.agents", "src.content_blocks", "src.ingestion", "src.instrumentation",
+    "src.models", "src.output", "src.pipeline", "src.templates"
+)
+
+IMPORT_ALL = (
+    "import importlib, sys\n"
+    f"sys.path.insert(0, {str(project_root)!r})\n"
+    f"for name in {PACKAGES!r}:\n"
+    "    package = importlib.import_module(name)\n"
+    "    for export in package.__all__:\n"
+    "        getattr(package, export)\n"
+)
+
+COMMANDS = {
+    "cli --help": [str(project_root / "src" / "main.py"), "--help"],
+    "all exports": ["-c", IMPORT_ALL]
+}
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark CLI cold start')
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Interpreter starts per command')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Slowest imports listed for the CLI (0 for none)')
+    return parser.parse_args()
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Module -> (self, cumulative) import microseconds from -X importtime output"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        imports[module.strip()] = (int(self_us), int(cumulative_us))
+    return imports
+
+
+def run(args: List[str]) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Return (wall milliseconds, imports) for one interpreter start"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        capture_output=True, text=True, check=True
+    )
+    elapsed = time.perf_counter() - start
+    return elapsed * 1e3, parse_importtime(result.stderr)
+
+
+def main():
+    args = parse_arguments()
+    runs = max(1, args.runs)
+
+    print(f"{'command':<14} {'wall ms':>9} {'import ms':>10} {'modules':>8}")
+    cli_imports = {}
+    for label, command in COMMANDS.items():
+        walls, totals = [], []
+        for _ in range(runs):
+            wall, imports = run(command)
+            walls.append(wall)
+            totals.append(sum(self_us for self_us, _ in imports.values()) / 1e3)
+        if label == "cli --help":
+            cli_imports = imports
+        print(f"{label:<14} {statistics.median(walls):>9.1f} {statistics.median(totals):>10.1f} {len(imports):>8}")
+
+    if args.top > 0:
+        print("\nSlowest imports of cli --help (cumulative ms, last run):")
+        slowest = sorted(cli_imports.items(), key=lambda item: item[1][1], reverse=True)
+        for module, (_, cumulative_us) in slowest[:args.top]:
+            print(f"  {cumulative_us / 1e3:>8.1f}  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Benchmark page serialization: bytes and microseconds per page for each
+serializer mode and available backend.
+
+Usage:
+    python benchmarks/bench_serialization.py [--input PATH] [--iterations N]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.agents import OrchestratorAgent
+from src.config import Config
+from src.output import PAGE_FILES, JSONSerializer
+from src.output.serialization import orjson
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark page serialization')
+    parser.add_argument('--input', type=str, default=str(Config.PRODUCT_DATA_FILE),
+                        help='Product data JSON file (one product)')
+    parser.add_argument('--iterations', type=int, default=2000,
+                        help='Encodes per page and serializer')
+    return parser.parse_args()
+
+
+def bench(serializer, pages, iterations):
+    """Return (bytes per page, microseconds per page)"""
+    size = sum(len(serializer.dumps(page)) for page in pages) / len(pages)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for page in pages:
+            serializer.dumps(page)
+    elapsed = time.perf_counter() - start
+    return size, elapsed / (iterations * len(pages)) * 1e6
+
+
+def main():
+    args = parse_arguments()
+    with open(args.input, 'r', encoding='utf-8') as f:
+        product = json.load(f)
+
+    results = OrchestratorAgent().execute(product)
+    pages = [results[page_type] for page_type in PAGE_FILES]
+
+    backends = ["json"] + (["orjson"] if orjson is not None else [])
+    print(f"{'serializer':<16} {'bytes/page':>12} {'us/page':>10}")
+    for backend in backends:
+        for compact in (False, True):
+            serializer = JSONSerializer(compact=compact, backend=backend)
+            size, micros = bench(serializer, pages, args.iterations)
+            print(f"{serializer.name:<16} {size:>12.0f} {micros:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Lazy package exports: import a submodule only when one of its names is used
+"""
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(module_name: str, exports: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    Build a package's module-level ``__getattr__`` and ``__dir__``.
+
+    Importing the package stays cheap: each exported name is imported from
+    its submodule on first access and then cached in the package globals.
+
+    Args:
+        module_name: The package's ``__name__``
+        exports: Public name -> defining submodule (relative, e.g. ".product")
+
+    Returns:
+        ``(__getattr__, __dir__)`` to assign in the package
+    """
+    def __getattr__(name: str) -> object:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, module_name), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module_name])) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,18 +1,21 @@
 """Agents package"""
-from .base_agent import BaseAgent
-from .data_parser_agent import DataParserAgent
-from .question_generator_agent import QuestionGeneratorAgent
-from .faq_generator_agent import FAQGeneratorAgent
-from .product_page_generator_agent import ProductPageGeneratorAgent
-from .comparison_generator_agent import ComparisonGeneratorAgent
-from .orchestrator_agent import OrchestratorAgent
+from .._lazy import lazy_exports
 
-__all__ = [
-    'BaseAgent',
-    'DataParserAgent',
-    'QuestionGeneratorAgent',
-    'FAQGeneratorAgent',
-    'ProductPageGeneratorAgent',
-    'ComparisonGeneratorAgent',
-    'OrchestratorAgent'
-]
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'BaseAgent': '.base_agent',
+    'DataParserAgent': '.data_parser_agent',
+    'QuestionGeneratorAgent': '.question_generator_agent',
+    'FAQGeneratorAgent': '.faq_generator_agent',
+    'ProductPageGeneratorAgent': '.product_page_generator_agent',
+    'ComparisonGeneratorAgent': '.comparison_generator_agent',
+    'OrchestratorAgent': '.orchestrator_agent',
+    'RetryPolicy': '.retry_policy',
+    'RetryBudget': '.retry_policy',
+    'CircuitBreaker': '.retry_policy'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import time
-from ..exceptions import AgentExecutionError
+from ..config import Config
+from ..exceptions import AgentExecutionError, CircuitOpenError, DeadlineExceededError
+from ..instrumentation import bind_deadline, get_metrics, get_registry, instrument_subclass
+from ..utils import AgentLogger, Deadline
+from .retry_policy import CircuitBreaker, RetryPolicy
 
 
 class BaseAgent(ABC):
@@ -10,12 +14,18 @@ class BaseAgent(ABC):
     Each agent has a single responsibility and defined input/output contract.
     """
     
-    def __init__(self, name: str, max_retries: int = 3):
+    def __init__(self, name: str, max_retries: int = Config.RETRY_MAX_ATTEMPTS):
         self.name = name
         self.state: Dict[str, Any] = {}
         self.max_retries = max_retries
-        self.execution_count = 0
-        self.total_execution_time = 0.0
+        self.retry_policy = RetryPolicy(max_attempts=max_retries)
+        self.circuit_breaker = CircuitBreaker()
+        self.logger = AgentLogger.get_logger(name)
+    
+    def __init_subclass__(cls, **kwargs):
+        """Time and trace every call of a subclass's execute()"""
+        super().__init_subclass__(**kwargs)
+        instrument_subclass(cls, "execute", category="agent")
     
     @abstractmethod
     def execute(self, input_data: Any) -> Any:
@@ -33,42 +43,88 @@ class BaseAgent(ABC):
         """
         pass
     
-    def execute_with_retry(self, input_data: Any) -> Any:
+    def execute_with_retry(self, input_data: Any, deadline: Optional[Deadline] = None) -> Any:
         """
-        Execute with retry logic for robustness.
+        Execute under the agent's retry policy and circuit breaker.
+        
+        Only errors the policy deems transient are retried, after a
+        jittered exponential backoff, while the retry budget, the circuit
+        breaker and the deadline allow it. Other errors are deterministic
+        (bad input) and are raised as they are on the first attempt.
         
         Args:
             input_data: Input data
+            deadline: Time budget for all attempts; each attempt runs with
+                it bound, and no retry is started that the remaining budget
+                cannot cover
             
         Returns:
             Execution result
             
         Raises:
-            AgentExecutionError: If all retries fail
+            AgentExecutionError: If retries are exhausted or not allowed
+            CircuitOpenError: If the agent's circuit is open
+            DeadlineExceededError: If the deadline expires first
         """
-        last_error = None
+        policy = self.retry_policy
+        deadline = deadline or Deadline()
         
-        for attempt in range(self.max_retries):
+        if not self.circuit_breaker.allow():
+            self._count_circuit_rejection()
+            raise CircuitOpenError(f"{self.name} is unavailable after repeated failures (circuit open)")
+        if policy.budget is not None:
+            policy.budget.record_attempt()
+        
+        attempt = 0
+        while True:
             try:
-                start_time = time.time()
-                result = self.execute(input_data)
-                execution_time = time.time() - start_time
-                
-                self.execution_count += 1
-                self.total_execution_time += execution_time
+                deadline.check(self.name)
+                with bind_deadline(deadline):
+                    result = self.execute(input_data)
+            except DeadlineExceededError:
+                self.circuit_breaker.record_failure()
+                raise
+            except Exception as e:
+                if not policy.is_retryable(e):
+                    # The agent answered; the input is at fault
+                    self.circuit_breaker.record_success()
+                    raise
                 
-                return result
+                self.circuit_breaker.record_failure()
+                attempt += 1
+                self.warning("Attempt %d/%d failed: %s", attempt, policy.max_attempts, e)
+                if attempt >= policy.max_attempts:
+                    raise AgentExecutionError(f"{self.name} failed after {attempt} attempts: {e}") from e
                 
-            except Exception as e:
-                last_error = e
-                self.log(f"Attempt {attempt + 1}/{self.max_retries} failed: {str(e)}")
+                delay = policy.backoff(attempt - 1)
+                remaining = deadline.remaining()
+                if remaining is not None and remaining <= delay:
+                    raise DeadlineExceededError(
+                        f"{self.name} ran out of time after {attempt} attempts: {e}"
+                    ) from e
+                if policy.budget is not None and not policy.budget.try_spend():
+                    raise AgentExecutionError(
+                        f"{self.name} failed after {attempt} attempts (retry budget exhausted): {e}"
+                    ) from e
+                if not self.circuit_breaker.allow():
+                    self._count_circuit_rejection()
+                    raise CircuitOpenError(
+                        f"{self.name} failed after {attempt} attempts (circuit open): {e}"
+                    ) from e
                 
-                if attempt < self.max_retries - 1:
-                    time.sleep(0.1 * (attempt + 1))  # Exponential backoff
-        
-        raise AgentExecutionError(
-            f"{self.name} failed after {self.max_retries} attempts: {str(last_error)}"
-        )
+                get_metrics().counter(
+                    "pipeline_agent_retries", "Agent executions retried after a failure.", ["agent"]
+                ).inc(agent=self.name)
+                time.sleep(delay)
+                continue
+            
+            self.circuit_breaker.record_success()
+            return result
+    
+    def _count_circuit_rejection(self) -> None:
+        get_metrics().counter(
+            "pipeline_circuit_rejections", "Agent executions rejected by an open circuit.", ["agent"]
+        ).inc(agent=self.name)
     
     def get_name(self) -> str:
         """Get agent name"""
@@ -91,32 +147,53 @@ class BaseAgent(ABC):
             raise ValueError(f"{self.name}: Input data cannot be None")
         return True
     
-    def log(self, message: str, level: str = "info") -> None:
+    def log(self, message: str, *args: Any, level: str = "info") -> None:
         """
         Log agent activity.
         
         Args:
-            message: Log message
-            level: Log level (info, warning, error)
+            message: Log message, optionally with %-style placeholders
+            *args: Values for the placeholders, formatted only if the
+                message is actually emitted
+            level: Log level (debug, info, warning, error)
         """
-        prefix = f"[{self.name}]"
         if level == "error":
-            print(f"{prefix} ERROR: {message}")
+            self.logger.error(message, *args)
         elif level == "warning":
-            print(f"{prefix} WARNING: {message}")
+            self.logger.warning(message, *args)
+        elif level == "debug":
+            self.logger.debug(message, *args)
         else:
-            print(f"{prefix} {message}")
+            self.logger.info(message, *args)
+    
+    def debug(self, message: str, *args: Any) -> None:
+        """Log per-product progress detail (hidden at INFO and above)"""
+        self.logger.debug(message, *args)
+    
+    def warning(self, message: str, *args: Any) -> None:
+        """Log a recoverable problem"""
+        self.logger.warning(message, *args)
+    
+    def error(self, message: str, *args: Any) -> None:
+        """Log a failure"""
+        self.logger.error(message, *args)
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get execution statistics"""
-        avg_time = (
-            self.total_execution_time / self.execution_count 
-            if self.execution_count > 0 else 0
-        )
+        """
+        Get execution statistics.
+        
+        Latencies come from the shared stats registry, so they cover every
+        call of execute() by any agent with this name, in seconds.
+        """
+        stats = get_registry().stage_stats(self.name)
         
         return {
             "name": self.name,
-            "executions": self.execution_count,
-            "total_time": round(self.total_execution_time, 3),
-            "average_time": round(avg_time, 3)
+            "executions": stats["count"],
+            "total_time": stats["total"],
+            "average_time": stats["mean"],
+            "p50_time": stats["p50"],
+            "p90_time": stats["p90"],
+            "p99_time": stats["p99"],
+            "max_time": stats["max"]
         }
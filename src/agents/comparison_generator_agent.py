@@ -5,6 +5,7 @@ from typing import Dict, Any
 from .base_agent import BaseAgent
 from ..templates import ComparisonTemplate
 from ..models.product import Product
+from ..instrumentation import record_cache_lookup
 
 
 class ComparisonGeneratorAgent(BaseAgent):
@@ -19,6 +20,7 @@ class ComparisonGeneratorAgent(BaseAgent):
     def __init__(self):
         super().__init__("ComparisonGeneratorAgent")
         self.template = ComparisonTemplate()
+        self._product_b = None
     
     def execute(self, input_data: Product) -> Dict[str, Any]:
         """
@@ -30,12 +32,12 @@ class ComparisonGeneratorAgent(BaseAgent):
         Returns:
             Dict: Rendered comparison page
         """
-        self.log("Generating comparison page...")
+        self.debug("Generating comparison page...")
         
-        # Create fictional Product B
-        product_b = self._create_fictional_product_b()
+        # Create fictional Product B (identical for every product, so built once)
+        product_b = self._get_fictional_product_b()
         
-        self.log(f"Comparing {input_data.product_name} vs {product_b.product_name}")
+        self.debug("Comparing %s vs %s", input_data.product_name, product_b.product_name)
         
         # Render using template
         comparison_page = self.template.render({
@@ -43,10 +45,18 @@ class ComparisonGeneratorAgent(BaseAgent):
             'product_b': product_b
         })
         
-        self.log("Comparison page generated successfully")
+        self.debug("Comparison page generated successfully")
         
         return comparison_page
     
+    def _get_fictional_product_b(self) -> Product:
+        """Get the cached fictional Product B, creating it on first use"""
+        hit = self._product_b is not None
+        record_cache_lookup("comparison_product_b", hit)
+        if not hit:
+            self._product_b = self._create_fictional_product_b()
+        return self._product_b
+    
     def _create_fictional_product_b(self) -> Product:
         """
         Create a structured fictional product for comparison.
@@ -5,6 +5,8 @@ import json
 from typing import Dict, Any
 from .base_agent import BaseAgent
 from ..models.product import Product
+from ..models.record import InvalidRecord
+from ..utils import get_product_id
 
 
 class DataParserAgent(BaseAgent):
@@ -28,7 +30,7 @@ class DataParserAgent(BaseAgent):
         Returns:
             Product: Validated product model
         """
-        self.log("Parsing product data...")
+        self.debug("Parsing product data...")
         
         # Validate input
         self.validate_input(input_data)
@@ -36,10 +38,10 @@ class DataParserAgent(BaseAgent):
         # Parse into Product model (Pydantic will validate)
         try:
             product = Product(**input_data)
-            self.log(f"Successfully parsed product: {product.product_name}")
+            self.debug("Successfully parsed product: %s", product.product_name)
             return product
         except Exception as e:
-            self.log(f"Error parsing product data: {str(e)}")
+            self.error("Error parsing product data: %s", e)
             raise
     
     def validate_input(self, input_data: Any) -> bool:
@@ -52,9 +54,18 @@ class DataParserAgent(BaseAgent):
         
         if not isinstance(input_data, dict):
             raise ValueError("Input must be a dictionary")
+        if isinstance(input_data, InvalidRecord):
+            raise input_data.error
         
         for field in required_fields:
             if field not in input_data:
                 raise ValueError(f"Missing required field: {field}")
         
+        # Ids name directories and index lines, which must be valid UTF-8
+        product_id = get_product_id(input_data)
+        try:
+            product_id.encode('utf-8')
+        except UnicodeEncodeError:
+            raise ValueError(f"Product id {product_id!r} is not valid Unicode text") from None
+        
         return True
@@ -28,11 +28,11 @@ class FAQGeneratorAgent(BaseAgent):
         Returns:
             Dict: Rendered FAQ page
         """
-        self.log("Generating FAQ page...")
+        self.debug("Generating FAQ page...")
         
         # Render using template
         faq_page = self.template.render(input_data)
         
-        self.log(f"Generated FAQ with {faq_page['metadata']['total_questions']} questions")
+        self.debug("Generated FAQ with %d questions", faq_page['metadata']['total_questions'])
         
         return faq_page
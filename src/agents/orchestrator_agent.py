@@ -1,14 +1,20 @@
 """
 OrchestratorAgent: Coordinates the entire workflow
 """
-import json
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 from .base_agent import BaseAgent
 from .data_parser_agent import DataParserAgent
 from .question_generator_agent import QuestionGeneratorAgent
 from .faq_generator_agent import FAQGeneratorAgent
 from .product_page_generator_agent import ProductPageGeneratorAgent
 from .comparison_generator_agent import ComparisonGeneratorAgent
+from .retry_policy import RetryPolicy
+from ..config import Config
+from ..exceptions import DeadlineExceededError, PipelineStageError
+from ..instrumentation import bind_deadline, bind_product, get_metrics, stage
+from ..output import PAGE_FILES, OutputSink, get_serializer, single_product_sink
+from ..utils import Deadline, get_product_id
 
 
 class OrchestratorAgent(BaseAgent):
@@ -24,10 +30,36 @@ class OrchestratorAgent(BaseAgent):
        - ProductPageGeneratorAgent: Generate product page (depends on 1)
        - ComparisonGeneratorAgent: Generate comparison (depends on 1)
     4. Collect and save outputs
+    
+    Each step runs inside a named instrumentation stage (parse, questions,
+    faq, product_page, comparison, save) so it can be traced and profiled.
+    A failing rendering stage raises PipelineStageError naming the stage
+    and product.
+    
+    Stages call their agent through execute_with_retry, so transient errors
+    are retried under the agents' retry policy and circuit breakers.
+    Each product has a time budget, and each stage a budget within it.
+    Deadlines are cooperative: a stage that runs out of time is stopped at
+    its next agent, template or content block call (or when it returns)
+    and fails with a DeadlineExceededError cause.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        agent_timeout: Optional[float] = Config.AGENT_TIMEOUT,
+        product_timeout: Optional[float] = Config.PRODUCT_TIMEOUT,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        """
+        Args:
+            agent_timeout: Seconds per stage (None or 0 for no limit)
+            product_timeout: Seconds per product (None or 0 for no limit)
+            retry_policy: Policy shared by every worker agent, e.g. to give
+                a batch one retry budget (each agent's default otherwise)
+        """
         super().__init__("OrchestratorAgent")
+        self.agent_timeout = agent_timeout
+        self.product_timeout = product_timeout
         
         # Initialize worker agents
         self.data_parser = DataParserAgent()
@@ -35,6 +67,21 @@ class OrchestratorAgent(BaseAgent):
         self.faq_generator = FAQGeneratorAgent()
         self.product_page_generator = ProductPageGeneratorAgent()
         self.comparison_generator = ComparisonGeneratorAgent()
+        
+        self.retry_policy = retry_policy or self.retry_policy
+        if retry_policy is not None:
+            for agent in self.worker_agents():
+                agent.retry_policy = retry_policy
+    
+    def worker_agents(self) -> List[BaseAgent]:
+        """Get the agents running the pipeline stages, in stage order"""
+        return [
+            self.data_parser,
+            self.question_generator,
+            self.faq_generator,
+            self.product_page_generator,
+            self.comparison_generator
+        ]
     
     def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -46,30 +93,42 @@ class OrchestratorAgent(BaseAgent):
         Returns:
             Dict with all generated outputs
         """
-        self.log("Starting content generation pipeline...")
+        product_id = get_product_id(input_data) if isinstance(input_data, dict) else None
+        
+        with bind_product(product_id):
+            return self._run_pipeline(input_data, product_id, Deadline(self.product_timeout))
+    
+    def _run_pipeline(self, input_data: Dict[str, Any], product_id: str, deadline: Deadline) -> Dict[str, Any]:
+        """Run all pipeline stages for one product"""
+        self.debug("Starting content generation pipeline...")
         
         # Stage 1: Parse product data
-        self.log("Stage 1: Data Parsing")
-        product = self.data_parser.execute(input_data)
+        self.debug("Stage 1: Data Parsing")
+        with self._stage("parse", product_id, deadline) as stage_deadline:
+            product = self.data_parser.execute_with_retry(input_data, stage_deadline)
         
         # Stage 2: Generate questions
-        self.log("Stage 2: Question Generation")
-        questions = self.question_generator.execute(product)
+        self.debug("Stage 2: Question Generation")
+        with self._stage("questions", product_id, deadline) as stage_deadline:
+            questions = self.question_generator.execute_with_retry(product, stage_deadline)
         
         # Stage 3: Parallel page generation
-        self.log("Stage 3: Page Generation (Parallel)")
+        self.debug("Stage 3: Page Generation (Parallel)")
         
-        self.log("  -> Generating FAQ page...")
-        faq_page = self.faq_generator.execute({
-            'product': product,
-            'questions': questions
-        })
+        self.debug("  -> Generating FAQ page...")
+        with self._stage("faq", product_id, deadline) as stage_deadline:
+            faq_page = self.faq_generator.execute_with_retry({
+                'product': product,
+                'questions': questions
+            }, stage_deadline)
         
-        self.log("  -> Generating product page...")
-        product_page = self.product_page_generator.execute(product)
+        self.debug("  -> Generating product page...")
+        with self._stage("product_page", product_id, deadline) as stage_deadline:
+            product_page = self.product_page_generator.execute_with_retry(product, stage_deadline)
         
-        self.log("  -> Generating comparison page...")
-        comparison_page = self.comparison_generator.execute(product)
+        self.debug("  -> Generating comparison page...")
+        with self._stage("comparison", product_id, deadline) as stage_deadline:
+            comparison_page = self.comparison_generator.execute_with_retry(product, stage_deadline)
         
         # Collect results
         results = {
@@ -77,38 +136,70 @@ class OrchestratorAgent(BaseAgent):
             'product_page': product_page,
             'comparison': comparison_page,
             'metadata': {
+                'product_id': product_id,
                 'total_questions_generated': len(questions),
                 'pages_generated': 3,
                 'pipeline_status': 'success'
             }
         }
         
-        self.log("Pipeline completed successfully")
+        get_metrics().counter("pipeline_products_rendered", "Products rendered.").inc()
+        self.debug("Pipeline completed successfully")
         
         return results
     
-    def save_outputs(self, results: Dict[str, Any], output_dir: str = "output") -> None:
+    @contextmanager
+    def _stage(self, name: str, product_id: Optional[str], deadline: Deadline) -> Iterator[Deadline]:
+        """Run a rendering stage under its deadline, attributing its errors to the stage"""
+        stage_deadline = deadline.child(self.agent_timeout)
+        try:
+            stage_deadline.check(name)
+            with stage(name), bind_deadline(stage_deadline):
+                yield stage_deadline
+            # Work that finished late still overran
+            stage_deadline.check(name)
+        except Exception as e:
+            if isinstance(e, DeadlineExceededError):
+                get_metrics().counter(
+                    "pipeline_deadlines_exceeded", "Pipeline stages stopped by a deadline.", ["stage"]
+                ).inc(stage=name)
+            raise PipelineStageError(name, product_id, e) from e
+    
+    def save_outputs(
+        self,
+        results: Dict[str, Any],
+        output_dir: str = "output",
+        sink: Optional[OutputSink] = None
+    ) -> None:
         """
-        Save generated pages as JSON files.
+        Save generated pages as JSON.
+        
+        Pages are written atomically: readers see either the previous page
+        or the complete new one, never a partial write.
         
         Args:
             results: Generated content results
-            output_dir: Output directory path
+            output_dir: Output directory path (when no sink is given)
+            sink: Shared sink whose commit publishes the pages (batch mode,
+                bundles); by default the pages are written as files in
+                output_dir and committed before returning
         """
-        import os
-        
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+        own_sink = sink is None
+        if own_sink:
+            sink = single_product_sink(output_dir)
         
-        # Save each page
-        pages = {
-            'faq.json': results['faq'],
-            'product_page.json': results['product_page'],
-            'comparison_page.json': results['comparison']
-        }
+        serializer = get_serializer(compact=sink.compact)
         
-        for filename, content in pages.items():
-            filepath = os.path.join(output_dir, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(content, f, indent=2, ensure_ascii=False)
-            self.log(f"Saved {filepath}")
+        with stage("save"):
+            pages = {
+                page_type: serializer.dumps(sink.prepare_page(results[page_type]))
+                for page_type in PAGE_FILES
+            }
+            product_id = results['metadata']['product_id']
+            sink.write_product(product_id, pages)
+            self.debug("Saved %d pages for %s", len(pages), product_id)
+            
+            if own_sink:
+                sink.commit()
+            
+            get_metrics().counter("pipeline_pages_written", "Output pages written.").inc(len(pages))
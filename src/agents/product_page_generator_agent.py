@@ -28,11 +28,11 @@ class ProductPageGeneratorAgent(BaseAgent):
         Returns:
             Dict: Rendered product page
         """
-        self.log("Generating product description page...")
+        self.debug("Generating product description page...")
         
         # Render using template
         product_page = self.template.render(input_data)
         
-        self.log(f"Generated product page for {product_page['product_name']}")
+        self.debug("Generated product page for %s", product_page['product_name'])
         
         return product_page
@@ -37,7 +37,7 @@ class QuestionGeneratorAgent(BaseAgent):
         Returns:
             List[Question]: List of questions with categories and answers
         """
-        self.log("Generating categorized questions...")
+        self.debug("Generating categorized questions...")
         
         questions = []
         
@@ -62,7 +62,7 @@ class QuestionGeneratorAgent(BaseAgent):
         # Benefits questions
         questions.extend(self._generate_benefits_questions(input_data))
         
-        self.log(f"Generated {len(questions)} questions across {len(self.CATEGORIES)} categories")
+        self.debug("Generated %d questions across %d categories", len(questions), len(self.CATEGORIES))
         
         return questions
     
@@ -0,0 +1,182 @@
+"""
+Retry policies for agent execution: backoff, retry budget, circuit breaker
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Type
+
+from ..config import Config
+
+
+# Errors worth retrying: the same input may succeed on another attempt.
+# Validation and rendering errors (ValueError, KeyError, TypeError,
+# ContentGenerationError, ...) are deterministic and never retried.
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (OSError, TimeoutError)
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of first attempts, shared by every agent of
+    a batch.
+
+    Each first attempt deposits ``ratio`` of a retry, and each retry
+    withdraws one, on top of ``min_retries`` always available. When a
+    dependency fails for every product, retries stop after a small overhead
+    instead of multiplying the work.
+    """
+
+    def __init__(self, ratio: float = Config.RETRY_BUDGET_RATIO, min_retries: int = Config.RETRY_BUDGET_MIN):
+        """
+        Args:
+            ratio: Retries allowed per first attempt
+            min_retries: Retries allowed regardless of the ratio
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.attempts = 0
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record_attempt(self) -> None:
+        """Deposit for a first attempt"""
+        with self._lock:
+            self.attempts += 1
+
+    def try_spend(self) -> bool:
+        """
+        Withdraw one retry.
+
+        Returns:
+            False if the budget is spent (the retry must not happen)
+        """
+        with self._lock:
+            if self.retries >= self.min_retries + self.attempts * self.ratio:
+                self.denied += 1
+                return False
+            self.retries += 1
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        """Get first attempts, retries spent and retries denied"""
+        with self._lock:
+            return {"attempts": self.attempts, "retries": self.retries, "denied": self.denied}
+
+
+class CircuitBreaker:
+    """
+    Stops calling an agent after consecutive transient failures.
+
+    Closed: calls go through. After ``failure_threshold`` consecutive
+    failures it opens and rejects calls for ``reset_timeout`` seconds, then
+    lets one trial call through (half-open): success closes it again, and
+    failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = Config.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = Config.CIRCUIT_RESET_TIMEOUT
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check whether a call may go through (claims the trial call when half-open)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit at the threshold"""
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """
+    Decides which failures are retried and how long to wait in between.
+
+    Backoff is exponential with full jitter: the wait before retry ``n``
+    (from 0) is uniform in ``[0, min(max_delay, base_delay * 2**n)]``, so
+    workers failing together do not retry in lockstep. An optional
+    RetryBudget, shared across agents, caps the retries of a whole batch.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = Config.RETRY_MAX_ATTEMPTS,
+        base_delay: float = Config.RETRY_BASE_DELAY,
+        max_delay: float = Config.RETRY_MAX_DELAY,
+        retry_on: Tuple[Type[BaseException], ...] = TRANSIENT_ERRORS,
+        budget: Optional[RetryBudget] = None,
+        jitter: bool = True
+    ):
+        """
+        Args:
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff before the first retry (upper bound with jitter)
+            max_delay: Cap on any single backoff
+            retry_on: Exception types that are retried
+            budget: Retry budget shared by every agent using this policy
+            jitter: Randomize backoffs (full jitter); off for exact delays
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self.budget = budget
+        self.jitter = jitter
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Check whether an error may succeed on another attempt"""
+        return isinstance(error, self.retry_on)
+
+    def backoff(self, retry: int) -> float:
+        """
+        Get the wait before a retry.
+
+        Args:
+            retry: Number of retries already made
+
+        Returns:
+            Seconds to sleep
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retry))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the retry budget's statistics (empty without a budget)"""
+        return self.budget.stats() if self.budget is not None else {}
@@ -11,6 +11,7 @@ class Config:
     PROJECT_ROOT = Path(__file__).parent.parent
     DATA_DIR = PROJECT_ROOT / "data"
     OUTPUT_DIR = PROJECT_ROOT / "output"
+    PROFILE_DIR = PROJECT_ROOT / "profiles"
     
     # Input/Output files
     PRODUCT_DATA_FILE = DATA_DIR / "product_data.json"
@@ -33,7 +34,10 @@ class Config:
     
     # Agent settings
     ENABLE_LOGGING = True
-    LOG_LEVEL = "INFO"
+    LOG_LEVEL = "INFO"  # Per-product progress is logged at DEBUG
+    LOG_FORMAT = "text"  # "text" or "json"
+    LOG_SAMPLE_RATE = 1.0  # Fraction of sub-WARNING records kept
+    LOG_TO_FILE = False
     
     # Template settings
     TEMPLATE_VERSION = "1.0"
@@ -42,9 +46,71 @@ class Config:
     VALIDATE_OUTPUT = True
     STRICT_MODE = False  # Fail on warnings
     
+    # Batch processing
+    BATCH_WORKERS = 4
+    BATCH_QUEUE_SIZE = 64  # Records read ahead of the workers
+    BATCH_DEDUPE = True  # Render records with identical content once
+    BATCH_DEDUPE_CACHE_SIZE = 1024  # Recent fingerprints whose results are reused
+    CHECKPOINT_FILE_NAME = "checkpoint.json"  # In the output dir, or <bundle/database>.checkpoint.json
+    CHECKPOINT_EVERY = 1000  # Products saved between checkpointed sink commits
+    DEAD_LETTER_FILE_NAME = "dead_letter.jsonl"  # Failed batch records, in the output dir
+    BATCH_PRIORITY = False  # Schedule batch records by priority class
+    PRIORITY_CLASSES = ("urgent", "high", "normal", "low")  # Most urgent first
+    PRIORITY_DEFAULT = "normal"  # Class of records without a priority
+    PRIORITY_FIELD = "priority"  # Record field holding a class name or level
+    PRIORITY_AGING_SECONDS = 5.0  # Wait that promotes a record by one class
+    PRIORITY_QUEUE_SIZE = 4096  # Records read ahead when scheduling by priority
+    AGENT_TIMEOUT = 5.0  # Seconds per pipeline stage (0 for no limit)
+    PRODUCT_TIMEOUT = 30.0  # Seconds per product, all stages and retries (0 for no limit)
+    RETRY_MAX_ATTEMPTS = 3  # Attempts per agent call, for transient errors only
+    RETRY_BASE_DELAY = 0.1  # Seconds; backoff doubles per retry, with full jitter
+    RETRY_MAX_DELAY = 2.0  # Cap on a single backoff
+    RETRY_BUDGET_RATIO = 0.1  # Retries allowed per first attempt across a batch
+    RETRY_BUDGET_MIN = 10  # Retries allowed per batch regardless of the ratio
+    CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive transient failures that open an agent's circuit
+    CIRCUIT_RESET_TIMEOUT = 30.0  # Seconds before an open circuit lets a trial call through
+    
+    # Catalog input
+    JSON_READ_CHUNK_SIZE = 1 << 16  # Characters read at a time from JSON arrays
+    CSV_DELIMITER = ","
+    CSV_LIST_DELIMITER = "|"  # Separates items of list fields within a cell
+    CSV_LIST_FIELDS = ("skin_type", "key_ingredients", "benefits")
+    
+    # Output writing
+    OUTPUT_FSYNC = "batch"  # "none", "file" or "batch" (one sync per commit group)
+    OUTPUT_COMMIT_EVERY = 256  # Files staged before the writer commits a group
+    OUTPUT_LAYOUT = "flat"  # "flat" (<id>/) or "sharded" (ab/cd/<id>/) for batch runs
+    OUTPUT_SHARD_LEVELS = 2
+    OUTPUT_INDEX_FILE = "index.jsonl"  # Product id -> directory, in the output root
+    OUTPUT_BUNDLE_FORMAT = "jsonl"  # "jsonl" or "tar" for --bundle
+    OUTPUT_BUNDLE_INDEX_SUFFIX = ".index.jsonl"  # Sidecar page offset index
+    OUTPUT_BUFFER_SIZE = 1 << 20  # Bundle write buffer in bytes
+    OUTPUT_COMPACT = False  # Compact JSON files (bundles are always compact)
+    JSON_BACKEND = "auto"  # "auto" (orjson if installed), "json" or "orjson"
+    OUTPUT_GZIP_LEVEL = 6  # For --gzip variants
+    OUTPUT_GZIP_WORKERS = 2  # Compression threads
+    OUTPUT_BUNDLE_GZIP_SUFFIX = ".pages.gz"  # Per-page gzip members of a bundle
+    SECTION_STORE_DIR = "sections"  # Content-addressed sections, in the output root
+    SECTION_MIN_BYTES = 256  # Smaller sections stay inline in the page
+    SECTION_CACHE_SIZE = 4096  # Decoded sections kept by SectionResolver
+    SQLITE_COMMIT_EVERY = 5000  # Pages inserted per SQLite transaction
+    SQLITE_SEARCH_LIMIT = 20  # Default number of FAQ search results
+    
+    # Metrics
+    METRICS_FILE_NAME = "metrics.prom"  # Written to the output dir after batch runs
+    
+    # Profiling
+    PROFILE_TOP_N = 25  # Entries per stage in profile reports
+    SAMPLE_PROFILE_FILE = PROFILE_DIR / "samples.folded"
+    
     @classmethod
     def ensure_directories(cls):
-        """Create necessary directories if they don't exist"""
+        """
+        Create necessary directories if they don't exist.
+        
+        Not called at import time: writers create their target directories
+        on first write, so importing the config has no side effects.
+        """
         cls.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         cls.DATA_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -52,7 +118,3 @@ class Config:
     def get_setting(cls, key, default=None):
         """Get config value with fallback to environment variable"""
         return os.getenv(key, getattr(cls, key, default))
-
-
-# Initialize on import
-Config.ensure_directories()
@@ -1,14 +1,16 @@
 """Content blocks package"""
-from .base_block import ContentBlock
-from .benefits_block import BenefitsBlock
-from .usage_block import UsageBlock
-from .ingredients_block import IngredientsBlock
-from .comparison_block import ComparisonBlock
-
-__all__ = [
-    'ContentBlock',
-    'BenefitsBlock',
-    'UsageBlock',
-    'IngredientsBlock',
-    'ComparisonBlock'
-]
+from .._lazy import lazy_exports
+
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'ContentBlock': '.base_block',
+    'BenefitsBlock': '.benefits_block',
+    'UsageBlock': '.usage_block',
+    'IngredientsBlock': '.ingredients_block',
+    'ComparisonBlock': '.comparison_block'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -3,6 +3,7 @@ Base content block interface
 """
 from abc import ABC, abstractmethod
 from typing import Any, Dict
+from ..instrumentation import instrument_subclass
 
 
 class ContentBlock(ABC):
@@ -14,6 +15,11 @@ class ContentBlock(ABC):
     def __init__(self, name: str):
         self.name = name
     
+    def __init_subclass__(cls, **kwargs):
+        """Time and trace every call of a subclass's generate()"""
+        super().__init_subclass__(**kwargs)
+        instrument_subclass(cls, "generate", category="block")
+    
     @abstractmethod
     def generate(self, data: Any) -> Dict[str, Any]:
         """
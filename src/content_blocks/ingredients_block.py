@@ -4,6 +4,32 @@ Ingredients content block
 from typing import Dict, Any
 from .base_block import ContentBlock
 from ..models.product import Product
+from ..output import static_fragment
+
+
+# Knowledge base for ingredient descriptions
+INGREDIENT_DATA = {
+    "Vitamin C": {
+        "scientific_name": "Ascorbic Acid",
+        "description": "A powerful antioxidant that brightens skin and boosts collagen production",
+        "benefits": ["Brightening", "Anti-aging", "Antioxidant protection"]
+    },
+    "Hyaluronic Acid": {
+        "scientific_name": "Sodium Hyaluronate",
+        "description": "A moisture-binding ingredient that hydrates and plumps skin",
+        "benefits": ["Deep hydration", "Plumping", "Moisture retention"]
+    }
+}
+
+INGREDIENT_DETAILS = {
+    name: static_fragment({
+        "name": name,
+        "scientific_name": info["scientific_name"],
+        "description": info["description"],
+        "benefits": info["benefits"]
+    })
+    for name, info in INGREDIENT_DATA.items()
+}
 
 
 class IngredientsBlock(ContentBlock):
@@ -15,19 +41,7 @@ class IngredientsBlock(ContentBlock):
     def __init__(self):
         super().__init__("IngredientsBlock")
         
-        # Knowledge base for ingredient descriptions
-        self.ingredient_data = {
-            "Vitamin C": {
-                "scientific_name": "Ascorbic Acid",
-                "description": "A powerful antioxidant that brightens skin and boosts collagen production",
-                "benefits": ["Brightening", "Anti-aging", "Antioxidant protection"]
-            },
-            "Hyaluronic Acid": {
-                "scientific_name": "Sodium Hyaluronate",
-                "description": "A moisture-binding ingredient that hydrates and plumps skin",
-                "benefits": ["Deep hydration", "Plumping", "Moisture retention"]
-            }
-        }
+        self.ingredient_data = INGREDIENT_DATA
     
     def generate(self, data: Product) -> Dict[str, Any]:
         """
@@ -42,17 +56,16 @@ class IngredientsBlock(ContentBlock):
         ingredients_details = []
         
         for ingredient in data.key_ingredients:
-            ingredient_info = self.ingredient_data.get(ingredient, {
-                "scientific_name": ingredient,
-                "description": f"A key active ingredient in this formulation",
-                "benefits": ["Skin enhancement"]
-            })
+            known = INGREDIENT_DETAILS.get(ingredient)
+            if known is not None:
+                ingredients_details.append(known)
+                continue
             
             ingredients_details.append({
                 "name": ingredient,
-                "scientific_name": ingredient_info["scientific_name"],
-                "description": ingredient_info["description"],
-                "benefits": ingredient_info["benefits"]
+                "scientific_name": ingredient,
+                "description": "A key active ingredient in this formulation",
+                "benefits": ["Skin enhancement"]
             })
         
         return {
@@ -4,6 +4,31 @@ Usage content block
 from typing import Dict, Any
 from .base_block import ContentBlock
 from ..models.product import Product
+from ..output import StaticList, static_fragment
+
+
+USAGE_STEPS = static_fragment([
+    {
+        "step": 1,
+        "action": "Cleanse",
+        "description": "Start with a clean, dry face"
+    },
+    {
+        "step": 2,
+        "action": "Apply",
+        "description": "Apply 2-3 drops of serum to your face and neck"
+    },
+    {
+        "step": 3,
+        "action": "Massage",
+        "description": "Gently massage in upward motions until absorbed"
+    },
+    {
+        "step": 4,
+        "action": "Protect",
+        "description": "Follow with sunscreen as directed"
+    }
+])
 
 
 class UsageBlock(ContentBlock):
@@ -37,30 +62,9 @@ class UsageBlock(ContentBlock):
             "tips": self._generate_tips(data)
         }
     
-    def _parse_usage_into_steps(self, usage_text: str) -> list:
+    def _parse_usage_into_steps(self, usage_text: str) -> StaticList:
         """Parse usage text into structured steps"""
-        return [
-            {
-                "step": 1,
-                "action": "Cleanse",
-                "description": "Start with a clean, dry face"
-            },
-            {
-                "step": 2,
-                "action": "Apply",
-                "description": "Apply 2-3 drops of serum to your face and neck"
-            },
-            {
-                "step": 3,
-                "action": "Massage",
-                "description": "Gently massage in upward motions until absorbed"
-            },
-            {
-                "step": 4,
-                "action": "Protect",
-                "description": "Follow with sunscreen as directed"
-            }
-        ]
+        return USAGE_STEPS
     
     def _extract_frequency(self, usage_text: str) -> str:
         """Extract frequency from usage text"""
@@ -1,6 +1,7 @@
 """
 Custom exceptions for better error handling across the system.
 """
+from typing import Optional
 
 
 class ContentGenerationError(Exception):
@@ -18,6 +19,11 @@ class AgentExecutionError(ContentGenerationError):
     pass
 
 
+class CircuitOpenError(AgentExecutionError):
+    """Raised when an agent is not called because its circuit breaker is open"""
+    pass
+
+
 class TemplateRenderError(ContentGenerationError):
     """Raised when template rendering fails"""
     pass
@@ -31,3 +37,24 @@ class ContentBlockError(ContentGenerationError):
 class OutputGenerationError(ContentGenerationError):
     """Raised when output file generation fails"""
     pass
+
+
+class DeadlineExceededError(ContentGenerationError):
+    """Raised when work runs past its time budget"""
+    pass
+
+
+class PipelineStageError(ContentGenerationError):
+    """Raised when a pipeline stage fails for one product"""
+    
+    def __init__(self, stage: str, product_id: Optional[str], cause: BaseException):
+        """
+        Args:
+            stage: Name of the failing stage (parse, questions, faq, ...)
+            product_id: Product being rendered
+            cause: Original exception
+        """
+        self.stage = stage
+        self.product_id = product_id
+        self.cause = cause
+        super().__init__(f"{stage} stage failed for {product_id}: {type(cause).__name__}: {cause}")
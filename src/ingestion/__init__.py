@@ -0,0 +1,16 @@
+"""Ingestion package"""
+from .._lazy import lazy_exports
+
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'CSVProductReader': '.csv_reader',
+    'parse_column_map': '.csv_reader',
+    'JSONArrayReader': '.json_reader',
+    'JSONLinesReader': '.json_reader',
+    'starts_with_array': '.json_reader'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
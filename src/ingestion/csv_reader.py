@@ -0,0 +1,134 @@
+"""
+Streaming reader for product catalogs exported as CSV
+"""
+import csv
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..config import Config
+from ..exceptions import DataValidationError
+from ..models.record import InvalidRecord
+
+
+# Product fields every row must provide
+PRODUCT_FIELDS = (
+    'product_name', 'concentration', 'skin_type', 'key_ingredients',
+    'benefits', 'how_to_use', 'side_effects', 'price'
+)
+
+
+def _normalize(name: str) -> str:
+    """Column name -> field-style key ('Skin Type' -> 'skin_type')"""
+    return re.sub(r'[^a-z0-9]+', '_', name.strip().lower()).strip('_')
+
+
+def parse_column_map(spec: str) -> Dict[str, str]:
+    """
+    Parse a column mapping given on the command line.
+
+    Args:
+        spec: Comma-separated ``column=field`` pairs, e.g.
+            ``"Name=product_name,Price (INR)=price"``
+
+    Returns:
+        Column name -> product field
+
+    Raises:
+        ValueError: If a pair has no '='
+    """
+    column_map = {}
+    for pair in filter(None, (part.strip() for part in spec.split(','))):
+        column, sep, field = pair.partition('=')
+        if not sep:
+            raise ValueError(f"Invalid column mapping (expected column=field): {pair}")
+        column_map[column.strip()] = field.strip()
+    return column_map
+
+
+class CSVProductReader:
+    """
+    Yields product records from a CSV file one row at a time.
+
+    Columns are matched to product fields by name ('Skin Type' and
+    'skin_type' both map to skin_type) or through an explicit column map;
+    other columns (product_id, sku, ...) are passed through under their
+    normalized name. List fields are split on ``list_delimiter``.
+
+    The header is checked once, so a file missing a product field fails
+    before any row is rendered. A row with the wrong number of columns or
+    an empty required value is yielded as an InvalidRecord, which fails in
+    the parse stage (and is dead-lettered) without ending the stream;
+    records are otherwise validated by the pipeline's DataParserAgent like
+    JSON input. Only the current row is held in memory, so exports of any
+    size stream in constant memory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        column_map: Optional[Dict[str, str]] = None,
+        list_delimiter: str = Config.CSV_LIST_DELIMITER,
+        delimiter: str = Config.CSV_DELIMITER
+    ):
+        """
+        Args:
+            path: CSV file with a header row
+            column_map: Column name -> product field, for columns whose
+                names don't match the fields
+            list_delimiter: Separator inside list fields (skin_type, ...)
+            delimiter: CSV field separator
+        """
+        self.path = path
+        self.column_map = {_normalize(column): field for column, field in (column_map or {}).items()}
+        self.list_delimiter = list_delimiter
+        self.delimiter = delimiter
+        self.rows_read = 0
+        self.rows_invalid = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # utf-8-sig drops the byte order mark spreadsheet exports start with
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f, delimiter=self.delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            fields = self._map_header(header)
+
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                record = self._record(fields, row, reader.line_num)
+                self.rows_read += 1
+                if isinstance(record, InvalidRecord):
+                    self.rows_invalid += 1
+                yield record
+
+    def _map_header(self, header: List[str]) -> List[str]:
+        """Get the product field of each column, checking all fields are present"""
+        fields = []
+        for column in header:
+            key = _normalize(column)
+            fields.append(self.column_map.get(key, key))
+
+        missing = [field for field in PRODUCT_FIELDS if field not in fields]
+        if missing:
+            raise DataValidationError(f"{self.path}: no column for {', '.join(missing)}")
+        return fields
+
+    def _record(self, fields: List[str], row: List[str], line: int) -> Dict[str, Any]:
+        """Build one product record from a row (an InvalidRecord if the row is malformed)"""
+        record: Dict[str, Any] = {}
+        for field, value in zip(fields, row):
+            value = value.strip()
+            if field in Config.CSV_LIST_FIELDS:
+                record[field] = [item.strip() for item in value.split(self.list_delimiter) if item.strip()]
+            else:
+                record[field] = value
+
+        if len(row) != len(fields):
+            error = DataValidationError(f"{self.path}, line {line}: expected {len(fields)} columns, got {len(row)}")
+            return InvalidRecord(record, error)
+        empty = [field for field in PRODUCT_FIELDS if not record[field]]
+        if empty:
+            return InvalidRecord(record, DataValidationError(f"{self.path}, line {line}: empty {', '.join(empty)}"))
+        return record
@@ -0,0 +1,190 @@
+"""
+Incremental readers for JSON catalogs: one large array, or JSON Lines
+"""
+import json
+from typing import Any, Iterator, TextIO
+
+from ..config import Config
+from ..exceptions import DataValidationError
+from ..models.record import InvalidRecord
+
+
+_WHITESPACE = " \t\n\r"
+
+# Decode errors this close to the end of the buffer may be a token cut off
+# by the chunk boundary (e.g. "-Infinity", a surrogate pair of \u escapes)
+_CUT_TOKEN_LENGTH = 16
+
+
+def starts_with_array(path: str) -> bool:
+    """Check whether a JSON file's top-level value is an array, reading only its first bytes"""
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(4096)
+            if not chunk:
+                return False
+            stripped = chunk.lstrip(_WHITESPACE)
+            if stripped:
+                return stripped[0] == '['
+
+
+class JSONArrayReader:
+    """
+    Yields the elements of a top-level JSON array one at a time.
+
+    The file is read in chunks into a sliding buffer and each element is
+    decoded with JSONDecoder.raw_decode as soon as it is complete, so the
+    first product reaches the pipeline after one chunk is read and memory
+    is bounded by the chunk size plus the largest element, whatever the
+    size of the file. Decoded text is dropped from the buffer as the
+    reader advances.
+    """
+
+    def __init__(self, path: str, chunk_size: int = Config.JSON_READ_CHUNK_SIZE):
+        """
+        Args:
+            path: JSON file whose top-level value is an array
+            chunk_size: Characters read from the file at a time
+        """
+        self.path = path
+        self.chunk_size = max(1, chunk_size)
+        self.items_read = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Raises:
+            DataValidationError: If the file is not a well-formed JSON
+                array (raised when the reader reaches the error)
+        """
+        with open(self.path, 'r', encoding='utf-8') as f:
+            yield from _ArrayScanner(f, self.chunk_size, self)
+
+
+class JSONLinesReader:
+    """
+    Yields one decoded value per non-blank line of a text stream (JSONL).
+
+    Lines are decoded as they arrive, so a reader over a pipe (stdin)
+    hands each product to the pipeline as soon as its line is written. A
+    line that is not valid JSON is yielded as an InvalidRecord holding the
+    raw line, which fails in the parse stage (and is dead-lettered)
+    without ending the stream.
+    """
+
+    def __init__(self, stream: TextIO, name: str = "<stdin>"):
+        """
+        Args:
+            stream: Text stream with one JSON value per line
+            name: Stream name used in error messages
+        """
+        self.stream = stream
+        self.name = name
+        self.items_read = 0
+        self.items_invalid = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for number, line in enumerate(self.stream, 1):
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError as e:
+                error = DataValidationError(f"{self.name}, line {number}: invalid JSON: {e.msg}")
+                value = InvalidRecord({"raw_line": line.rstrip("\r\n")}, error)
+                self.items_invalid += 1
+            self.items_read += 1
+            yield value
+
+
+class _ArrayScanner:
+    """Buffer state for one pass of a JSONArrayReader"""
+
+    def __init__(self, f: TextIO, chunk_size: int, reader: JSONArrayReader):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.reader = reader
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        # Characters dropped from the front of the buffer, for error offsets
+        self.dropped = 0
+        self.eof = False
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._next_char() != '[':
+            self._fail("Expecting '[' at the start of a product array")
+        self.pos += 1
+
+        if self._next_char() == ']':
+            self.pos += 1
+        else:
+            while True:
+                yield self._decode_value()
+                self.reader.items_read += 1
+
+                char = self._next_char()
+                self.pos += 1
+                if char == ']':
+                    break
+                if char != ',':
+                    self.pos -= 1
+                    self._fail("Expecting ',' delimiter")
+
+        if self._next_char() != '':
+            self._fail("Extra data after the product array")
+
+    def _fill(self, size: int) -> bool:
+        """Read more of the file, dropping consumed text; False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.dropped += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _next_char(self) -> str:
+        """Skip whitespace and get the next character ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                return ''
+
+    def _decode_value(self) -> Any:
+        """Decode the next value, reading until it is complete"""
+        self._next_char()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # An error short of the buffer end is in the element itself,
+                # so reading on can't fix it (an unterminated string reports
+                # where it starts, though, and may just be cut off)
+                cut_off = (e.pos >= len(self.buffer) - _CUT_TOKEN_LENGTH
+                           or e.msg.startswith("Unterminated string"))
+                if not cut_off or not self._fill(read_size):
+                    self.pos = e.pos
+                    self._fail(e.msg)
+                # Elements larger than a chunk are read in growing steps, so
+                # each is re-decoded a logarithmic number of times
+                read_size *= 2
+                continue
+
+            # A value ending exactly at the buffer end may continue (e.g. a
+            # number split across chunks); decode it again with more text
+            if end == len(self.buffer) and self._fill(read_size):
+                continue
+            self.pos = end
+            return value
+
+    def _fail(self, message: str) -> None:
+        raise DataValidationError(
+            f"{self.reader.path}: invalid JSON at character {self.dropped + self.pos}: {message}"
+        )
@@ -0,0 +1,33 @@
+"""Instrumentation package"""
+from .._lazy import lazy_exports
+
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'LatencyHistogram': '.histogram',
+    'StatsRegistry': '.stats',
+    'get_registry': '.stats',
+    'bind_product': '.context',
+    'current_product': '.context',
+    'bind_deadline': '.context',
+    'check_deadline': '.context',
+    'Tracer': '.tracing',
+    'get_tracer': '.tracing',
+    'StageProfiler': '.profiling',
+    'get_profiler': '.profiling',
+    'set_profiler': '.profiling',
+    'StackSampler': '.sampling',
+    'get_sampler': '.sampling',
+    'set_sampler': '.sampling',
+    'MetricsRegistry': '.metrics',
+    'get_metrics': '.metrics',
+    'record_cache_lookup': '.metrics',
+    'serve_metrics': '.metrics',
+    'instrumented': '.hooks',
+    'instrument_subclass': '.hooks',
+    'stage': '.hooks'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
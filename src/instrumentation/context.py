@@ -0,0 +1,63 @@
+"""
+Per-thread pipeline context (which product is being processed, and by when)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from ..utils import Deadline
+
+
+_current_product: ContextVar[Optional[str]] = ContextVar("current_product", default=None)
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("current_deadline", default=None)
+
+
+def current_product() -> Optional[str]:
+    """Get the id of the product being processed by this thread, if any"""
+    return _current_product.get()
+
+
+@contextmanager
+def bind_product(product_id: str) -> Iterator[None]:
+    """
+    Mark the enclosed block as working on a product.
+
+    Args:
+        product_id: Product identifier attached to spans, logs and errors
+    """
+    token = _current_product.set(product_id)
+    try:
+        yield
+    finally:
+        _current_product.reset(token)
+
+
+@contextmanager
+def bind_deadline(deadline: Optional["Deadline"]) -> Iterator[None]:
+    """
+    Make a deadline the one checked by instrumented calls in the enclosed block.
+
+    Args:
+        deadline: Deadline of the running stage (None for no limit)
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def check_deadline(what: str) -> None:
+    """
+    Cancellation point: raise if this thread's bound deadline has expired.
+
+    Args:
+        what: Work about to run, for the error message
+
+    Raises:
+        DeadlineExceededError: If the deadline has expired
+    """
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check(what)
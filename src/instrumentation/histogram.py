@@ -0,0 +1,142 @@
+"""
+Fixed-bucket latency histogram
+"""
+from array import array
+from typing import Dict
+
+
+class LatencyHistogram:
+    """
+    Compact HDR-style histogram for nanosecond latencies.
+
+    Values are grouped into log-linear buckets: every power of two is split
+    into a fixed number of sub-buckets, so the relative error of any reported
+    percentile is bounded (about 3% with the default precision) while the
+    whole histogram lives in a single preallocated array of counters.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 6, max_value_bits: int = 40):
+        """
+        Args:
+            sub_bucket_bits: log2 of the number of sub-buckets per power of two
+            max_value_bits: Largest trackable value is 2**max_value_bits - 1 ns
+                (values above it are clamped; ~18 minutes by default)
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.half_count = 1 << (sub_bucket_bits - 1)
+        self.max_trackable = (1 << max_value_bits) - 1
+
+        bucket_count = (max_value_bits - sub_bucket_bits + 2) * self.half_count
+        self.counts = array('Q', bytes(8 * bucket_count))
+
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        """Map a value onto its bucket index"""
+        magnitude = value.bit_length() - self.sub_bucket_bits
+        if magnitude <= 0:
+            return value
+        return magnitude * self.half_count + (value >> magnitude)
+
+    def _highest_equivalent(self, index: int) -> int:
+        """Largest value that maps onto the given bucket"""
+        if index < 2 * self.half_count:
+            return index
+        magnitude = index // self.half_count - 1
+        offset = index - magnitude * self.half_count
+        return ((offset + 1) << magnitude) - 1
+
+    def record(self, value: int) -> None:
+        """
+        Record a single value.
+
+        Args:
+            value: Latency in nanoseconds
+        """
+        if value < 0:
+            value = 0
+        elif value > self.max_trackable:
+            value = self.max_trackable
+
+        self.counts[self._index(value)] += 1
+
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add all values recorded by another histogram of the same shape"""
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge histograms with different precision")
+        if other.count == 0:
+            return
+
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+
+        if self.count == 0 or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Get the value at a given percentile.
+
+        Args:
+            percentile: Percentile in the range 0-100
+
+        Returns:
+            Highest value equivalent to the bucket holding the percentile,
+            capped at the largest recorded value
+        """
+        if self.count == 0:
+            return 0
+
+        rank = max(1, int(round(percentile / 100.0 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def count_at_or_below(self, value: int) -> int:
+        """
+        Count recorded values up to a threshold.
+
+        Values sharing the threshold's bucket are included, so the result
+        carries the same relative error as percentiles.
+        """
+        if self.count == 0:
+            return 0
+        if value >= self.max:
+            return self.count
+        if value < 0:
+            return 0
+        limit = self._index(min(value, self.max_trackable))
+        return sum(self.counts[:limit + 1])
+
+    def mean(self) -> float:
+        """Get the exact mean of recorded values"""
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, int]:
+        """Get count, total, min, max and p50/p90/p99 in nanoseconds"""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max
+        }
@@ -0,0 +1,93 @@
+"""
+Instrumentation hooks shared by agents, templates and content blocks
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from .context import check_deadline
+from .profiling import get_profiler
+from .sampling import get_sampler
+from .stats import get_registry
+from .tracing import get_tracer
+
+
+def instrumented(method: Callable, category: str = "stage") -> Callable:
+    """
+    Wrap an instance method so every call is timed under ``self.name``.
+
+    Base classes apply this to the entry point of each subclass
+    (``execute``, ``render``, ``generate``), so concrete implementations and
+    their callers need no changes to be measured or traced. Each call is
+    also a cancellation point for the deadline bound to the thread.
+
+    Args:
+        method: Method to wrap
+        category: Trace category for spans recorded by this method
+    """
+    if getattr(method, "__instrumented__", False):
+        return method
+
+    tracer = get_tracer()
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        check_deadline(self.name)
+        start = time.perf_counter_ns()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            get_registry().record(self.name, elapsed)
+            if tracer.enabled:
+                tracer.add_span(self.name, category, start, elapsed)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument_subclass(cls: type, method_name: str, category: str = "stage") -> None:
+    """
+    Instrument a method defined directly on a subclass.
+
+    Args:
+        cls: Class being created
+        method_name: Name of the method to wrap
+        category: Trace category for the method's spans
+    """
+    method = cls.__dict__.get(method_name)
+    if method is not None and callable(method):
+        setattr(cls, method_name, instrumented(method, category))
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Mark the enclosed block as a named orchestrator stage.
+
+    Stages are traced as spans, profiled under their name when a stage
+    profiler is installed, and used as the root label of sampled stacks
+    when the stack sampler runs. Without any of these this is a no-op.
+    """
+    profiler = get_profiler()
+    sampler = get_sampler()
+
+    if sampler is not None:
+        ident = threading.get_ident()
+        previous = sampler.thread_stages.get(ident)
+        sampler.thread_stages[ident] = name
+    try:
+        with get_tracer().span(name, category="stage"):
+            if profiler is None:
+                yield
+            else:
+                with profiler.profile(name):
+                    yield
+    finally:
+        if sampler is not None:
+            if previous is None:
+                sampler.thread_stages.pop(ident, None)
+            else:
+                sampler.thread_stages[ident] = previous
@@ -0,0 +1,263 @@
+"""
+Per-stage CPU (cProfile) and memory (tracemalloc) profiling
+"""
+import io
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+class StageProfiler:
+    """
+    Profiles named pipeline stages and aggregates results across a batch.
+
+    In ``cpu`` mode each thread keeps a cProfile.Profile per stage that is
+    enabled only while the stage runs; the per-thread profiles are merged
+    into one pstats.Stats per stage when reports are written. Concurrent
+    workers are profiled in parallel (one profiler runs per thread before
+    Python 3.12; from 3.12 on the interpreter allows a single active
+    profiler, so profiled stages take turns). A stage nested in another on
+    the same thread pauses the outer stage's profile while it runs.
+
+    In ``mem`` mode tracemalloc snapshots are taken around each stage and
+    the per-line allocation differences are summed. Snapshots cover the
+    whole process, so profiled stages take turns to keep allocations of
+    concurrent workers apart.
+    """
+
+    MODES = ("cpu", "mem")
+
+    # Keep the profiler's own bookkeeping out of allocation reports
+    _SNAPSHOT_FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__)
+    )
+
+    def __init__(self, mode: str, top_n: int = 25, traceback_frames: int = 1):
+        """
+        Args:
+            mode: "cpu" or "mem"
+            top_n: Number of entries per stage in the written reports
+            traceback_frames: Frames stored per allocation in mem mode
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(self.MODES)})")
+
+        self.mode = mode
+        self.top_n = top_n
+        self.traceback_frames = traceback_frames
+        self.stage_calls: Dict[str, int] = {}
+        self._thread_profiles: List[Dict[str, "cProfile.Profile"]] = []
+        self._local = threading.local()
+        self._allocations: Dict[str, Dict[str, List[int]]] = {}
+        self._peaks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Held around whole stages where profiling cannot run concurrently
+        # (reentrant, so nested stages on one thread do not deadlock)
+        serialized = mode == "mem" or sys.version_info >= (3, 12)
+        self._exclusive = threading.RLock() if serialized else None
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        """Prepare global profiling state (starts tracemalloc in mem mode)"""
+        if self.mode == "mem" and not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        """Release global profiling state"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def profile(self, stage: str) -> Iterator[None]:
+        """Profile the enclosed block as one call of the given stage"""
+        with self._lock:
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+
+        if self._exclusive is not None:
+            self._exclusive.acquire()
+        try:
+            if self.mode == "cpu":
+                with self._profile_cpu(stage):
+                    yield
+            else:
+                with self._profile_mem(stage):
+                    yield
+        finally:
+            if self._exclusive is not None:
+                self._exclusive.release()
+
+    @contextmanager
+    def _profile_cpu(self, stage: str) -> Iterator[None]:
+        import cProfile
+
+        local = self._local
+        if not hasattr(local, "profiles"):
+            local.profiles = {}
+            local.active = []
+            with self._lock:
+                self._thread_profiles.append(local.profiles)
+
+        profile = local.profiles.get(stage)
+        if profile is None:
+            profile = cProfile.Profile()
+            with self._lock:
+                local.profiles[stage] = profile
+
+        outer = local.active[-1] if local.active else None
+        if outer is profile:
+            # Re-entered the running stage: its profile already covers this call
+            yield
+            return
+
+        if outer is not None:
+            outer.disable()
+        local.active.append(profile)
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            local.active.pop()
+            if outer is not None:
+                outer.enable()
+
+    @contextmanager
+    def _profile_mem(self, stage: str) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            self.start()
+
+        before = tracemalloc.take_snapshot().filter_traces(self._SNAPSHOT_FILTERS)
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(self._SNAPSHOT_FILTERS)
+            diffs = after.compare_to(before, "lineno")
+
+            with self._lock:
+                self._merge_allocations(stage, peak, diffs)
+
+    def _merge_allocations(self, stage: str, peak: int, diffs: List[tracemalloc.StatisticDiff]) -> None:
+        self._peaks[stage] = max(self._peaks.get(stage, 0), peak)
+
+        totals = self._allocations.setdefault(stage, {})
+        for diff in diffs:
+            if diff.size_diff <= 0:
+                continue
+            location = str(diff.traceback)
+            entry = totals.get(location)
+            if entry is None:
+                totals[location] = [diff.size_diff, diff.count_diff]
+            else:
+                entry[0] += diff.size_diff
+                entry[1] += diff.count_diff
+
+    def cpu_stats(self) -> Dict[str, "pstats.Stats"]:
+        """
+        Merge every thread's profiles into one pstats.Stats per stage.
+
+        Returns:
+            Stage name -> aggregated statistics
+        """
+        import pstats
+
+        with self._lock:
+            merged: Dict[str, pstats.Stats] = {}
+            for profiles in self._thread_profiles:
+                for stage, profile in profiles.items():
+                    stats = merged.get(stage)
+                    if stats is None:
+                        merged[stage] = pstats.Stats(profile)
+                    else:
+                        stats.add(profile)
+            return merged
+
+    def cpu_report(self, stage: str, stats: Optional["pstats.Stats"] = None) -> str:
+        """
+        Get the top-N functions of a stage by cumulative time.
+
+        Args:
+            stage: Stage name
+            stats: The stage's entry from cpu_stats (merged here if omitted)
+        """
+        if stats is None:
+            stats = self.cpu_stats()[stage]
+
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        return stream.getvalue()
+
+    def memory_report(self, stage: str) -> str:
+        """Get the top-N allocation sites of a stage by bytes allocated"""
+        totals = self._allocations.get(stage, {})
+        ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+
+        lines = [
+            f"Stage: {stage} ({self.stage_calls.get(stage, 0)} call(s), "
+            f"peak traced memory {self._peaks.get(stage, 0) / 1024:.1f} KiB)"
+        ]
+        for location, (size, count) in ranked[:self.top_n]:
+            lines.append(f"  {size / 1024:>10.1f} KiB  {count:>8} blocks  {location}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: str) -> List[Path]:
+        """
+        Write aggregated profiles.
+
+        cpu mode writes ``<stage>.pstats`` per stage plus ``cpu_report.txt``;
+        mem mode writes ``memory_report.txt``.
+
+        Args:
+            output_dir: Directory for profile files
+
+        Returns:
+            List of written file paths
+        """
+        directory = Path(output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+
+        if self.mode == "cpu":
+            sections = []
+            for stage, stats in self.cpu_stats().items():
+                pstats_path = directory / f"{stage}.pstats"
+                stats.dump_stats(str(pstats_path))
+                written.append(pstats_path)
+                sections.append(
+                    f"Stage: {stage} ({self.stage_calls.get(stage, 0)} call(s))\n"
+                    + self.cpu_report(stage, stats)
+                )
+            report_path = directory / "cpu_report.txt"
+        else:
+            with self._lock:
+                sections = [self.memory_report(stage) for stage in self._allocations]
+            report_path = directory / "memory_report.txt"
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(sections))
+        written.append(report_path)
+
+        return written
+
+
+_profiler: Optional[StageProfiler] = None
+
+
+def get_profiler() -> Optional[StageProfiler]:
+    """Get the active stage profiler, if profiling is enabled"""
+    return _profiler
+
+
+def set_profiler(profiler: Optional[StageProfiler]) -> None:
+    """Install (or remove, with None) the process-wide stage profiler"""
+    global _profiler
+    _profiler = profiler
@@ -0,0 +1,144 @@
+"""
+Signal-driven stack sampling profiler with folded-stack output
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class StackSampler:
+    """
+    Statistical profiler that samples every thread's Python stack on a
+    SIGPROF timer and collapses the stacks into Brendan Gregg's folded
+    format (``frame;frame;frame count``), ready for flamegraph.pl,
+    speedscope or Perfetto.
+
+    Each stack is rooted at the orchestrator stage the thread was in, and
+    instrumented agent/template/block frames are shown by their name, so
+    flame graphs group naturally by pipeline stage.
+
+    Only CPU time advances the timer, and the handler does a single stack
+    walk per thread, which keeps overhead around 1% at 100 Hz.
+    """
+
+    def __init__(self, hz: int = 100):
+        """
+        Args:
+            hz: Samples per second of process CPU time
+        """
+        if hz <= 0:
+            raise ValueError("Sampling rate must be positive")
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("Stack sampling requires a platform with signal.setitimer")
+
+        self.hz = hz
+        self.samples = 0
+        self.thread_stages: Dict[int, str] = {}
+        self._stacks: Counter = Counter()
+        self._frame_names: Dict[object, str] = {}
+        self._handler_ns = 0
+        self._started_ns = 0
+        self._stopped_ns = 0
+        self._previous_handler = None
+        self.running = False
+
+    def start(self) -> None:
+        """Install the SIGPROF handler and start the timer (main thread only)"""
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("StackSampler must be started from the main thread")
+
+        self._previous_handler = signal.signal(signal.SIGPROF, self._handle)
+        interval = 1.0 / self.hz
+        self._started_ns = time.perf_counter_ns()
+        self.running = True
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+
+    def stop(self) -> None:
+        """Stop the timer and restore the previous SIGPROF handler"""
+        if not self.running:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        self._stopped_ns = time.perf_counter_ns()
+        self.running = False
+
+    def _handle(self, signum, frame) -> None:
+        start = time.perf_counter_ns()
+        main_ident = threading.main_thread().ident
+
+        for ident, thread_frame in sys._current_frames().items():
+            # The main thread's current frame is this handler
+            if ident == main_ident:
+                thread_frame = frame
+            if thread_frame is None:
+                continue
+            stack = self._collapse(thread_frame)
+            label = self.thread_stages.get(ident)
+            if label:
+                stack = f"{label};{stack}"
+            self._stacks[stack] += 1
+
+        self.samples += 1
+        self._handler_ns += time.perf_counter_ns() - start
+
+    def _collapse(self, frame) -> str:
+        """Turn a frame chain into a root-first folded stack string"""
+        names: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            if code.co_name == "wrapper" and code.co_filename == _HOOKS_FILE:
+                owner = frame.f_locals.get("self")
+                names.append(getattr(owner, "name", code.co_name))
+            else:
+                name = self._frame_names.get(code)
+                if name is None:
+                    filename = os.path.basename(code.co_filename)
+                    name = self._frame_names[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+                names.append(name)
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def overhead(self) -> float:
+        """Fraction of wall time spent inside the sampling handler"""
+        end = self._stopped_ns if not self.running else time.perf_counter_ns()
+        elapsed = end - self._started_ns
+        return self._handler_ns / elapsed if elapsed > 0 else 0.0
+
+    def folded(self) -> List[str]:
+        """Get collapsed stacks as folded-format lines"""
+        return [f"{stack} {count}" for stack, count in sorted(self._stacks.items())]
+
+    def write(self, filepath: str) -> None:
+        """
+        Write collapsed stacks in folded format.
+
+        Args:
+            filepath: Destination file path
+        """
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for line in self.folded():
+                f.write(line + "\n")
+
+
+# Frames of the instrumented() wrapper are shown by their owner's name
+_HOOKS_FILE = os.path.join(os.path.dirname(__file__), "hooks.py")
+_sampler: Optional[StackSampler] = None
+
+
+def get_sampler() -> Optional[StackSampler]:
+    """Get the running stack sampler, if any"""
+    return _sampler
+
+
+def set_sampler(sampler: Optional[StackSampler]) -> None:
+    """Install (or remove, with None) the process-wide stack sampler"""
+    global _sampler
+    _sampler = sampler
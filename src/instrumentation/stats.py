@@ -0,0 +1,111 @@
+"""
+Per-stage latency statistics registry
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .histogram import LatencyHistogram
+
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class StatsRegistry:
+    """
+    Thread-safe collection of latency histograms keyed by stage name.
+    Agents and content blocks record into it on every call.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, elapsed_ns: int) -> None:
+        """
+        Record one call of a stage.
+
+        Args:
+            stage: Stage name (agent or content block name)
+            elapsed_ns: Wall-clock duration in nanoseconds
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(elapsed_ns)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block and record it under the given stage"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter_ns() - start)
+
+    def get_histogram(self, stage: str) -> Optional[LatencyHistogram]:
+        """Get the histogram for a stage, if any calls were recorded"""
+        return self._histograms.get(stage)
+
+    def stage_stats(self, stage: str) -> Dict[str, Any]:
+        """
+        Get latency statistics for a single stage.
+
+        Returns:
+            Dict with call count and total/mean/p50/p90/p99/max in seconds
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            summary = histogram.summary() if histogram else None
+            mean = histogram.mean() if histogram else 0.0
+
+        if summary is None:
+            return {
+                "count": 0, "total": 0.0, "mean": 0.0,
+                "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0
+            }
+
+        return {
+            "count": summary["count"],
+            "total": summary["total"] / NS_PER_SECOND,
+            "mean": mean / NS_PER_SECOND,
+            "p50": summary["p50"] / NS_PER_SECOND,
+            "p90": summary["p90"] / NS_PER_SECOND,
+            "p99": summary["p99"] / NS_PER_SECOND,
+            "max": summary["max"] / NS_PER_SECOND
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for every recorded stage"""
+        with self._lock:
+            stages = sorted(self._histograms)
+        return {stage: self.stage_stats(stage) for stage in stages}
+
+    def dump_json(self, filepath: str) -> None:
+        """
+        Write the statistics snapshot as JSON.
+
+        Args:
+            filepath: Destination file path
+        """
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"unit": "seconds", "stages": self.snapshot()}, f, indent=2)
+
+    def reset(self) -> None:
+        """Drop all recorded statistics"""
+        with self._lock:
+            self._histograms.clear()
+
+
+_registry = StatsRegistry()
+
+
+def get_registry() -> StatsRegistry:
+    """Get the process-wide statistics registry"""
+    return _registry
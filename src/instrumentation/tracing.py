@@ -0,0 +1,125 @@
+"""
+Chrome Trace Event / Perfetto span export
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from .context import current_product
+
+
+class Tracer:
+    """
+    Collects nested execution spans and writes them in Chrome Trace Event
+    format, which loads directly in Perfetto or chrome://tracing.
+
+    Tracing is off by default; when disabled the only cost to instrumented
+    calls is a single attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def enable(self) -> None:
+        """Start recording spans"""
+        with self._lock:
+            self._events = []
+            self._thread_names = {}
+        self._origin_ns = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording spans"""
+        self.enabled = False
+
+    def add_span(self, name: str, category: str, start_ns: int, duration_ns: int) -> None:
+        """
+        Record a completed span.
+
+        Args:
+            name: Span name (agent, template or block name)
+            category: Span category (agent, template, block, stage)
+            start_ns: perf_counter_ns() timestamp at span start
+            duration_ns: Span duration in nanoseconds
+        """
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        if tid not in self._thread_names:
+            with self._lock:
+                self._thread_names[tid] = thread.name
+
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000.0,
+            "dur": duration_ns / 1000.0,
+            "pid": self._pid,
+            "tid": tid
+        }
+        product_id = current_product()
+        if product_id is not None:
+            event["args"] = {"product_id": product_id}
+
+        # list.append is atomic, so worker threads need no lock here
+        self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage") -> Iterator[None]:
+        """Record the enclosed block as a span when tracing is enabled"""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_span(name, category, start, time.perf_counter_ns() - start)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the trace as a Chrome Trace Event document"""
+        with self._lock:
+            metadata = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": thread_name}
+                }
+                for tid, thread_name in self._thread_names.items()
+            ]
+        return {
+            "traceEvents": metadata + list(self._events),
+            "displayTimeUnit": "ms"
+        }
+
+    def write(self, filepath: str) -> None:
+        """
+        Write recorded spans as a Chrome Trace Event JSON file.
+
+        Args:
+            filepath: Destination file path
+        """
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    return _tracer
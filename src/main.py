@@ -3,14 +3,36 @@ import sys
 import os
 import argparse
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Tuple, Union
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.agents.orchestrator_agent import OrchestratorAgent
 from src.config import Config
 from src.exceptions import ContentGenerationError
+from src.utils import AgentLogger
+from src.output.base_sink import PAGE_FILES
+from src.instrumentation import (
+    StackSampler,
+    StageProfiler,
+    get_metrics,
+    get_profiler,
+    get_registry,
+    get_sampler,
+    get_tracer,
+    serve_metrics,
+    set_profiler,
+    set_sampler
+)
+
+# Exit status of a batch where some products failed (see --dead-letter)
+EXIT_PARTIAL_SUCCESS = 2
+
+if TYPE_CHECKING:
+    from src.agents.orchestrator_agent import OrchestratorAgent
+    from src.ingestion import CSVProductReader
+    from src.output import OutputSink
 
 
 def parse_arguments():
@@ -22,7 +44,31 @@ def parse_arguments():
         '--input',
         type=str,
         default=str(Config.PRODUCT_DATA_FILE),
-        help='Path to product data JSON file'
+        help='Path to product data: a JSON file (an object, or an array for batch mode) '
+             'or a .csv export (batch mode)'
+    )
+    parser.add_argument(
+        '--stdin',
+        action='store_true',
+        help='Read products as JSON Lines from stdin (batch mode) instead of --input'
+    )
+    parser.add_argument(
+        '--stdout',
+        action='store_true',
+        help='Write one JSON line per product (faq, product_page, comparison) to stdout '
+             'instead of files; all other output goes to stderr'
+    )
+    parser.add_argument(
+        '--csv-columns',
+        type=str,
+        metavar='COLUMN=FIELD,...',
+        help='Map CSV columns onto product fields, e.g. "Name=product_name,Price (INR)=price"'
+    )
+    parser.add_argument(
+        '--list-delimiter',
+        type=str,
+        default=Config.CSV_LIST_DELIMITER,
+        help='Separator of list items (skin types, ingredients, benefits) in CSV cells'
     )
     parser.add_argument(
         '--output-dir',
@@ -30,44 +76,250 @@ def parse_arguments():
         default=str(Config.OUTPUT_DIR),
         help='Output directory for generated files'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=Config.BATCH_WORKERS,
+        help='Worker threads for batch mode'
+    )
+    parser.add_argument(
+        '--no-dedupe',
+        dest='dedupe',
+        action='store_false',
+        default=Config.BATCH_DEDUPE,
+        help='Render every batch record, even when its content duplicates another record'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted batch from its checkpoint, skipping committed products'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        type=str,
+        metavar='PATH',
+        help=f'Batch checkpoint file (default: <output-dir>/{Config.CHECKPOINT_FILE_NAME}, '
+             f'or <bundle/database>.checkpoint.json)'
+    )
+    parser.add_argument(
+        '--dead-letter',
+        type=str,
+        metavar='PATH',
+        help=f'JSONL file for batch records that fail to render (default: '
+             f'<output-dir>/{Config.DEAD_LETTER_FILE_NAME}, or <bundle/database>.dead_letter.jsonl)'
+    )
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='Stop the batch at the first product that fails instead of dead-lettering it'
+    )
+    parser.add_argument(
+        '--priority',
+        action='store_true',
+        default=Config.BATCH_PRIORITY,
+        help=f'Render urgent batch records first, by their "{Config.PRIORITY_FIELD}" field '
+             f'({", ".join(Config.PRIORITY_CLASSES)}; default {Config.PRIORITY_DEFAULT})'
+    )
+    parser.add_argument(
+        '--priority-file',
+        type=str,
+        metavar='PATH',
+        help='CSV file with product_id and priority columns, overriding record priorities (implies --priority)'
+    )
+    parser.add_argument(
+        '--agent-timeout',
+        type=float,
+        default=Config.AGENT_TIMEOUT,
+        metavar='SECONDS',
+        help='Time budget of each pipeline stage per product (0 for no limit)'
+    )
+    parser.add_argument(
+        '--product-timeout',
+        type=float,
+        default=Config.PRODUCT_TIMEOUT,
+        metavar='SECONDS',
+        help='Time budget of each product across all stages (0 for no limit)'
+    )
+    parser.add_argument(
+        '--layout',
+        choices=['flat', 'sharded'],
+        default=Config.OUTPUT_LAYOUT,
+        help='Batch output layout: <id>/ or hash-sharded ab/cd/<id>/ directories'
+    )
+    parser.add_argument(
+        '--bundle',
+        type=str,
+        metavar='PATH',
+        help='Append every page to one bundle file with a sidecar offset index instead of per-page files'
+    )
+    parser.add_argument(
+        '--bundle-format',
+        choices=['jsonl', 'tar'],
+        default=Config.OUTPUT_BUNDLE_FORMAT,
+        help='Bundle format for --bundle'
+    )
+    parser.add_argument(
+        '--sqlite',
+        type=str,
+        metavar='PATH',
+        help='Insert every page into a SQLite database with a full-text FAQ index instead of per-page files'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        default=Config.OUTPUT_COMPACT,
+        help='Write compact JSON files (no indentation) for machine consumers'
+    )
+    parser.add_argument(
+        '--dedupe-sections',
+        action='store_true',
+        help=f'Store repeated page sections once under <output>/{Config.SECTION_STORE_DIR}/ '
+             f'and reference them by hash'
+    )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Also write pre-compressed .json.gz pages (gzip members alongside a bundle)'
+    )
+    parser.add_argument(
+        '--gzip-level',
+        type=int,
+        choices=range(1, 10),
+        metavar='1-9',
+        default=Config.OUTPUT_GZIP_LEVEL,
+        help='Compression level for --gzip'
+    )
+    parser.add_argument(
+        '--fsync',
+        choices=['none', 'file', 'batch'],
+        default=Config.OUTPUT_FSYNC,
+        help='Output durability: no fsync, fsync per file, or one sync per commit group'
+    )
+    parser.add_argument(
+        '--metrics-file',
+        type=str,
+        metavar='PATH',
+        help=f'Write OpenMetrics text at the end of the run '
+             f'(batch mode default: <output-dir>/{Config.METRICS_FILE_NAME})'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        metavar='PORT',
+        help='Serve OpenMetrics text at http://<host>:PORT/metrics while running'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
         help='Enable verbose output'
     )
+    parser.add_argument(
+        '--log-level',
+        type=str.upper,
+        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+        default=Config.LOG_LEVEL,
+        help='Agent log level (per-product progress is logged at DEBUG)'
+    )
+    parser.add_argument(
+        '--log-format',
+        choices=['text', 'json'],
+        default=Config.LOG_FORMAT,
+        help='Agent log format'
+    )
+    parser.add_argument(
+        '--log-sample-rate',
+        type=float,
+        default=Config.LOG_SAMPLE_RATE,
+        help='Fraction of DEBUG/INFO agent log records to keep'
+    )
     parser.add_argument(
         '--stats',
         action='store_true',
         help='Show performance statistics'
     )
+    parser.add_argument(
+        '--stats-json',
+        type=str,
+        metavar='PATH',
+        help='Write per-stage latency percentiles as JSON at the end of the run'
+    )
+    parser.add_argument(
+        '--trace',
+        type=str,
+        metavar='PATH',
+        help='Write execution spans in Chrome Trace Event format (open in Perfetto)'
+    )
+    parser.add_argument(
+        '--profile',
+        choices=StageProfiler.MODES,
+        help='Profile each pipeline stage with cProfile (cpu) or tracemalloc (mem)'
+    )
+    parser.add_argument(
+        '--profile-dir',
+        type=str,
+        default=str(Config.PROFILE_DIR),
+        help='Output directory for profile reports'
+    )
+    parser.add_argument(
+        '--sample-profile',
+        type=int,
+        metavar='HZ',
+        help='Sample stacks at HZ per CPU-second and write folded stacks for flame graphs'
+    )
+    parser.add_argument(
+        '--sample-output',
+        type=str,
+        default=str(Config.SAMPLE_PROFILE_FILE),
+        help='Output path for folded stacks from --sample-profile'
+    )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.sqlite and (args.bundle or args.gzip or args.dedupe_sections):
+        parser.error("--sqlite cannot be combined with --bundle, --gzip or --dedupe-sections")
+    if args.stdout and (args.sqlite or args.bundle or args.gzip or args.dedupe_sections):
+        parser.error("--stdout cannot be combined with --sqlite, --bundle, --gzip or --dedupe-sections")
+    if args.stdout and (args.resume or args.checkpoint):
+        parser.error("--stdout output cannot be checkpointed or resumed")
+    return args
 
 
-def load_product_data(filepath: str) -> dict:
+def load_product_data(filepath: str) -> Union[dict, Iterator[dict]]:
     """
     Load and validate product data from JSON file.
     
+    Arrays are not loaded at once: they are decoded one product at a time
+    as the batch consumes them, so rendering starts right away and memory
+    stays bounded however large the file is. Their records are validated
+    by the pipeline's parse stage, so one malformed record fails alone.
+    
     Args:
-        filepath: Path to JSON file
+        filepath: Path to JSON file holding one product object, or an
+            array of product objects for batch mode
         
     Returns:
-        dict: Product data
+        dict or iterator: The product, or a lazy iterator of products
         
     Raises:
         FileNotFoundError: If file doesn't exist
         json.JSONDecodeError: If JSON is invalid
     """
+    from src.ingestion import JSONArrayReader, starts_with_array
+    
     path = Path(filepath)
     
     if not path.exists():
         raise FileNotFoundError(f"Product data file not found: {filepath}")
     
+    if starts_with_array(filepath):
+        return iter(JSONArrayReader(filepath))
+    
     try:
         with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
         # Basic validation
+        if not isinstance(data, dict):
+            raise ValueError("Product data must be a JSON object or an array of objects")
         required_fields = ['product_name', 'concentration', 'skin_type']
         missing = [f for f in required_fields if f not in data]
         
@@ -84,6 +336,44 @@ def load_product_data(filepath: str) -> dict:
         )
 
 
+def load_jsonl_products(stream) -> Iterator[dict]:
+    """
+    Stream products given as JSON Lines (one object per line).
+    
+    Args:
+        stream: Text stream, e.g. sys.stdin
+        
+    Returns:
+        iterator: Lazy iterator of products
+    """
+    from src.ingestion import JSONLinesReader
+    
+    return iter(JSONLinesReader(stream))
+
+
+def load_csv_products(args) -> "CSVProductReader":
+    """
+    Open a CSV catalog for streaming.
+    
+    Args:
+        args: Parsed arguments (input path, column map and list delimiter)
+        
+    Returns:
+        CSVProductReader: Lazy iterator of product records
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If the column map is malformed
+    """
+    from src.ingestion import CSVProductReader, parse_column_map
+    
+    if not Path(args.input).exists():
+        raise FileNotFoundError(f"Product data file not found: {args.input}")
+    
+    column_map = parse_column_map(args.csv_columns) if args.csv_columns else None
+    return CSVProductReader(args.input, column_map=column_map, list_delimiter=args.list_delimiter)
+
+
 def print_banner():
     """Print application banner"""
     print("=" * 60)
@@ -93,70 +383,335 @@ def print_banner():
 
 
 def print_stats(orchestrator):
-    """Print performance statistics"""
+    """Print per-stage latency percentiles for agents and content blocks"""
     print("\n" + "=" * 60)
     print("Performance Statistics")
     print("=" * 60)
     
     agents = [
+        orchestrator,
         orchestrator.data_parser,
         orchestrator.question_generator,
         orchestrator.faq_generator,
         orchestrator.product_page_generator,
         orchestrator.comparison_generator
     ]
+    agent_names = {agent.get_name() for agent in agents}
     
     for agent in agents:
         stats = agent.get_stats()
-        print(f"{stats['name']:.<30} {stats['executions']} exec(s), {stats['average_time']:.3f}s avg")
+        print(
+            f"{stats['name']:.<30} {stats['executions']} exec(s), "
+            f"p50 {stats['p50_time'] * 1000:.3f}ms, p90 {stats['p90_time'] * 1000:.3f}ms, "
+            f"p99 {stats['p99_time'] * 1000:.3f}ms, max {stats['max_time'] * 1000:.3f}ms"
+        )
+    
+    for stage, stats in get_registry().snapshot().items():
+        if stage in agent_names:
+            continue
+        print(
+            f"{stage:.<30} {stats['count']} call(s), "
+            f"p50 {stats['p50'] * 1000:.3f}ms, p90 {stats['p90'] * 1000:.3f}ms, "
+            f"p99 {stats['p99'] * 1000:.3f}ms, max {stats['max'] * 1000:.3f}ms"
+        )
     
     print("=" * 60)
 
 
+def create_sink(args, batch: bool) -> "OutputSink":
+    """Create the output sink selected on the command line"""
+    from src.output import (
+        AtomicFileWriter,
+        BundleSink,
+        FileSink,
+        GzipCompressor,
+        SectionStore,
+        SQLiteSink,
+        StreamSink,
+        get_layout,
+        single_product_sink
+    )
+    
+    if args.stdout:
+        # The real stdout: sys.stdout itself is redirected to stderr
+        return StreamSink(sys.__stdout__.buffer)
+    
+    if args.sqlite:
+        return SQLiteSink(args.sqlite, fsync=args.fsync)
+    
+    compressor = GzipCompressor(level=args.gzip_level) if args.gzip else None
+    writer = AtomicFileWriter(fsync=args.fsync)
+    
+    if args.bundle:
+        sections = None
+        if args.dedupe_sections:
+            sections = SectionStore(os.path.dirname(os.path.abspath(args.bundle)), writer=writer)
+        return BundleSink(
+            args.bundle,
+            fmt=args.bundle_format,
+            fsync=args.fsync,
+            compressor=compressor,
+            sections=sections
+        )
+    
+    sections = SectionStore(args.output_dir, writer=writer) if args.dedupe_sections else None
+    if batch:
+        return FileSink(
+            args.output_dir,
+            layout=get_layout(args.layout),
+            writer=writer,
+            compressor=compressor,
+            compact=args.compact,
+            sections=sections
+        )
+    return single_product_sink(args.output_dir, writer, compressor, compact=args.compact, sections=sections)
+
+
+def checkpoint_path(args) -> str:
+    """Get the batch checkpoint file, next to the output it describes"""
+    if args.checkpoint:
+        return args.checkpoint
+    if args.bundle:
+        return args.bundle + ".checkpoint.json"
+    if args.sqlite:
+        return args.sqlite + ".checkpoint.json"
+    return os.path.join(args.output_dir, Config.CHECKPOINT_FILE_NAME)
+
+
+def dead_letter_path(args) -> str:
+    """Get the dead-letter file, next to the output of the run"""
+    if args.dead_letter:
+        return args.dead_letter
+    if args.bundle:
+        return args.bundle + ".dead_letter.jsonl"
+    if args.sqlite:
+        return args.sqlite + ".dead_letter.jsonl"
+    return os.path.join(args.output_dir, Config.DEAD_LETTER_FILE_NAME)
+
+
+def print_sink_location(args, sink) -> None:
+    """Print where a run's pages were written, and how well they compressed"""
+    if args.stdout:
+        print(f"Streamed {sink.stats()['records']} product record(s) to stdout")
+    elif args.sqlite:
+        print(f"SQLite database: {sink.path} ({sink.stats()['faq_entries']} FAQ entries indexed)")
+    elif args.bundle:
+        print(f"Bundle: {sink.path} ({args.bundle_format}, index: {sink.index_path})")
+    elif sink.index is not None:
+        print(f"Output directory: {args.output_dir} ({args.layout} layout, index: {sink.index.path})")
+    else:
+        print("Output files:")
+        for filename in PAGE_FILES.values():
+            print(f"  - {os.path.join(args.output_dir, filename)}")
+    
+    stats = sink.stats()
+    if 'gzip_ratio' in stats:
+        print(f"Gzip: {stats['gzip_raw_bytes'] / 1e6:.2f} MB -> {stats['gzip_bytes'] / 1e6:.2f} MB "
+              f"({stats['gzip_ratio']:.1%}), {stats['gzip_seconds']:.2f}s compressing")
+    if 'sections_stored' in stats:
+        print(f"Sections: {stats['sections_stored']} new, {stats['sections_stored_bytes'] / 1e6:.2f} MB stored "
+              f"for {stats['sections_referenced_bytes'] / 1e6:.2f} MB referenced by pages")
+
+
+def run_single(args, product_data: dict) -> "OrchestratorAgent":
+    """Render one product into the output directory"""
+    # Agents (and pydantic) are imported only once there is work to do
+    from src.agents.orchestrator_agent import OrchestratorAgent
+    
+    print(f"✓ Loaded: {product_data.get('product_name', 'Unknown Product')}")
+    print()
+    
+    # Initialize orchestrator
+    orchestrator = OrchestratorAgent(agent_timeout=args.agent_timeout, product_timeout=args.product_timeout)
+    
+    # Execute pipeline
+    print("Starting content generation pipeline...")
+    results = orchestrator.execute(product_data)
+    
+    # Save outputs
+    print()
+    print("Saving outputs...")
+    sink = create_sink(args, batch=False)
+    try:
+        orchestrator.save_outputs(results, sink=sink)
+    finally:
+        sink.close()
+    
+    # Success summary
+    print()
+    print("=" * 60)
+    print("✓ Content Generation Complete!")
+    print("=" * 60)
+    print(f"Generated {results['metadata']['pages_generated']} pages")
+    print(f"Total questions: {results['metadata']['total_questions_generated']}")
+    print()
+    print_sink_location(args, sink)
+    
+    return orchestrator
+
+
+def run_batch(args, records: Iterable[dict]) -> Tuple["OrchestratorAgent", int]:
+    """
+    Render every product of a batch, one output directory per product.
+    
+    Returns:
+        The orchestrator, and the exit status: 0, or EXIT_PARTIAL_SUCCESS
+        if some products failed and went to the dead-letter file
+    """
+    from src.agents import OrchestratorAgent, RetryBudget, RetryPolicy
+    from src.pipeline import BatchRunner, Checkpoint, DeadLetterFile, PriorityResolver, load_priority_file
+    
+    print("✓ Streaming products as they are read")
+    print()
+    
+    checkpoint = None
+    if not args.stdout:
+        checkpoint = Checkpoint(checkpoint_path(args), fsync=args.fsync)
+        if args.resume:
+            if checkpoint.load():
+                print(f"Resuming from checkpoint: {checkpoint.path} "
+                      f"({checkpoint.watermark} products committed in input order)")
+            else:
+                print(f"No checkpoint at {checkpoint.path}, starting from the beginning")
+    
+    dead_letter = None if args.fail_fast else DeadLetterFile(dead_letter_path(args), fsync=args.fsync)
+    
+    priorities = None
+    if args.priority or args.priority_file:
+        overrides = load_priority_file(args.priority_file) if args.priority_file else None
+        priorities = PriorityResolver(overrides)
+        source = f"{len(overrides)} products from {args.priority_file}, then " if overrides is not None else ""
+        print(f"✓ Scheduling by priority ({source}the \"{Config.PRIORITY_FIELD}\" field)")
+    
+    print(f"Starting batch pipeline with {args.workers} worker(s)...")
+    sink = create_sink(args, batch=True)
+    runner = BatchRunner(
+        args.output_dir,
+        orchestrator=OrchestratorAgent(
+            agent_timeout=args.agent_timeout,
+            product_timeout=args.product_timeout,
+            retry_policy=RetryPolicy(budget=RetryBudget())
+        ),
+        workers=args.workers,
+        queue_size=Config.PRIORITY_QUEUE_SIZE if priorities else Config.BATCH_QUEUE_SIZE,
+        sink=sink,
+        dedupe=args.dedupe,
+        checkpoint=checkpoint,
+        dead_letter=dead_letter,
+        priorities=priorities
+    )
+    try:
+        summary = runner.run(records)
+    finally:
+        sink.close()
+        if dead_letter is not None:
+            dead_letter.close()
+    
+    if not args.metrics_file and not args.stdout:
+        args.metrics_file = os.path.join(args.output_dir, Config.METRICS_FILE_NAME)
+    
+    failed = summary['failed']
+    print()
+    print("=" * 60)
+    print("✓ Batch Complete!" if not failed else "✗ Batch Completed With Failures")
+    print("=" * 60)
+    print(f"Rendered {summary['products']} products in {summary['elapsed']:.2f}s "
+          f"({summary['throughput']:.1f} products/s)")
+    if failed:
+        by_stage = ", ".join(f"{stage}: {count}" for stage, count in sorted(summary['dead_letter']['by_stage'].items()))
+        print(f"Failed {failed} products ({by_stage}), written to {summary['dead_letter']['path']}")
+    for name, wait in summary.get('queue_wait', {}).items():
+        print(f"Queue wait ({name}): {wait['count']} products, p50 {wait['p50'] * 1000:.1f} ms, "
+              f"p99 {wait['p99'] * 1000:.1f} ms, max {wait['max'] * 1000:.1f} ms")
+    if summary.get('invalid_priorities'):
+        print(f"{summary['invalid_priorities']} records had an invalid priority and were scheduled as "
+              f"{Config.PRIORITY_DEFAULT}")
+    retries = summary.get('retries', {})
+    if retries.get('retries') or retries.get('denied'):
+        print(f"Retried {retries['retries']} agent calls after transient errors "
+              f"({retries['denied']} retries denied by the batch retry budget)")
+    if summary.get('checkpoint', {}).get('skipped'):
+        print(f"Skipped {summary['checkpoint']['skipped']} products committed before the resume")
+    if 'dedupe' in summary:
+        dedupe = summary['dedupe']
+        print(f"Deduplicated {dedupe['records'] - dedupe['distinct']} of {dedupe['records']} records "
+              f"({dedupe['dedupe_ratio']:.1%}); {dedupe['distinct']} distinct products rendered")
+    output = summary['output']
+    print(f"Wrote {output['pages']} pages, {output['bytes'] / 1e6:.1f} MB "
+          f"in {output['commits']} commit(s) ({output['mb_per_s']:.1f} MB/s)")
+    print_sink_location(args, sink)
+    
+    return runner.orchestrator, EXIT_PARTIAL_SUCCESS if failed else 0
+
+
 def main():
     """Main execution function"""
     args = parse_arguments()
     
+    if args.stdout:
+        # stdout carries only page records (see create_sink); everything
+        # printed goes to stderr
+        sys.stdout = sys.stderr
+    
+    AgentLogger.configure(
+        level=args.log_level,
+        fmt=args.log_format,
+        sample_rate=args.log_sample_rate
+    )
+    
+    if args.trace:
+        get_tracer().enable()
+    
+    if args.profile:
+        profiler = StageProfiler(args.profile, top_n=Config.PROFILE_TOP_N)
+        profiler.start()
+        set_profiler(profiler)
+    
+    if args.sample_profile:
+        sampler = StackSampler(args.sample_profile)
+        set_sampler(sampler)
+        sampler.start()
+    
+    metrics_server = None
+    
     try:
         print_banner()
         
         # Load product data
-        print(f"Loading product data from: {args.input}")
-        product_data = load_product_data(args.input)
-        print(f"✓ Loaded: {product_data.get('product_name', 'Unknown Product')}")
-        print()
+        if args.stdin:
+            print("Loading product data from: stdin (JSON Lines)")
+            product_data = load_jsonl_products(sys.stdin)
+        elif Path(args.input).suffix.lower() == '.csv':
+            print(f"Loading product data from: {args.input}")
+            product_data = load_csv_products(args)
+        else:
+            print(f"Loading product data from: {args.input}")
+            product_data = load_product_data(args.input)
         
-        # Initialize orchestrator
-        orchestrator = OrchestratorAgent()
-        
-        # Execute pipeline
-        print("Starting content generation pipeline...")
-        results = orchestrator.execute(product_data)
-        
-        # Save outputs
-        print()
-        print("Saving outputs...")
-        orchestrator.save_outputs(results, args.output_dir)
+        if args.metrics_port is not None:
+            metrics_server = serve_metrics(args.metrics_port)
+            print(f"Serving metrics at: http://localhost:{metrics_server.server_address[1]}/metrics")
         
-        # Success summary
-        print()
-        print("=" * 60)
-        print("✓ Content Generation Complete!")
-        print("=" * 60)
-        print(f"Generated {results['metadata']['pages_generated']} pages")
-        print(f"Total questions: {results['metadata']['total_questions_generated']}")
-        print()
-        print("Output files:")
-        print(f"  - {os.path.join(args.output_dir, 'faq.json')}")
-        print(f"  - {os.path.join(args.output_dir, 'product_page.json')}")
-        print(f"  - {os.path.join(args.output_dir, 'comparison_page.json')}")
+        status = 0
+        if not isinstance(product_data, dict):
+            orchestrator, status = run_batch(args, product_data)
+        else:
+            orchestrator = run_single(args, product_data)
         
         # Show stats if requested
         if args.stats:
             print_stats(orchestrator)
         
+        if args.stats_json:
+            get_registry().dump_json(args.stats_json)
+            print(f"Statistics written to: {args.stats_json}")
+        
+        if args.metrics_file:
+            get_metrics().write(args.metrics_file)
+            print(f"Metrics written to: {args.metrics_file}")
+        
         print()
-        return 0
+        return status
         
     except FileNotFoundError as e:
         print(f"\n✗ Error: {e}", file=sys.stderr)
@@ -170,12 +725,46 @@ def main():
         print(f"\n✗ Generation Error: {e}", file=sys.stderr)
         return 1
     
+    except BrokenPipeError:
+        # The reader of --stdout went away (e.g. `| head`): stop quietly and
+        # keep the interpreter from failing to flush stdout at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.__stdout__.fileno())
+        return 1
+    
     except Exception as e:
         print(f"\n✗ Unexpected Error: {e}", file=sys.stderr)
         if args.verbose:
             import traceback
             traceback.print_exc()
         return 1
+    
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        
+        if args.trace:
+            get_tracer().write(args.trace)
+            print(f"Trace written to: {args.trace}")
+        
+        profiler = get_profiler()
+        if profiler is not None:
+            set_profiler(None)
+            profiler.stop()
+            written = profiler.write(args.profile_dir)
+            print(f"Profile reports written to: {args.profile_dir} ({len(written)} file(s))")
+        
+        sampler = get_sampler()
+        if sampler is not None:
+            sampler.stop()
+            set_sampler(None)
+            sampler.write(args.sample_output)
+            print(
+                f"Folded stacks written to: {args.sample_output} "
+                f"({sampler.samples} samples, {sampler.overhead():.2%} overhead)"
+            )
+        
+        AgentLogger.shutdown()
 
 
 if __name__ == "__main__":
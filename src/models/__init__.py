@@ -1,4 +1,17 @@
 """Models package"""
-from .product import Product, Question, FAQ, ProductPage, ComparisonPage
+from .._lazy import lazy_exports
 
-__all__ = ['Product', 'Question', 'FAQ', 'ProductPage', 'ComparisonPage']
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'Product': '.product',
+    'Question': '.product',
+    'FAQ': '.product',
+    'ProductPage': '.product',
+    'ComparisonPage': '.product',
+    'InvalidRecord': '.record'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,25 @@
+"""
+Raw input records that failed checks at read time
+"""
+from typing import Any, Dict
+
+
+class InvalidRecord(dict):
+    """
+    A raw record whose source row was malformed (e.g. an empty required
+    cell, the wrong number of columns or a line that is not valid JSON).
+
+    Readers yield it in place of the record instead of raising, so one bad
+    row doesn't end the input stream: it holds whatever fields the row did
+    provide (the raw text of a line that isn't JSON), and DataParserAgent raises ``error`` in the parse stage, where
+    the batch runner dead-letters it like any other failing product.
+    """
+
+    def __init__(self, fields: Dict[str, Any], error: Exception):
+        """
+        Args:
+            fields: Fields read from the row
+            error: Why the row is invalid
+        """
+        super().__init__(fields)
+        self.error = error
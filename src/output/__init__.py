@@ -0,0 +1,36 @@
+"""Output package"""
+from .._lazy import lazy_exports
+
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'AtomicFileWriter': '.writer',
+    'OutputSink': '.base_sink',
+    'PAGE_FILES': '.base_sink',
+    'FileSink': '.file_sink',
+    'single_product_sink': '.file_sink',
+    'BundleSink': '.bundle_sink',
+    'BundleReader': '.bundle_reader',
+    'SQLiteSink': '.sqlite_sink',
+    'StreamSink': '.stream_sink',
+    'search_faq': '.sqlite_sink',
+    'GzipCompressor': '.compression',
+    'JSONSerializer': '.serialization',
+    'StaticFragment': '.serialization',
+    'StaticDict': '.serialization',
+    'StaticList': '.serialization',
+    'static_fragment': '.serialization',
+    'get_serializer': '.serialization',
+    'SectionStore': '.section_store',
+    'SectionResolver': '.section_store',
+    'OutputLayout': '.layout',
+    'FlatLayout': '.layout',
+    'ShardedLayout': '.layout',
+    'ProductIndex': '.layout',
+    'get_layout': '.layout',
+    'load_index': '.layout'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,94 @@
+"""
+Base class for output sinks
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Page type -> file name used by file-based outputs
+PAGE_FILES = {
+    'faq': 'faq.json',
+    'product_page': 'product_page.json',
+    'comparison': 'comparison_page.json'
+}
+
+
+class OutputSink(ABC):
+    """
+    Destination for rendered pages.
+
+    Sinks receive each product's pages already serialized to JSON bytes
+    and decide how they are stored. Pages become visible to readers on
+    commit(); sinks may also commit on their own as pages accumulate.
+
+    After every commit, a sink reports the products it published (one id
+    per write_product call) and the state needed to roll its output back
+    to that point to ``commit_listener``, which is how batch checkpoints
+    stay in step with the output.
+    """
+
+    # Whether pages should be serialized without indentation
+    compact = False
+
+    # Optional SectionStore: pages then reference shared sections by hash
+    sections = None
+
+    # Called with (product ids, sink state) after each commit
+    commit_listener: Optional[Callable[[List[str], Dict[str, Any]], None]] = None
+
+    def prepare_page(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transform a rendered page before it is serialized.
+
+        Args:
+            page: Rendered page
+
+        Returns:
+            The page, with sections replaced by references if the sink has
+            a section store
+        """
+        if self.sections is not None:
+            return self.sections.dedupe(page)
+        return page
+
+    @abstractmethod
+    def write_product(self, product_id: str, pages: Dict[str, bytes]) -> None:
+        """
+        Store every page of a product.
+
+        Args:
+            product_id: Product identifier
+            pages: Page type (see PAGE_FILES) -> serialized page
+        """
+        pass
+
+    @abstractmethod
+    def commit(self) -> None:
+        """Publish everything written so far"""
+        pass
+
+    def close(self) -> None:
+        """Commit and release resources"""
+        self.commit()
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Drop output written after the commit that reported ``state``.
+
+        Sinks whose writes are idempotent (files, database rows replaced by
+        product id) have nothing to undo; append-only sinks truncate.
+
+        Args:
+            state: Sink state passed to commit_listener by that commit
+        """
+        pass
+
+    def _notify_commit(self, product_ids: List[str], state: Optional[Dict[str, Any]] = None) -> None:
+        """Report committed products to the commit listener, if any"""
+        if self.commit_listener is not None and product_ids:
+            self.commit_listener(product_ids, state or {})
+
+    @abstractmethod
+    def stats(self) -> Dict[str, float]:
+        """Get files/pages and bytes written, time spent and throughput"""
+        pass
@@ -0,0 +1,182 @@
+"""
+BundleReader: random access to pages in a bundle
+"""
+import json
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import Config
+
+
+_SEPARATOR = "\x00"
+
+
+class BundleReader:
+    """
+    Looks up pages in a bundle written by BundleSink.
+
+    The bundle is memory-mapped once and the sidecar index is loaded into
+    a sorted list of ``product_id\\0page_type`` keys with parallel
+    ``array('Q')`` offsets and lengths, so a lookup is a binary search plus
+    a slice of the mapping: no file opens, seeks or reads per request, and
+    pages are only decoded when asked for. Safe to share between threads.
+
+    If the bundle was written with gzip members, ``<bundle>.pages.gz`` is
+    mapped as well and get_gzip_view() returns a page's compressed bytes.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        """
+        Args:
+            path: Bundle file path
+            index_path: Sidecar index path (``<path>.index.jsonl`` by default)
+        """
+        self.path = path
+        self.index_path = index_path or path + Config.OUTPUT_BUNDLE_INDEX_SUFFIX
+
+        self._map, self._view = _map_file(path)
+        gzip_path = path + Config.OUTPUT_BUNDLE_GZIP_SUFFIX
+        if os.path.exists(gzip_path):
+            self._gz_map, self._gz_view = _map_file(gzip_path)
+        else:
+            self._gz_map, self._gz_view = None, memoryview(b"")
+
+        self._keys: List[str] = []
+        self._offsets = array('Q')
+        self._lengths = array('Q')
+        self._gz_offsets = array('Q')
+        self._gz_lengths = array('Q')
+        self.skipped = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        size = len(self._view)
+        gz_size = len(self._gz_view)
+        # Later entries win, as when a product is appended again
+        entries: Dict[str, tuple] = {}
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["offset"] + entry["length"] > size:
+                    # Points past the end of the bundle (e.g. a truncated copy)
+                    self.skipped += 1
+                    continue
+                gz_offset = entry.get("gz_offset", 0)
+                gz_length = entry.get("gz_length", 0)
+                if gz_offset + gz_length > gz_size:
+                    gz_offset = gz_length = 0
+                key = entry["product_id"] + _SEPARATOR + entry["page_type"]
+                entries[key] = (entry["offset"], entry["length"], gz_offset, gz_length)
+
+        for key in sorted(entries):
+            offset, length, gz_offset, gz_length = entries[key]
+            self._keys.append(key)
+            self._offsets.append(offset)
+            self._lengths.append(length)
+            self._gz_offsets.append(gz_offset)
+            self._gz_lengths.append(gz_length)
+
+    def _position(self, key: str) -> int:
+        position = bisect_left(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            return -1
+        return position
+
+    def _slice(self, position: int) -> memoryview:
+        offset = self._offsets[position]
+        return self._view[offset:offset + self._lengths[position]]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, item) -> bool:
+        product_id, page_type = item
+        return self._position(product_id + _SEPARATOR + page_type) >= 0
+
+    def get_view(self, product_id: str, page_type: str) -> memoryview:
+        """
+        Get a page's JSON bytes without copying them.
+
+        Args:
+            product_id: Product identifier
+            page_type: Page type ('faq', 'product_page' or 'comparison')
+
+        Returns:
+            memoryview over the mapped bundle (release it before close())
+
+        Raises:
+            KeyError: If the bundle has no such page
+        """
+        position = self._position(product_id + _SEPARATOR + page_type)
+        if position < 0:
+            raise KeyError((product_id, page_type))
+        return self._slice(position)
+
+    def get_gzip_view(self, product_id: str, page_type: str) -> memoryview:
+        """
+        Get a page's pre-compressed gzip member without copying it.
+
+        Raises:
+            KeyError: If the bundle has no such page or no gzip member for it
+        """
+        position = self._position(product_id + _SEPARATOR + page_type)
+        if position < 0 or not self._gz_lengths[position]:
+            raise KeyError((product_id, page_type))
+        offset = self._gz_offsets[position]
+        return self._gz_view[offset:offset + self._gz_lengths[position]]
+
+    def get(self, product_id: str, page_type: str) -> Dict[str, Any]:
+        """
+        Get a decoded page.
+
+        Raises:
+            KeyError: If the bundle has no such page
+        """
+        return json.loads(self.get_view(product_id, page_type).tobytes())
+
+    def pages(self, product_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get every decoded page of a product, keyed by page type"""
+        prefix = product_id + _SEPARATOR
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, product_id + "\x01", start)
+        return {
+            self._keys[position][len(prefix):]: json.loads(self._slice(position).tobytes())
+            for position in range(start, end)
+        }
+
+    def product_ids(self) -> List[str]:
+        """Get the ids of all products in the bundle, sorted"""
+        ids: List[str] = []
+        for key in self._keys:
+            product_id = key.split(_SEPARATOR, 1)[0]
+            if not ids or ids[-1] != product_id:
+                ids.append(product_id)
+        return ids
+
+    def close(self) -> None:
+        """Unmap the bundle (views returned earlier must be released first)"""
+        for view, mapping in ((self._view, self._map), (self._gz_view, self._gz_map)):
+            view.release()
+            if mapping is not None:
+                mapping.close()
+        self._map = self._gz_map = None
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _map_file(path: str) -> Tuple[Optional[mmap.mmap], memoryview]:
+    """Map a file read-only; empty files (which mmap rejects) get an empty view"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, memoryview(b"")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return mapping, memoryview(mapping)
@@ -0,0 +1,269 @@
+"""
+BundleSink: every page of a run in one append-only file
+"""
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .base_sink import PAGE_FILES, OutputSink
+from .compression import GzipCompressor
+from .layout import safe_product_id
+from .section_store import SectionStore
+from ..config import Config
+from ..exceptions import OutputGenerationError
+
+
+class BundleSink(OutputSink):
+    """
+    Appends pages to a single bundle file with a sidecar offset index.
+
+    Formats:
+    - ``jsonl``: one ``{"product_id", "page_type", "page"}`` object per line
+    - ``tar``: an uncompressed tar with ``<product_id>/<page file>`` members
+
+    The sidecar index (``<bundle>.index.jsonl``) holds one
+    ``{"product_id", "page_type", "offset", "length"}`` line per page, where
+    offset and length locate the page's JSON bytes inside the bundle, so a
+    reader can mmap the bundle and slice a page out without parsing
+    anything else. Index lines are appended on commit, after the bundle
+    data is flushed (and synced, per the fsync policy), so the index never
+    points past the durable end of the bundle.
+
+    With a compressor, each page is also gzipped on the compressor's pool
+    and appended as an independent gzip member to ``<bundle>.pages.gz``;
+    its index line then carries ``gz_offset`` and ``gz_length`` too, so the
+    pre-compressed bytes of a page can be served directly.
+
+    Commits report the committed sizes of the bundle, gzip and index files
+    as their state; restore() truncates the files back to those sizes, so a
+    resumed batch does not append products a second time.
+    """
+
+    FORMATS = ("jsonl", "tar")
+    compact = True
+
+    def __init__(
+        self,
+        path: str,
+        fmt: str = Config.OUTPUT_BUNDLE_FORMAT,
+        fsync: str = Config.OUTPUT_FSYNC,
+        commit_every: int = Config.OUTPUT_COMMIT_EVERY,
+        compressor: Optional[GzipCompressor] = None,
+        sections: Optional[SectionStore] = None
+    ):
+        """
+        Args:
+            path: Bundle file path (appended to if it exists)
+            fmt: Bundle format, one of FORMATS
+            fsync: "none" to skip fsync, otherwise sync bundle and index on commit
+            commit_every: Commit automatically once this many pages are pending
+            compressor: Also write gzip members of every page when given
+                (shut down by close())
+            sections: Store shared sections once and reference them from pages
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown bundle format: {fmt}")
+
+        self.path = path
+        self.index_path = path + Config.OUTPUT_BUNDLE_INDEX_SUFFIX
+        self.fmt = fmt
+        self.fsync = fsync
+        self.commit_every = max(1, commit_every)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # The tar is opened on first use (or by restore()): opening it for
+        # appending reads every member, which fails on a tail torn by a crash
+        self._tar: Optional[tarfile.TarFile] = None
+        if fmt == "jsonl":
+            self._file = open(path, "ab", buffering=Config.OUTPUT_BUFFER_SIZE)
+            self._offset = self._file.tell()
+
+        self.sections = sections
+        self.compressor = compressor
+        self.gzip_path = path + Config.OUTPUT_BUNDLE_GZIP_SUFFIX
+        if compressor is not None:
+            self._gz_file = open(self.gzip_path, "ab", buffering=Config.OUTPUT_BUFFER_SIZE)
+            self._gz_offset = self._gz_file.tell()
+        self._gz_lock = threading.Lock()
+
+        self.pages_written = 0
+        self.bytes_written = 0
+        self.commits = 0
+        self._write_ns = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._products: List[str] = []
+        self._lock = threading.Lock()
+
+    def write_product(self, product_id: str, pages: Dict[str, bytes]) -> None:
+        with self._lock:
+            start = time.perf_counter_ns()
+            for page_type, data in pages.items():
+                if self.fmt == "tar":
+                    offset = self._append_tar_member(product_id, page_type, data)
+                else:
+                    offset = self._append_line(product_id, page_type, data)
+                entry = {
+                    "product_id": product_id,
+                    "page_type": page_type,
+                    "offset": offset,
+                    "length": len(data)
+                }
+                self._pending.append(entry)
+                self.bytes_written += len(data)
+                if self.compressor is not None:
+                    self.compressor.submit(
+                        data, lambda gz_data, entry=entry: self._append_gzip(entry, gz_data)
+                    )
+            self._products.append(product_id)
+            self._write_ns += time.perf_counter_ns() - start
+
+            if len(self._pending) >= self.commit_every:
+                self._commit_locked()
+
+    def _append_line(self, product_id: str, page_type: str, data: bytes) -> int:
+        """Write one JSONL record and return the offset of its page bytes"""
+        head = json.dumps({"product_id": product_id, "page_type": page_type}, ensure_ascii=False)
+        prefix = (head[:-1] + ', "page": ').encode('utf-8')
+        self._file.write(prefix)
+        self._file.write(data)
+        self._file.write(b"}\n")
+        offset = self._offset + len(prefix)
+        self._offset = offset + len(data) + 2
+        return offset
+
+    def _open_tar(self) -> tarfile.TarFile:
+        """Open the tar for appending, positioned after its last member"""
+        if self._tar is None:
+            self._tar = tarfile.open(self.path, "a", format=tarfile.PAX_FORMAT)
+            self._file = self._tar.fileobj
+        return self._tar
+
+    def _append_tar_member(self, product_id: str, page_type: str, data: bytes) -> int:
+        """Add one tar member and return the offset of its data"""
+        self._open_tar()
+        info = tarfile.TarInfo(f"{safe_product_id(product_id)}/{PAGE_FILES[page_type]}")
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(data))
+        # Member data ends on the last 512-byte block before the new offset
+        padded = -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        return self._tar.offset - padded
+
+    def _append_gzip(self, entry: Dict[str, Any], gz_data: bytes) -> None:
+        """Append a compressed page (on the compressor's pool)"""
+        with self._gz_lock:
+            entry["gz_offset"] = self._gz_offset
+            entry["gz_length"] = len(gz_data)
+            self._gz_file.write(gz_data)
+            self._gz_offset += len(gz_data)
+
+    def commit(self) -> None:
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        start = time.perf_counter_ns()
+        if self.compressor is not None:
+            # Every pending entry gets its gzip member before it is indexed
+            self.compressor.wait()
+
+        pending, self._pending = self._pending, []
+        products, self._products = self._products, []
+        if not pending:
+            return
+
+        if self.sections is not None:
+            # Sections of every pending page were staged before its entry
+            self.sections.commit()
+
+        files = [self._file]
+        if self.compressor is not None:
+            files.append(self._gz_file)
+        for f in files:
+            f.flush()
+            if self.fsync != "none":
+                os.fsync(f.fileno())
+
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in pending)
+        with open(self.index_path, 'ab') as f:
+            f.write(lines.encode('utf-8'))
+            if self.fsync != "none":
+                f.flush()
+                os.fsync(f.fileno())
+            index_size = f.tell()
+
+        self.pages_written += len(pending)
+        self.commits += 1
+        self._write_ns += time.perf_counter_ns() - start
+
+        state = {
+            "bundle_size": self._tar.offset if self._tar is not None else self._offset,
+            "index_size": index_size
+        }
+        if self.compressor is not None:
+            state["gzip_size"] = self._gz_offset
+        self._notify_commit(products, state)
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._pending:
+                raise OutputGenerationError("Cannot restore a bundle with uncommitted pages")
+            if self.fmt == "tar" and self._tar is None:
+                # Cut the tail off first, then write on from the committed end
+                # (the archive has no end-of-archive blocks there to scan for)
+                self._file = open(self.path, "ab")
+                self._truncate(self._file, state.get("bundle_size", 0))
+                self._tar = tarfile.open(fileobj=self._file, mode="w", format=tarfile.PAX_FORMAT)
+            elif self._tar is not None:
+                self._truncate(self._file, state.get("bundle_size", 0))
+                self._tar.offset = self._file.tell()
+            else:
+                self._truncate(self._file, state.get("bundle_size", 0))
+                self._offset = self._file.tell()
+            if self.compressor is not None:
+                self._truncate(self._gz_file, state.get("gzip_size", 0))
+                self._gz_offset = self._gz_file.tell()
+            with open(self.index_path, 'ab') as f:
+                self._truncate(f, state.get("index_size", 0))
+
+    def _truncate(self, f, size: int) -> None:
+        """Cut an open file back to a committed size"""
+        f.flush()
+        end = f.seek(0, os.SEEK_END)
+        if end < size:
+            raise OutputGenerationError(
+                f"{f.name} is shorter ({end} bytes) than its checkpoint ({size} bytes)"
+            )
+        f.truncate(size)
+        f.seek(size)
+
+    def close(self) -> None:
+        with self._lock:
+            self._commit_locked()
+            if self.fmt == "tar":
+                # Writes the end-of-archive blocks
+                self._open_tar().close()
+            self._file.close()
+            if self.compressor is not None:
+                self.compressor.shutdown()
+                self._gz_file.close()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            seconds = self._write_ns / 1e9
+            stats = {
+                "pages": self.pages_written,
+                "bytes": self.bytes_written,
+                "commits": self.commits,
+                "seconds": seconds,
+                "mb_per_s": self.bytes_written / 1e6 / seconds if seconds > 0 else 0.0
+            }
+        if self.compressor is not None:
+            stats.update(self.compressor.stats())
+        if self.sections is not None:
+            stats.update(self.sections.stats())
+        return stats
@@ -0,0 +1,127 @@
+"""
+Gzip compression of output pages on a thread pool
+"""
+import gzip
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from ..config import Config
+
+
+class GzipCompressor:
+    """
+    Compresses pages on worker threads so compression overlaps rendering.
+
+    zlib releases the GIL while it compresses, so the pool's threads run in
+    parallel with the batch workers. Output is deterministic (the gzip
+    header carries no timestamp), so unchanged pages keep the same bytes
+    and CDN validators across runs.
+
+    At most ``max_pending`` pages are queued or compressing at a time;
+    submit() blocks beyond that, so producers faster than the pool are
+    held back instead of queueing pages without bound.
+    """
+
+    def __init__(
+        self,
+        level: int = Config.OUTPUT_GZIP_LEVEL,
+        workers: int = Config.OUTPUT_GZIP_WORKERS,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Args:
+            level: Compression level, 1 (fastest) to 9 (smallest)
+            workers: Compression threads
+            max_pending: Pages queued or compressing at once (2 per worker by default)
+        """
+        if not 1 <= level <= 9:
+            raise ValueError("Gzip level must be between 1 and 9")
+
+        workers = max(1, workers)
+        self.level = level
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self._compress_ns = 0
+        self._slots = threading.BoundedSemaphore(max(1, max_pending or 2 * workers))
+        self._in_flight = 0
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gzip")
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress one page in the calling thread"""
+        start = time.perf_counter_ns()
+        compressed = gzip.compress(data, compresslevel=self.level, mtime=0)
+        elapsed = time.perf_counter_ns() - start
+
+        with self._lock:
+            self.raw_bytes += len(data)
+            self.compressed_bytes += len(compressed)
+            self._compress_ns += elapsed
+        return compressed
+
+    def submit(self, data: bytes, callback: Callable[[bytes], None]) -> None:
+        """
+        Compress a page on the pool and pass the result to callback there.
+
+        Blocks while ``max_pending`` pages are in flight. Errors surface
+        from the next wait().
+        """
+        self._slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            self._executor.submit(self._run, data, callback)
+        except BaseException:
+            self._done()
+            raise
+
+    def _run(self, data: bytes, callback: Callable[[bytes], None]) -> None:
+        try:
+            callback(self.compress(data))
+        except BaseException as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+        finally:
+            self._done()
+
+    def _done(self) -> None:
+        """Free the slot of a finished (or unsubmitted) page"""
+        with self._lock:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.notify_all()
+        self._slots.release()
+
+    def wait(self) -> None:
+        """
+        Block until every submitted page has been compressed and handled.
+
+        Raises:
+            Exception: The first error raised by a compression task since
+                the previous wait()
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: not self._in_flight)
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def shutdown(self) -> None:
+        """Finish pending work and stop the pool"""
+        self.wait()
+        self._executor.shutdown()
+
+    def stats(self) -> Dict[str, float]:
+        """Get raw and compressed bytes, compressed/raw ratio and CPU seconds"""
+        with self._lock:
+            return {
+                "gzip_raw_bytes": self.raw_bytes,
+                "gzip_bytes": self.compressed_bytes,
+                "gzip_ratio": self.compressed_bytes / self.raw_bytes if self.raw_bytes else 0.0,
+                "gzip_seconds": self._compress_ns / 1e9
+            }
@@ -0,0 +1,126 @@
+"""
+FileSink: one JSON file per page
+"""
+import os
+import threading
+from typing import Dict, List, Optional
+
+from .base_sink import PAGE_FILES, OutputSink
+from .compression import GzipCompressor
+from .section_store import SectionStore
+from .layout import OutputLayout, ProductIndex, SingleLayout, get_layout
+from .writer import AtomicFileWriter
+from ..config import Config
+
+
+class FileSink(OutputSink):
+    """
+    Writes each page as a JSON file (pretty-printed unless compact) in the
+    product's directory, atomically through an AtomicFileWriter. Committed
+    products are recorded in the product index.
+
+    With a compressor, every page also gets a ``.json.gz`` variant,
+    compressed on the compressor's pool and written from there.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        layout: Optional[OutputLayout] = None,
+        writer: Optional[AtomicFileWriter] = None,
+        index: bool = True,
+        compressor: Optional[GzipCompressor] = None,
+        compact: bool = Config.OUTPUT_COMPACT,
+        sections: Optional[SectionStore] = None
+    ):
+        """
+        Args:
+            root: Output root directory
+            layout: Product directory layout (the configured one by default)
+            writer: Atomic writer (a new one with the configured fsync policy by default)
+            index: Whether to maintain the product index in the root
+            compressor: Also write gzip variants of every page when given
+                (shut down by close())
+            compact: Write compact rather than indented JSON
+            sections: Store shared sections once and reference them from
+                pages; must use this sink's writer, so a section is always
+                staged, and renamed, ahead of the pages referencing it
+        """
+        self.root = root
+        self.compact = compact
+        self.layout = layout or get_layout(Config.OUTPUT_LAYOUT)
+        self.writer = writer or AtomicFileWriter()
+        if sections is not None and sections.writer is not self.writer:
+            raise ValueError("The section store must share the sink's writer")
+        self.sections = sections
+        self.index = ProductIndex(root) if index else None
+        self.compressor = compressor
+        self.pages_written = 0
+        self._products: List[str] = []
+        self._lock = threading.Lock()
+
+    def product_dir(self, product_id: str) -> str:
+        """Get the output directory for a product"""
+        return self.layout.product_dir(self.root, product_id)
+
+    def write_product(self, product_id: str, pages: Dict[str, bytes]) -> None:
+        directory = self.product_dir(product_id)
+        for page_type, data in pages.items():
+            path = os.path.join(directory, PAGE_FILES[page_type])
+            self.writer.write(path, data)
+            if self.compressor is not None:
+                self.compressor.submit(
+                    data, lambda gz_data, path=path: self.writer.write(path + ".gz", gz_data)
+                )
+        with self._lock:
+            self.pages_written += len(pages)
+            self._products.append(product_id)
+        if self.index is not None:
+            self.index.add(product_id, self.layout.relative_dir(product_id))
+
+    def commit(self) -> None:
+        # Entries are added after their pages are staged (and their gzip
+        # variants submitted), so everything taken here is covered by the
+        # writer commit that follows
+        entries = self.index.take() if self.index is not None else []
+        with self._lock:
+            products, self._products = self._products, []
+        if self.compressor is not None:
+            self.compressor.wait()
+        self.writer.commit()
+        if entries:
+            self.index.append(entries)
+        self._notify_commit(products)
+
+    def close(self) -> None:
+        self.commit()
+        if self.compressor is not None:
+            self.compressor.shutdown()
+
+    def stats(self) -> Dict[str, float]:
+        stats = self.writer.stats()
+        stats["pages"] = self.pages_written
+        if self.compressor is not None:
+            stats.update(self.compressor.stats())
+        if self.sections is not None:
+            stats.update(self.sections.stats())
+        return stats
+
+
+def single_product_sink(
+    output_dir: str,
+    writer: Optional[AtomicFileWriter] = None,
+    compressor: Optional[GzipCompressor] = None,
+    compact: bool = Config.OUTPUT_COMPACT,
+    sections: Optional[SectionStore] = None
+) -> FileSink:
+    """Sink writing one product's pages straight into output_dir, without an index"""
+    return FileSink(
+        output_dir,
+        layout=SingleLayout(),
+        writer=writer,
+        index=False,
+        compressor=compressor,
+        compact=compact,
+        sections=sections
+    )
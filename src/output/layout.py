@@ -0,0 +1,204 @@
+"""
+Output directory layouts and the product index
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+from ..config import Config
+
+
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9._-]')
+# Longest id kept as is (file names are limited to 255 bytes)
+_MAX_NAME_LENGTH = 120
+
+
+def safe_product_id(product_id: str) -> str:
+    """
+    Map a product id onto a directory name, injectively.
+
+    Ids made only of letters, digits, ``.``, ``_`` and ``-`` (but not only
+    dots) are used as they are. Any other id, including ``.`` and ``..``,
+    the empty id and overlong ids, has unsafe characters replaced and gets
+    ``~`` plus a hash of the raw id appended. ``~`` never occurs in ids
+    kept as they are, so different ids never share a directory.
+    """
+    if (product_id.strip('.') and len(product_id) <= _MAX_NAME_LENGTH
+            and not _UNSAFE_CHARS.search(product_id)):
+        return product_id
+
+    escaped = _UNSAFE_CHARS.sub('_', product_id[:_MAX_NAME_LENGTH]).replace('.', '_')
+    digest = hashlib.sha1(product_id.encode('utf-8', 'surrogatepass')).hexdigest()[:12]
+    return f"{escaped}~{digest}"
+
+
+class OutputLayout(ABC):
+    """Maps a product id onto its directory, relative to the output root"""
+
+    name = ""
+
+    @abstractmethod
+    def relative_dir(self, product_id: str) -> str:
+        """
+        Get a product's directory relative to the output root.
+
+        Args:
+            product_id: Product identifier
+
+        Returns:
+            Relative path using "/" separators
+        """
+        pass
+
+    def product_dir(self, root: str, product_id: str) -> str:
+        """Get a product's directory under an output root"""
+        return os.path.join(root, *self.relative_dir(product_id).split("/"))
+
+
+class FlatLayout(OutputLayout):
+    """One directory per product directly under the root: ``<id>/``"""
+
+    name = "flat"
+
+    def relative_dir(self, product_id: str) -> str:
+        return safe_product_id(product_id)
+
+
+class SingleLayout(OutputLayout):
+    """Pages go straight into the root (single-product runs)"""
+
+    name = "single"
+
+    def relative_dir(self, product_id: str) -> str:
+        return ""
+
+    def product_dir(self, root: str, product_id: str) -> str:
+        return root
+
+
+class ShardedLayout(OutputLayout):
+    """
+    Hash-prefix directories: ``ab/cd/<id>/``.
+
+    The prefix comes from a hash of the product id, so products spread
+    evenly over 256**levels shard directories and no directory grows past
+    a few entries per shard, whatever the catalog size.
+    """
+
+    name = "sharded"
+
+    def __init__(self, levels: int = Config.OUTPUT_SHARD_LEVELS):
+        """
+        Args:
+            levels: Number of two-hex-digit directory levels
+        """
+        if not 1 <= levels <= 4:
+            raise ValueError("Shard levels must be between 1 and 4")
+        self.levels = levels
+
+    def relative_dir(self, product_id: str) -> str:
+        digest = hashlib.sha1(product_id.encode('utf-8', 'surrogatepass')).hexdigest()
+        shards = [digest[2 * level:2 * level + 2] for level in range(self.levels)]
+        return "/".join(shards + [safe_product_id(product_id)])
+
+
+LAYOUTS = {
+    FlatLayout.name: FlatLayout,
+    ShardedLayout.name: ShardedLayout
+}
+
+
+def get_layout(name: str) -> OutputLayout:
+    """
+    Create a layout by name.
+
+    Args:
+        name: One of LAYOUTS
+
+    Returns:
+        Layout instance with default settings
+    """
+    try:
+        return LAYOUTS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown output layout: {name}") from None
+
+
+class ProductIndex:
+    """
+    Append-only JSON Lines index mapping product ids to output paths.
+
+    Entries are buffered and appended once the product's pages are
+    committed, so the index never points at pages that are not there yet.
+    When a product appears more than once (e.g. a re-run), the last entry
+    wins.
+    """
+
+    def __init__(self, root: str, filename: str = Config.OUTPUT_INDEX_FILE):
+        """
+        Args:
+            root: Output root directory
+            filename: Index file name inside the root
+        """
+        self.path = os.path.join(root, filename)
+        self._pending: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def add(self, product_id: str, relative_dir: str) -> None:
+        """Buffer an entry until the next flush"""
+        with self._lock:
+            self._pending.append((product_id, relative_dir))
+
+    def take(self) -> List[Tuple[str, str]]:
+        """Remove and return the buffered entries"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            return pending
+
+    def append(self, entries: List[Tuple[str, str]]) -> None:
+        """Append entries to the index file"""
+        if not entries:
+            return
+        lines = "".join(
+            json.dumps({"product_id": product_id, "path": path}, ensure_ascii=False) + "\n"
+            for product_id, path in entries
+        )
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+    def flush(self) -> int:
+        """
+        Append buffered entries to the index file.
+
+        Returns:
+            Number of entries written
+        """
+        entries = self.take()
+        self.append(entries)
+        return len(entries)
+
+
+def load_index(root: str, filename: str = Config.OUTPUT_INDEX_FILE) -> Dict[str, str]:
+    """
+    Read a product index.
+
+    Args:
+        root: Output root directory
+        filename: Index file name inside the root
+
+    Returns:
+        Dict of product id to directory relative to the root
+    """
+    index: Dict[str, str] = {}
+    with open(os.path.join(root, filename), 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                index[entry["product_id"]] = entry["path"]
+    return index
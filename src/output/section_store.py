@@ -0,0 +1,250 @@
+"""
+Content-addressed store for page sections shared across products
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .serialization import StaticFragment
+from .writer import AtomicFileWriter
+from ..config import Config
+
+
+REF_KEY = "$ref"
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _blob_path(root: str, digest: str) -> str:
+    return os.path.join(root, Config.SECTION_STORE_DIR, digest[:2], f"{digest}.json")
+
+
+class SectionStore:
+    """
+    Stores page sections once, keyed by the SHA-256 of their compact JSON.
+
+    dedupe() walks a page bottom-up: every object or array whose encoding
+    (with its own children already replaced) reaches ``min_bytes`` and that
+    repeats is written to ``<root>/sections/ab/<sha256>.json`` and replaced
+    in the page by ``{"$ref": "<sha256>"}``. Identical sections across
+    products (usage steps, precautions, ingredient descriptions) are
+    therefore written once, and an unchanged section keeps its file across
+    runs, so incremental syncs only move what changed. SectionResolver
+    rebuilds full pages.
+
+    A section repeats once its digest is seen a second time, or at once
+    when it is a StaticFragment (shared by construction) or its blob is
+    left from an earlier run; a section seen only once stays inline, so
+    products with unique content get no extra files. Only digests are kept
+    per section (32 bytes each), plus a future while a blob is in flight.
+
+    Blobs are written through an AtomicFileWriter; sinks commit the store
+    before their own pages so a reference never points at a missing blob.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        min_bytes: int = Config.SECTION_MIN_BYTES,
+        writer: Optional[AtomicFileWriter] = None
+    ):
+        """
+        Args:
+            root: Output root; blobs go under its sections/ directory
+            min_bytes: Smallest encoded section worth storing separately
+            writer: Atomic writer for blobs (a new one by default)
+        """
+        self.root = root
+        self.min_bytes = min_bytes
+        self.writer = writer or AtomicFileWriter()
+
+        self.sections_stored = 0
+        self.stored_bytes = 0
+        self.referenced_bytes = 0
+        # Digests of sections seen once (inline) and of blobs in place
+        self._seen: Set[bytes] = set()
+        self._stored: Set[bytes] = set()
+        # Digest -> future done once the blob is staged, while it is written
+        self._pending: Dict[bytes, Future] = {}
+        # id(fragment) -> (fragment, interned value, bytes referenced): each
+        # fragment is hashed once per process
+        self._fragments: Dict[int, Tuple[StaticFragment, Any, int]] = {}
+        self._lock = threading.Lock()
+
+    def dedupe(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace a page's large sections with references.
+
+        Args:
+            page: Rendered page (left unmodified)
+
+        Returns:
+            Page whose top-level keys are kept and whose sections are refs
+        """
+        deduped = {}
+        referenced = 0
+        for key, value in page.items():
+            deduped[key], size = self._intern(value)
+            referenced += size
+
+        with self._lock:
+            self.referenced_bytes += referenced
+        return deduped
+
+    def _intern(self, value: Any) -> Tuple[Any, int]:
+        """Get the value with large sections replaced, and the bytes of those sections"""
+        if isinstance(value, StaticFragment):
+            cached = self._fragments.get(id(value))
+            if cached is None:
+                cached = self._fragments[id(value)] = (value,) + self._intern_tree(value, shared=True)
+            return cached[1], cached[2]
+        return self._intern_tree(value)
+
+    def _intern_tree(self, value: Any, shared: bool = False) -> Tuple[Any, int]:
+        referenced = 0
+        if isinstance(value, dict):
+            interned = {}
+            for key, item in value.items():
+                interned[key], size = self._intern(item)
+                referenced += size
+        elif isinstance(value, list):
+            interned = []
+            for item in value:
+                item, size = self._intern(item)
+                interned.append(item)
+                referenced += size
+        else:
+            return value, 0
+
+        encoded = _encode(interned).encode('utf-8')
+        if len(encoded) < self.min_bytes:
+            return interned, referenced
+
+        digest = hashlib.sha256(encoded).digest()
+        if not self._store(digest, encoded, shared):
+            return interned, referenced
+        return {REF_KEY: digest.hex()}, referenced + len(encoded)
+
+    def _store(self, digest: bytes, encoded: bytes, shared: bool) -> bool:
+        """
+        Stage a section's blob if the section repeats.
+
+        The first caller to see it repeat writes the blob; callers arriving
+        meanwhile wait until it is staged, so no page referencing it can be
+        committed ahead of it. A failed write is forgotten (and re-raised to
+        its waiters), so the next caller tries again.
+
+        Returns:
+            True if the section is to be replaced by a reference
+        """
+        with self._lock:
+            if digest in self._stored:
+                return True
+            pending = self._pending.get(digest)
+            owner = pending is None and (shared or digest in self._seen)
+            if owner:
+                pending = self._pending[digest] = Future()
+            elif pending is None:
+                self._seen.add(digest)
+        if pending is not None and not owner:
+            pending.result()
+            return True
+
+        path = _blob_path(self.root, digest.hex())
+        if not owner:
+            # First sighting: inline, unless an earlier run stored the blob
+            if not os.path.exists(path):
+                return False
+            with self._lock:
+                self._seen.discard(digest)
+                self._stored.add(digest)
+            return True
+
+        try:
+            # Blobs from earlier runs are already in place
+            if not os.path.exists(path):
+                self.writer.write(path, encoded)
+                with self._lock:
+                    self.sections_stored += 1
+                    self.stored_bytes += len(encoded)
+        except BaseException as e:
+            with self._lock:
+                del self._pending[digest]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[digest]
+            self._seen.discard(digest)
+            self._stored.add(digest)
+        pending.set_result(None)
+        return True
+
+    def commit(self) -> None:
+        """Publish staged blobs"""
+        self.writer.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Get new sections and bytes stored against bytes referenced by pages"""
+        with self._lock:
+            return {
+                "sections_stored": self.sections_stored,
+                "sections_stored_bytes": self.stored_bytes,
+                "sections_referenced_bytes": self.referenced_bytes
+            }
+
+
+class SectionResolver:
+    """Rebuilds full pages from section references, caching recent blobs"""
+
+    def __init__(self, root: str, cache_size: int = Config.SECTION_CACHE_SIZE):
+        """
+        Args:
+            root: Output root holding the sections/ directory
+            cache_size: Number of decoded blobs kept in memory
+        """
+        self.root = root
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, digest: str) -> Any:
+        """
+        Load one fully resolved section.
+
+        Raises:
+            FileNotFoundError: If the store has no such section
+        """
+        with self._lock:
+            value = self._cache.get(digest)
+            if value is not None:
+                self._cache.move_to_end(digest)
+                return value
+
+        with open(_blob_path(self.root, digest), 'r', encoding='utf-8') as f:
+            value = self.resolve(json.load(f))
+
+        with self._lock:
+            self._cache[digest] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Replace every reference in a page (or section) with its content.
+
+        Resolved sections are shared between calls; copy before mutating.
+        """
+        if isinstance(value, dict):
+            if len(value) == 1 and REF_KEY in value:
+                return self.load(value[REF_KEY])
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
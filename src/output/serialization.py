@@ -0,0 +1,162 @@
+"""
+JSON serialization of pages
+"""
+import json
+from typing import Any, Dict, Optional
+
+from ..config import Config
+
+try:
+    import orjson
+except ImportError:  # Optional: the stdlib encoder is the fallback
+    orjson = None
+
+
+BACKENDS = ("auto", "json", "orjson")
+
+
+class StaticFragment:
+    """
+    A JSON value that never changes between pages, built once.
+
+    Templates build constant subtrees (fixed lists, boilerplate sections)
+    once with static_fragment(), which returns a frozen list or dict
+    (StaticList, StaticDict). Fragments are plain JSON to every encoder,
+    and SectionStore knows them to be shared by every page. Since they are
+    shared, they refuse mutation: copy a section (``list(...)``,
+    ``dict(...)``) to change it.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is a shared static fragment and cannot be modified")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class StaticList(StaticFragment, list):
+    """Frozen JSON array (see StaticFragment)"""
+
+    __slots__ = ()
+
+    append = extend = insert = pop = remove = clear = sort = reverse = StaticFragment._immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = StaticFragment._immutable
+
+    def __reduce__(self):
+        return static_fragment, (list(self),)
+
+
+class StaticDict(StaticFragment, dict):
+    """Frozen JSON object (see StaticFragment)"""
+
+    __slots__ = ()
+
+    pop = popitem = clear = setdefault = update = StaticFragment._immutable
+    __setitem__ = __delitem__ = __ior__ = StaticFragment._immutable
+
+    def __reduce__(self):
+        return static_fragment, (dict(self),)
+
+
+def static_fragment(value: Any) -> Any:
+    """
+    Freeze a JSON value into a shared fragment.
+
+    Args:
+        value: JSON-serializable value; nested lists and dicts are frozen too
+
+    Returns:
+        StaticList or StaticDict for arrays and objects, scalars unchanged
+    """
+    if isinstance(value, StaticFragment):
+        return value
+    if isinstance(value, dict):
+        return StaticDict((key, static_fragment(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return StaticList(static_fragment(item) for item in value)
+    return value
+
+
+class JSONSerializer:
+    """
+    Encodes pages to UTF-8 JSON bytes.
+
+    Modes:
+    - pretty (default): two-space indentation, for human-read files
+    - compact: no whitespace, roughly half the bytes and encode time
+
+    The backend is orjson when installed (``auto``), otherwise the
+    stdlib encoder. Both produce the same JSON.
+    """
+
+    def __init__(self, compact: bool = False, backend: str = Config.JSON_BACKEND):
+        """
+        Args:
+            compact: Omit indentation and whitespace
+            backend: "auto", "json" or "orjson"
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("The orjson backend is not installed")
+
+        if backend == "auto":
+            backend = "json" if orjson is None else "orjson"
+
+        self.compact = compact
+        self.backend = backend
+
+    @property
+    def name(self) -> str:
+        """Mode and backend, e.g. 'compact/json'"""
+        return f"{'compact' if self.compact else 'pretty'}/{self.backend}"
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode a page.
+
+        Args:
+            obj: JSON-serializable value (StaticFragments included)
+
+        Returns:
+            UTF-8 encoded JSON
+        """
+        if self.backend == "orjson":
+            return self._dumps_orjson(obj)
+        return self._dumps_json(obj)
+
+    def _dumps_orjson(self, obj: Any) -> bytes:
+        option = 0 if self.compact else orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    def _dumps_json(self, obj: Any) -> bytes:
+        if not self.compact:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+_serializers: Dict[bool, JSONSerializer] = {}
+
+
+def get_serializer(compact: bool = False, backend: Optional[str] = None) -> JSONSerializer:
+    """
+    Get a shared serializer.
+
+    Args:
+        compact: Compact rather than pretty output
+        backend: JSON backend (the configured one by default)
+
+    Returns:
+        Serializer instance (cached for the configured backend)
+    """
+    if backend is not None and backend != Config.JSON_BACKEND:
+        return JSONSerializer(compact, backend)
+    serializer = _serializers.get(compact)
+    if serializer is None:
+        serializer = _serializers[compact] = JSONSerializer(compact)
+    return serializer
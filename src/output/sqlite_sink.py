@@ -0,0 +1,211 @@
+"""
+SQLiteSink: pages in a SQLite database with full-text FAQ search
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .base_sink import OutputSink
+from ..config import Config
+from ..exceptions import OutputGenerationError
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    product_id TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    page TEXT NOT NULL,
+    PRIMARY KEY (product_id, page_type)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS faq (
+    id INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    category TEXT,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS faq_product ON faq (product_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS faq_fts USING fts5(
+    question, answer, content='faq', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS faq_insert AFTER INSERT ON faq BEGIN
+    INSERT INTO faq_fts (rowid, question, answer) VALUES (new.id, new.question, new.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS faq_delete AFTER DELETE ON faq BEGIN
+    INSERT INTO faq_fts (faq_fts, rowid, question, answer)
+    VALUES ('delete', old.id, old.question, old.answer);
+END;
+"""
+
+SEARCH_SQL = """
+SELECT faq.product_id, faq.category, faq.question, faq.answer, bm25(faq_fts) AS score
+FROM faq_fts JOIN faq ON faq.id = faq_fts.rowid
+WHERE faq_fts MATCH ?
+ORDER BY score
+LIMIT ?
+"""
+
+# fsync policy -> PRAGMA synchronous. In WAL mode NORMAL syncs at
+# checkpoints only: a crash can lose the last transactions but never
+# corrupts the database
+SYNCHRONOUS = {
+    "none": "OFF",
+    "batch": "NORMAL",
+    "file": "FULL"
+}
+
+
+class SQLiteSink(OutputSink):
+    """
+    Stores pages in a SQLite database.
+
+    Tables:
+    - ``pages``: ``(product_id, page_type, page)`` with the compact page JSON
+      (queryable with SQLite's JSON functions)
+    - ``faq``: one row per FAQ question, indexed for full-text search by the
+      ``faq_fts`` FTS5 table (kept in sync by triggers)
+
+    Pages are buffered and inserted with executemany in one transaction per
+    ``commit_every`` pages, in WAL mode so readers (e.g. the support site
+    running search_faq) are never blocked by a running batch. Rewriting a
+    product replaces its pages and FAQ rows, so resuming a batch needs no
+    rollback.
+    """
+
+    compact = True
+
+    def __init__(
+        self,
+        path: str,
+        fsync: str = Config.OUTPUT_FSYNC,
+        commit_every: int = Config.SQLITE_COMMIT_EVERY
+    ):
+        """
+        Args:
+            path: Database file (created, or added to if it exists)
+            fsync: "none", "batch" or "file", mapped to PRAGMA synchronous
+            commit_every: Commit automatically once this many pages are pending
+        """
+        self.path = path
+        self.commit_every = max(1, commit_every)
+
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA synchronous={SYNCHRONOUS[fsync]}")
+            self._conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            raise OutputGenerationError(f"Failed to open SQLite output {path}: {e}") from e
+
+        self.pages_written = 0
+        self.faq_entries = 0
+        self.bytes_written = 0
+        self.commits = 0
+        self._write_ns = 0
+        self._pages: List[Tuple[str, str, str]] = []
+        self._faq: List[Tuple[str, Any, str, str]] = []
+        self._products: List[str] = []
+        self._lock = threading.Lock()
+
+    def write_product(self, product_id: str, pages: Dict[str, bytes]) -> None:
+        rows = [(product_id, page_type, data.decode('utf-8')) for page_type, data in pages.items()]
+        faq_rows = []
+        if 'faq' in pages:
+            for entry in json.loads(pages['faq']).get('questions', []):
+                faq_rows.append((product_id, entry.get('category'), entry['question'], entry['answer']))
+
+        with self._lock:
+            self._pages.extend(rows)
+            self._faq.extend(faq_rows)
+            self._products.append(product_id)
+            self.bytes_written += sum(len(data) for data in pages.values())
+            if len(self._pages) >= self.commit_every:
+                self._commit_locked()
+
+    def commit(self) -> None:
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        pages, self._pages = self._pages, []
+        faq_rows, self._faq = self._faq, []
+        committed, self._products = self._products, []
+        if not pages:
+            return
+
+        start = time.perf_counter_ns()
+        products = [(product_id,) for product_id in dict.fromkeys(row[0] for row in pages)]
+        try:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("DELETE FROM faq WHERE product_id = ?", products)
+            self._conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", pages)
+            self._conn.executemany(
+                "INSERT INTO faq (product_id, category, question, answer) VALUES (?, ?, ?, ?)",
+                faq_rows
+            )
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise OutputGenerationError(f"Failed to commit pages to {self.path}: {e}") from e
+
+        self.pages_written += len(pages)
+        self.faq_entries += len(faq_rows)
+        self.commits += 1
+        self._write_ns += time.perf_counter_ns() - start
+        self._notify_commit(committed)
+
+    def search_faq(self, query: str, limit: int = Config.SQLITE_SEARCH_LIMIT) -> List[Dict[str, Any]]:
+        """Search committed FAQ entries (see search_faq)"""
+        with self._lock:
+            return _search(self._conn, query, limit)
+
+    def close(self) -> None:
+        with self._lock:
+            self._commit_locked()
+            self._conn.close()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            seconds = self._write_ns / 1e9
+            return {
+                "pages": self.pages_written,
+                "faq_entries": self.faq_entries,
+                "bytes": self.bytes_written,
+                "commits": self.commits,
+                "seconds": seconds,
+                "mb_per_s": self.bytes_written / 1e6 / seconds if seconds > 0 else 0.0
+            }
+
+
+def search_faq(path: str, query: str, limit: int = Config.SQLITE_SEARCH_LIMIT) -> List[Dict[str, Any]]:
+    """
+    Full-text search over the FAQ entries of a SQLiteSink database.
+
+    Args:
+        path: Database file
+        query: FTS5 query, e.g. ``vitamin serum`` or ``"patch test" OR allergy``
+        limit: Maximum number of results
+
+    Returns:
+        Best matches first, as dicts with product_id, category, question,
+        answer and score (bm25; lower is better)
+
+    Raises:
+        sqlite3.OperationalError: If the query is not valid FTS5 syntax
+    """
+    conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        return _search(conn, query, limit)
+    finally:
+        conn.close()
+
+
+def _search(conn: sqlite3.Connection, query: str, limit: int) -> List[Dict[str, Any]]:
+    columns = ("product_id", "category", "question", "answer", "score")
+    return [dict(zip(columns, row)) for row in conn.execute(SEARCH_SQL, (query, limit))]
@@ -0,0 +1,70 @@
+"""
+StreamSink: one JSON line per product on a stream, for Unix pipelines
+"""
+import json
+import threading
+import time
+from typing import BinaryIO, Dict
+
+from .base_sink import OutputSink
+
+
+class StreamSink(OutputSink):
+    """
+    Writes each product as one JSONL record to a binary stream (stdout):
+    ``{"product_id": ..., "faq": {...}, "product_page": {...}, "comparison": {...}}``.
+
+    Records are written whole under a lock and flushed one by one, so a
+    downstream reader (jq, a loader) sees every product as soon as it is
+    saved and never a partial line. Records appear in completion order.
+    The stream is flushed but not closed by close().
+    """
+
+    compact = True
+
+    def __init__(self, stream: BinaryIO):
+        """
+        Args:
+            stream: Binary stream records are written to
+        """
+        self.stream = stream
+        self.records_written = 0
+        self.pages_written = 0
+        self.bytes_written = 0
+        self._write_ns = 0
+        self._lock = threading.Lock()
+
+    def write_product(self, product_id: str, pages: Dict[str, bytes]) -> None:
+        parts = [b'{"product_id":', json.dumps(product_id, ensure_ascii=False).encode('utf-8')]
+        for page_type, data in pages.items():
+            parts.append(f',"{page_type}":'.encode('utf-8'))
+            parts.append(data)
+        parts.append(b'}\n')
+        line = b"".join(parts)
+
+        with self._lock:
+            start = time.perf_counter_ns()
+            self.stream.write(line)
+            self.stream.flush()
+            self._write_ns += time.perf_counter_ns() - start
+            self.records_written += 1
+            self.pages_written += len(pages)
+            self.bytes_written += len(line)
+            self._notify_commit([product_id])
+
+    def commit(self) -> None:
+        # Every record is flushed as it is written
+        with self._lock:
+            self.stream.flush()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            seconds = self._write_ns / 1e9
+            return {
+                "records": self.records_written,
+                "pages": self.pages_written,
+                "bytes": self.bytes_written,
+                "commits": self.records_written,
+                "seconds": seconds,
+                "mb_per_s": self.bytes_written / 1e6 / seconds if seconds > 0 else 0.0
+            }
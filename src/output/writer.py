@@ -0,0 +1,179 @@
+"""
+Atomic file writer with grouped fsyncs
+"""
+import itertools
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from ..config import Config
+from ..exceptions import OutputGenerationError
+
+
+class AtomicFileWriter:
+    """
+    Writes files so readers only ever see complete contents.
+
+    Each file is written to a temporary file in its destination directory
+    and renamed over the final path when the writer commits. Renames are
+    deferred and done in groups, so durability costs one flush per group
+    instead of one per file:
+
+    - ``none``: rename only; safe against process crashes, not power loss
+    - ``file``: fsync every file as it is written, and its directory after
+      the rename
+    - ``batch``: at commit, flush the data of each staged file in the
+      group, then do the renames, then one fsync per touched directory
+      (files are flushed together, and directories once per group rather
+      than once per file)
+
+    The writer is thread-safe and can be shared by batch workers.
+    """
+
+    FSYNC_POLICIES = ("none", "file", "batch")
+
+    def __init__(self, fsync: str = Config.OUTPUT_FSYNC, commit_every: int = Config.OUTPUT_COMMIT_EVERY):
+        """
+        Args:
+            fsync: Durability policy, one of FSYNC_POLICIES
+            commit_every: Commit automatically once this many files are pending
+        """
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        self.fsync = fsync
+        self.commit_every = max(1, commit_every)
+
+        self.files_written = 0
+        self.bytes_written = 0
+        self.commits = 0
+        self._write_ns = 0
+        self._pending: List[Tuple[str, str]] = []
+        self._directories: set = set()
+        self._created: set = set()
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def write(self, path: str, data: bytes) -> None:
+        """
+        Stage the contents of a file; it becomes visible on the next commit.
+
+        Args:
+            path: Final file path (its directory is created if needed)
+            data: Complete file contents
+        """
+        start = time.perf_counter_ns()
+        directory, filename = os.path.split(os.path.abspath(path))
+        tmp_path = os.path.join(directory, f".{filename}.{os.getpid()}.{next(self._sequence)}.tmp")
+
+        try:
+            if directory not in self._created:
+                os.makedirs(directory, exist_ok=True)
+                self._created.add(directory)
+            # One unbuffered write of the finished payload, no file object
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                if self.fsync == "file":
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            raise OutputGenerationError(f"Failed to write {path}: {e}") from e
+
+        with self._lock:
+            self._pending.append((tmp_path, path))
+            self._directories.add(directory)
+            self.bytes_written += len(data)
+            self._write_ns += time.perf_counter_ns() - start
+            due = len(self._pending) >= self.commit_every
+
+        if due:
+            self.commit()
+
+    def commit(self) -> int:
+        """
+        Make every staged file visible and, per the fsync policy, durable.
+
+        Returns:
+            Number of files committed
+        """
+        with self._commit_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                directories, self._directories = self._directories, set()
+            if not pending:
+                return 0
+
+            start = time.perf_counter_ns()
+            try:
+                if self.fsync == "batch":
+                    self._sync_files([tmp_path for tmp_path, _ in pending])
+                for tmp_path, path in pending:
+                    os.replace(tmp_path, path)
+                if self.fsync != "none":
+                    for directory in directories:
+                        _fsync_directory(directory)
+            except OSError as e:
+                raise OutputGenerationError(f"Failed to commit output files: {e}") from e
+
+            with self._lock:
+                self.files_written += len(pending)
+                self.commits += 1
+                self._write_ns += time.perf_counter_ns() - start
+            return len(pending)
+
+    def abort(self) -> None:
+        """Discard staged files that have not been committed"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._directories = set()
+        for tmp_path, _ in pending:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        """Commit any remaining staged files"""
+        self.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Get files and bytes written, time spent and throughput"""
+        with self._lock:
+            seconds = self._write_ns / 1e9
+            return {
+                "files": self.files_written,
+                "bytes": self.bytes_written,
+                "commits": self.commits,
+                "seconds": seconds,
+                "mb_per_s": self.bytes_written / 1e6 / seconds if seconds > 0 else 0.0
+            }
+
+    @staticmethod
+    def _sync_files(paths: List[str]) -> None:
+        """Flush the data of a group's staged files (and nothing else on the host)"""
+        # fdatasync skips timestamp-only metadata; the size is still flushed
+        sync = getattr(os, "fdatasync", os.fsync)
+        for path in paths:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                sync(fd)
+            finally:
+                os.close(fd)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist renames in a directory (a no-op where directories can't be opened)"""
+    flags = getattr(os, "O_DIRECTORY", None)
+    if flags is None:
+        return
+    fd = os.open(directory, os.O_RDONLY | flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
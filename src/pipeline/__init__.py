@@ -0,0 +1,20 @@
+"""Pipeline package"""
+from .._lazy import lazy_exports
+
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'BatchRunner': '.batch_runner',
+    'Checkpoint': '.checkpoint',
+    'DeadLetterFile': '.dead_letter',
+    'RenderCache': '.dedupe',
+    'fingerprint': '.dedupe',
+    'AgingPriorityQueue': '.priority',
+    'PriorityResolver': '.priority',
+    'load_priority_file': '.priority',
+    'parse_priority': '.priority'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
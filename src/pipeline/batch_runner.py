@@ -0,0 +1,261 @@
+"""
+BatchRunner: renders many products on a pool of worker threads
+"""
+import math
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..agents.orchestrator_agent import OrchestratorAgent
+from ..agents.retry_policy import RetryBudget, RetryPolicy
+from ..config import Config
+from ..exceptions import PipelineStageError
+from ..instrumentation import get_metrics
+from ..output import FileSink, OutputSink
+from ..utils import get_product_id
+from .checkpoint import Checkpoint
+from .dead_letter import DeadLetterFile
+from .dedupe import RenderCache, fingerprint
+from .priority import AgingPriorityQueue, PriorityResolver
+
+
+_STOP = object()
+
+
+class BatchRunner:
+    """
+    Runs the content generation pipeline over a stream of product records.
+
+    Records are read lazily into a bounded queue and consumed by worker
+    threads, each running the shared orchestrator and saving the product's
+    pages to a shared output sink, which publishes them in groups (by
+    default as files in per-product directories). With a dead-letter file,
+    records that fail to render are written to it and the batch goes on;
+    otherwise the first failing product stops the batch and its error is
+    re-raised from run(). Output errors always stop the batch.
+
+    With dedupe on, records whose content fields match (after the same
+    normalization the Product model applies) are rendered once and the
+    pages are saved under each record's own product id.
+
+    With priorities, the queue hands out the most urgent record first
+    (see AgingPriorityQueue), reading up to ``queue_size`` records ahead,
+    and queue waits are reported per priority class.
+
+    With a checkpoint, the runner commits the sink every
+    ``checkpoint_every`` products and the checkpoint follows every sink
+    commit. A checkpoint loaded before run() resumes the batch: the sink
+    is rolled back to the checkpoint's state and committed records are
+    skipped.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        orchestrator: Optional[OrchestratorAgent] = None,
+        workers: int = Config.BATCH_WORKERS,
+        queue_size: int = Config.BATCH_QUEUE_SIZE,
+        sink: Optional[OutputSink] = None,
+        dedupe: bool = Config.BATCH_DEDUPE,
+        checkpoint: Optional[Checkpoint] = None,
+        checkpoint_every: int = Config.CHECKPOINT_EVERY,
+        dead_letter: Optional[DeadLetterFile] = None,
+        priorities: Optional[PriorityResolver] = None
+    ):
+        """
+        Args:
+            output_dir: Root directory for generated pages (used by the default sink)
+            orchestrator: Orchestrator to run (by default a new one whose
+                agents share one retry budget for the batch)
+            workers: Number of worker threads
+            queue_size: Maximum number of records waiting for a worker
+            sink: Output sink (files under output_dir in the configured layout by default)
+            dedupe: Render records with identical content once
+            checkpoint: Checkpoint to maintain (and resume from, if loaded)
+            checkpoint_every: Products saved between sink commits when
+                checkpointing
+            dead_letter: Where records that fail to render go (None to stop
+                the batch on the first failure)
+            priorities: Priority class of each record (None for input order)
+        """
+        self.output_dir = output_dir
+        self.orchestrator = orchestrator or OrchestratorAgent(retry_policy=RetryPolicy(budget=RetryBudget()))
+        self.sink = sink or FileSink(output_dir)
+        self.workers = max(1, workers)
+        self.priorities = priorities
+        if priorities is None:
+            self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+        else:
+            self.queue = AgingPriorityQueue(self._priority_of, maxsize=max(1, queue_size))
+        self.render_cache = RenderCache() if dedupe else None
+        self.checkpoint = checkpoint
+        self.checkpoint_every = max(1, checkpoint_every)
+        self._since_commit = 0
+        self.dead_letter = dead_letter
+        self.products_failed = 0
+
+        self.products_rendered = 0
+        self._error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+        metrics = get_metrics()
+        self._queue_depth = metrics.gauge("pipeline_queue_depth", "Products waiting for a worker.")
+        self._in_flight = metrics.gauge("pipeline_products_in_flight", "Products being rendered.")
+
+    def run(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Render and save every record.
+
+        Args:
+            records: Raw product data dictionaries (may be a lazy iterator)
+
+        Returns:
+            Dict with product count (rendered and failed), elapsed time,
+            throughput, output write statistics and, when enabled, dedupe,
+            checkpoint, dead-letter, retry budget and per-class queue wait
+            statistics
+
+        Raises:
+            Exception: The first error raised while processing a product
+                (without a dead-letter file) or saving output
+        """
+        start = time.perf_counter()
+        if self.checkpoint is not None:
+            if self.checkpoint.resumed:
+                self.sink.restore(self.checkpoint.sink_state)
+            self.sink.commit_listener = self.checkpoint.record
+
+        threads = [
+            threading.Thread(target=self._worker, name=f"batch-worker-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for ordinal, record in enumerate(records):
+                if self.checkpoint is not None and self.checkpoint.skip(ordinal):
+                    continue
+                if not self._put((ordinal, record)):
+                    break
+        finally:
+            # Workers keep draining the queue until they see the sentinel
+            for _ in threads:
+                self.queue.put(_STOP)
+            for thread in threads:
+                thread.join()
+            self._queue_depth.set(0)
+            # Publish everything finished products wrote
+            self.sink.commit()
+
+        if self._error is not None:
+            raise self._error
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "products": self.products_rendered,
+            "failed": self.products_failed,
+            "elapsed": elapsed,
+            "throughput": self.products_rendered / elapsed if elapsed > 0 else 0.0,
+            "output": self.sink.stats()
+        }
+        if self.render_cache is not None:
+            summary["dedupe"] = self.render_cache.stats()
+        if self.checkpoint is not None:
+            summary["checkpoint"] = self.checkpoint.stats()
+        if self.dead_letter is not None:
+            summary["dead_letter"] = self.dead_letter.stats()
+        if self.priorities is not None:
+            summary["queue_wait"] = self.queue.wait_stats()
+            summary["invalid_priorities"] = self.priorities.invalid
+        if self.orchestrator.retry_policy.budget is not None:
+            summary["retries"] = self.orchestrator.retry_policy.stats()
+        return summary
+
+    def _priority_of(self, item: Any) -> float:
+        """Priority level of a queued (ordinal, record) pair; stop sentinels go last"""
+        return math.inf if item is _STOP else self.priorities.level(item[1])
+
+    def _put(self, item: Tuple[int, Dict[str, Any]]) -> bool:
+        """Enqueue an (ordinal, record) pair, giving up once the batch is stopping"""
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            self._queue_depth.set(self.queue.qsize())
+            return True
+        return False
+
+    def _worker(self) -> None:
+        while True:
+            item = self.queue.get()
+            self._queue_depth.set(self.queue.qsize())
+            if item is _STOP:
+                return
+            if self._stop.is_set():
+                continue
+
+            self._in_flight.inc()
+            try:
+                self._process(*item)
+            except BaseException as e:
+                with self._lock:
+                    if self._error is None:
+                        self._error = e
+                self._stop.set()
+            finally:
+                self._in_flight.dec()
+
+    def _process(self, ordinal: int, record: Dict[str, Any]) -> None:
+        try:
+            results = self._render(record)
+        except Exception as e:
+            if self.dead_letter is None:
+                raise
+            self.dead_letter.write(ordinal, record, e)
+            if self.checkpoint is not None:
+                self.checkpoint.fail(ordinal, _record_id(record))
+            with self._lock:
+                self.products_failed += 1
+            return
+
+        if self.checkpoint is not None:
+            self.checkpoint.start(ordinal, results['metadata']['product_id'])
+        self.orchestrator.save_outputs(results, sink=self.sink)
+
+        with self._lock:
+            self.products_rendered += 1
+            self._since_commit += 1
+            commit_due = self.checkpoint is not None and self._since_commit >= self.checkpoint_every
+            if commit_due:
+                self._since_commit = 0
+        if commit_due:
+            self.sink.commit()
+
+    def _render(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        if self.render_cache is None or not isinstance(record, dict):
+            return self.orchestrator.execute(record)
+
+        try:
+            results, shared = self.render_cache.get_or_render(
+                fingerprint(record), lambda: self.orchestrator.execute(record)
+            )
+        except PipelineStageError as e:
+            product_id = get_product_id(record)
+            if e.product_id == product_id:
+                raise
+            # A duplicate's render failed while this record waited on it
+            raise PipelineStageError(e.stage, product_id, e.cause) from e
+        if shared:
+            # Same pages, saved under this record's id
+            metadata = dict(results['metadata'], product_id=get_product_id(record))
+            results = dict(results, metadata=metadata)
+        return results
+
+
+def _record_id(record: Any) -> str:
+    """Product id of a raw record ('' for records that aren't objects)"""
+    return get_product_id(record) if isinstance(record, dict) else ""
@@ -0,0 +1,143 @@
+"""
+Batch checkpoints: which input records have durable output
+"""
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from ..config import Config
+from ..exceptions import DataValidationError
+from ..output import AtomicFileWriter
+
+
+class Checkpoint:
+    """
+    Tracks which input records have been committed by the output sink.
+
+    Records are identified by their ordinal (position in the input); the
+    product id is kept alongside for reporting only, since ids need not
+    be unique. Workers finish out of order, so the checkpoint holds a
+    watermark, the ordinal below which every record is committed, plus
+    the committed ordinals at or above it. It is updated from the
+    sink's commit listener, after the sink has published the products,
+    and rewritten atomically each time, together with the sink state
+    needed to roll back output committed after it.
+
+    A resumed batch skips records below the watermark and records whose
+    ordinal is in the completed set, so nothing is rendered or written
+    twice, and a record sharing its id with a committed one still runs.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: str, fsync: str = Config.OUTPUT_FSYNC):
+        """
+        Args:
+            path: Checkpoint file
+            fsync: Durability of checkpoint writes ("none" or fsynced)
+        """
+        self.path = path
+        self.writer = AtomicFileWriter(fsync="none" if fsync == "none" else "file")
+
+        self.watermark = 0
+        self.sink_state: Dict[str, Any] = {}
+        self.resumed = False
+        self.skipped = 0
+        # Committed ordinals at or above the watermark -> product id
+        self._done: Dict[int, str] = {}
+        # Product id -> ordinals saved but not yet committed
+        self._in_flight: Dict[str, List[int]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """
+        Load the checkpoint file to resume from it.
+
+        Returns:
+            False if there is no checkpoint (the batch starts from scratch)
+
+        Raises:
+            DataValidationError: If the file is not a checkpoint
+        """
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                raise ValueError(f"unsupported version {data.get('version')!r}")
+            self.watermark = int(data["watermark"])
+            self._done = {int(ordinal): product_id for ordinal, product_id in data["completed"]}
+            self.sink_state = data.get("sink", {})
+        except (ValueError, KeyError, TypeError) as e:
+            raise DataValidationError(f"Invalid checkpoint {self.path}: {e}") from e
+
+        self.resumed = True
+        return True
+
+    def skip(self, ordinal: int) -> bool:
+        """
+        Check whether an input record was committed before the resume.
+
+        Args:
+            ordinal: Position of the record in the input
+
+        Returns:
+            True if the record must not be processed again
+        """
+        with self._lock:
+            done = ordinal < self.watermark or ordinal in self._done
+        if done:
+            self.skipped += 1
+        return done
+
+    def start(self, ordinal: int, product_id: str) -> None:
+        """Register a record about to be saved, so its commit can be matched to it"""
+        with self._lock:
+            self._in_flight[product_id].append(ordinal)
+
+    def fail(self, ordinal: int, product_id: str) -> None:
+        """Mark a record done without output (it was written to the dead-letter file)"""
+        with self._lock:
+            self._done[ordinal] = product_id
+            self._advance()
+
+    def record(self, product_ids: List[str], sink_state: Dict[str, Any]) -> None:
+        """
+        Mark products committed and rewrite the checkpoint (commit listener).
+
+        Args:
+            product_ids: Products published by the commit
+            sink_state: Sink state at the commit
+        """
+        with self._lock:
+            for product_id in product_ids:
+                ordinals = self._in_flight.get(product_id)
+                if not ordinals:
+                    continue
+                self._done[ordinals.pop(0)] = product_id
+                if not ordinals:
+                    del self._in_flight[product_id]
+            self._advance()
+            self.sink_state = sink_state
+            data = {
+                "version": self.VERSION,
+                "watermark": self.watermark,
+                "completed": sorted([ordinal, product_id] for ordinal, product_id in self._done.items()),
+                "sink": sink_state
+            }
+            # Written under the lock so checkpoints land in commit order
+            self.writer.write(self.path, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+            self.writer.commit()
+
+    def _advance(self) -> None:
+        while self.watermark in self._done:
+            del self._done[self.watermark]
+            self.watermark += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Get the watermark and records skipped on resume"""
+        with self._lock:
+            return {"watermark": self.watermark, "skipped": self.skipped}
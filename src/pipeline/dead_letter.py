@@ -0,0 +1,92 @@
+"""
+Dead-letter file: records that failed to render, with their errors
+"""
+import json
+import os
+import threading
+import traceback
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from ..config import Config
+from ..exceptions import PipelineStageError
+
+
+class DeadLetterFile:
+    """
+    Appends one JSON line per failed record:
+    ``{"ordinal", "product_id", "stage", "error_type", "error", "traceback",
+    "failed_at", "record"}``.
+
+    ``stage`` is the pipeline stage that raised (parse, questions, faq,
+    product_page, comparison), and ``record`` the input as received, so
+    fixed records can be extracted with jq and fed back with --stdin.
+    Lines are flushed (and fsynced unless fsync is "none") as they are
+    written, so a failure is on disk before its record counts as done.
+    """
+
+    def __init__(self, path: str, fsync: str = Config.OUTPUT_FSYNC):
+        """
+        Args:
+            path: JSONL file, appended to (created on the first failure)
+            fsync: "none" to skip fsync after each line
+        """
+        self.path = path
+        self.fsync = fsync
+        self.failures = 0
+        self.by_stage: Dict[str, int] = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def write(self, ordinal: int, record: Any, error: BaseException) -> None:
+        """
+        Record a failed input record.
+
+        Args:
+            ordinal: Position of the record in the input
+            record: Raw input record
+            error: Exception raised while rendering it
+        """
+        if isinstance(error, PipelineStageError):
+            stage, product_id, cause = error.stage, error.product_id, error.cause
+        else:
+            stage, product_id, cause = "unknown", None, error
+
+        entry = {
+            "ordinal": ordinal,
+            "product_id": product_id,
+            "stage": stage,
+            "error_type": type(cause).__name__,
+            "error": str(cause),
+            "traceback": "".join(traceback.format_exception(type(cause), cause, cause.__traceback__)),
+            "failed_at": datetime.now(timezone.utc).isoformat(),
+            "record": record
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                # Lone surrogates (valid in JSON input) can only occur in
+                # strings, where "\udXXX" is the JSON escape for them
+                self._file = open(self.path, 'a', encoding='utf-8', errors='backslashreplace')
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync != "none":
+                os.fsync(self._file.fileno())
+            self.failures += 1
+            self.by_stage[stage] = self.by_stage.get(stage, 0) + 1
+
+    def close(self) -> None:
+        """Close the file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of failures, in total and per stage"""
+        with self._lock:
+            return {"failed": self.failures, "by_stage": dict(self.by_stage), "path": self.path}
+
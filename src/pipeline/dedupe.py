@@ -0,0 +1,122 @@
+"""
+Render deduplication: products with identical content are rendered once
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+
+from ..config import Config
+from ..instrumentation import record_cache_lookup
+
+
+# Fields that determine the rendered pages; listing ids and other extra
+# fields don't
+CONTENT_FIELDS = (
+    'product_name', 'concentration', 'skin_type', 'key_ingredients',
+    'benefits', 'how_to_use', 'side_effects', 'price'
+)
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize a field the way the Product model does (strip, drop empty list items)"""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return [item.strip() if isinstance(item, str) else item for item in value
+                if not isinstance(item, str) or item.strip()]
+    return value
+
+
+def fingerprint(record: Dict[str, Any]) -> str:
+    """
+    Get a key shared by records that render to the same pages.
+
+    Args:
+        record: Raw product data dictionary
+
+    Returns:
+        SHA-1 hex digest of the record's normalized content fields
+    """
+    content = {field: _normalize(record.get(field)) for field in CONTENT_FIELDS}
+    encoded = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    Shares render results between records with the same fingerprint.
+
+    The first record of a fingerprint renders; records arriving while it
+    is still rendering wait for the same future instead of rendering
+    again, and later ones reuse the result. Only the most recent
+    ``max_size`` fingerprints are kept, which bounds memory on long
+    streams while catching the duplicates that upstream joins and
+    multi-listing feeds put close together.
+    """
+
+    def __init__(self, max_size: int = Config.BATCH_DEDUPE_CACHE_SIZE):
+        """
+        Args:
+            max_size: Number of fingerprints (and their results) kept
+        """
+        self.max_size = max(1, max_size)
+        self.lookups = 0
+        self.hits = 0
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: str, render: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Get the result for a fingerprint, rendering it if no record has.
+
+        Args:
+            key: Record fingerprint
+            render: Renders the record (called at most once per cached key)
+
+        Returns:
+            (result, shared): shared is True when the result was rendered
+            for another record
+
+        Raises:
+            Exception: The render error, for the rendering record and every
+                record waiting on it
+        """
+        with self._lock:
+            self.lookups += 1
+            future = self._futures.get(key)
+            hit = future is not None
+            if hit:
+                self.hits += 1
+                self._futures.move_to_end(key)
+            else:
+                future = self._futures[key] = Future()
+                if len(self._futures) > self.max_size:
+                    self._futures.popitem(last=False)
+        record_cache_lookup("batch_dedupe", hit)
+
+        if hit:
+            return future.result(), True
+
+        try:
+            result = render()
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                # Let a later record retry instead of replaying the error
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+            raise
+        future.set_result(result)
+        return result, False
+
+    def stats(self) -> Dict[str, float]:
+        """Get records seen, distinct renders and the share of records deduplicated"""
+        with self._lock:
+            return {
+                "records": self.lookups,
+                "distinct": self.lookups - self.hits,
+                "dedupe_ratio": self.hits / self.lookups if self.lookups else 0.0
+            }
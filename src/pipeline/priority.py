@@ -0,0 +1,187 @@
+"""
+Priority scheduling: per-product priority classes and an aging queue
+"""
+import csv
+import heapq
+import math
+import queue
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import Config
+from ..exceptions import DataValidationError
+from ..instrumentation import LatencyHistogram, get_metrics
+from ..utils import get_product_id
+
+
+def parse_priority(value: Any) -> int:
+    """
+    Get the class level of a priority value (0 is the most urgent).
+
+    Args:
+        value: Class name from Config.PRIORITY_CLASSES (any case) or level
+
+    Returns:
+        Level, an index into Config.PRIORITY_CLASSES
+
+    Raises:
+        ValueError: If the value is not a known class or level
+    """
+    classes = Config.PRIORITY_CLASSES
+    if isinstance(value, str):
+        name = value.strip().lower()
+        if name in classes:
+            return classes.index(name)
+        value = name
+    try:
+        level = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Unknown priority {value!r} (expected one of {', '.join(classes)})") from None
+    if not 0 <= level < len(classes):
+        raise ValueError(f"Priority level {level} out of range 0-{len(classes) - 1}")
+    return level
+
+
+def load_priority_file(path: str) -> Dict[str, int]:
+    """
+    Read per-product priorities from a CSV side file with ``product_id``
+    and ``priority`` columns.
+
+    Args:
+        path: CSV file
+
+    Returns:
+        Product id -> class level
+
+    Raises:
+        DataValidationError: If the header or a priority is invalid
+    """
+    priorities = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        if not {"product_id", "priority"} <= set(reader.fieldnames or ()):
+            raise DataValidationError(f"{path}: expected product_id and priority columns")
+        for row in reader:
+            try:
+                priorities[row["product_id"].strip()] = parse_priority(row["priority"])
+            except ValueError as e:
+                raise DataValidationError(f"{path}, line {reader.line_num}: {e}") from e
+    return priorities
+
+
+class PriorityResolver:
+    """
+    Assigns each record a priority class: from the side file if it lists
+    the product, else from the record's priority field, else the default.
+    Invalid values in records fall back to the default class and are counted.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, int]] = None, field: str = Config.PRIORITY_FIELD):
+        """
+        Args:
+            overrides: Product id -> level (see load_priority_file)
+            field: Record field holding the priority
+        """
+        self.overrides = overrides or {}
+        self.field = field
+        self.default = Config.PRIORITY_CLASSES.index(Config.PRIORITY_DEFAULT)
+        self.invalid = 0
+
+    def level(self, record: Any) -> int:
+        """Get the class level of a raw record"""
+        if not isinstance(record, dict):
+            return self.default
+        if self.overrides:
+            level = self.overrides.get(get_product_id(record))
+            if level is not None:
+                return level
+        value = record.get(self.field)
+        if value is None:
+            return self.default
+        try:
+            return parse_priority(value)
+        except ValueError:
+            self.invalid += 1
+            return self.default
+
+
+class AgingPriorityQueue(queue.Queue):
+    """
+    Bounded queue that hands out the most urgent item first, with aging.
+
+    An item's effective level drops by one class for every
+    ``aging_seconds`` it waits, so long-tail work is never starved: it
+    overtakes newly queued urgent work once it has waited long enough.
+    Aging lowers every waiting item at the same rate, so the order is
+    fixed at enqueue time and the heap key is ``level * aging_seconds +
+    enqueued_at``; equal keys come out first in, first out.
+
+    ``priority_of`` maps an item to its level (``math.inf`` puts it after
+    everything else, e.g. a stop sentinel). Queue waits are recorded per
+    class as they are taken.
+    """
+
+    def __init__(
+        self,
+        priority_of: Callable[[Any], float],
+        maxsize: int = Config.PRIORITY_QUEUE_SIZE,
+        aging_seconds: float = Config.PRIORITY_AGING_SECONDS
+    ):
+        """
+        Args:
+            priority_of: Level of an item (0 is the most urgent)
+            maxsize: Maximum number of waiting items
+            aging_seconds: Wait that promotes an item by one class
+        """
+        self.priority_of = priority_of
+        self.aging_seconds = aging_seconds
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self.heap: List[Tuple[float, int, float, int, Any]] = []
+        self._sequence = 0
+        self.waits: Dict[int, LatencyHistogram] = {}
+        self._wait_metric = get_metrics().histogram(
+            "pipeline_queue_wait_seconds", "Time products wait for a worker.", ["priority"]
+        )
+
+    def _qsize(self) -> int:
+        return len(self.heap)
+
+    def _put(self, item: Any) -> None:
+        level = self.priority_of(item)
+        now = time.monotonic()
+        key = math.inf if level == math.inf else level * self.aging_seconds + now
+        self._sequence += 1
+        heapq.heappush(self.heap, (key, self._sequence, now, level, item))
+
+    def _get(self) -> Any:
+        _, _, enqueued_at, level, item = heapq.heappop(self.heap)
+        if level != math.inf:
+            waited = time.monotonic() - enqueued_at
+            histogram = self.waits.get(level)
+            if histogram is None:
+                histogram = self.waits[level] = LatencyHistogram()
+            histogram.record(int(waited * 1e9))
+            self._wait_metric.observe(waited, priority=Config.PRIORITY_CLASSES[level])
+        return item
+
+    def wait_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get queue waits per priority class.
+
+        Returns:
+            Class name -> count and mean/p50/p99/max wait in seconds
+        """
+        with self.mutex:
+            stats = {}
+            for level, histogram in sorted(self.waits.items()):
+                summary = histogram.summary()
+                stats[Config.PRIORITY_CLASSES[level]] = {
+                    "count": summary["count"],
+                    "mean": histogram.mean() / 1e9,
+                    "p50": summary["p50"] / 1e9,
+                    "p99": summary["p99"] / 1e9,
+                    "max": summary["max"] / 1e9
+                }
+            return stats
@@ -1,12 +1,15 @@
 """Templates package"""
-from .base_template import Template
-from .faq_template import FAQTemplate
-from .product_page_template import ProductPageTemplate
-from .comparison_template import ComparisonTemplate
-
-__all__ = [
-    'Template',
-    'FAQTemplate',
-    'ProductPageTemplate',
-    'ComparisonTemplate'
-]
+from .._lazy import lazy_exports
+
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'Template': '.base_template',
+    'FAQTemplate': '.faq_template',
+    'ProductPageTemplate': '.product_page_template',
+    'ComparisonTemplate': '.comparison_template'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
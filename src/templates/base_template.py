@@ -4,6 +4,7 @@ Base template interface
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List
 from ..content_blocks.base_block import ContentBlock
+from ..instrumentation import instrument_subclass
 
 
 class Template(ABC):
@@ -16,6 +17,11 @@ class Template(ABC):
         self.name = name
         self.content_blocks: List[ContentBlock] = []
     
+    def __init_subclass__(cls, **kwargs):
+        """Time and trace every call of a subclass's render()"""
+        super().__init_subclass__(**kwargs)
+        instrument_subclass(cls, "render", category="template")
+    
     @abstractmethod
     def get_schema(self) -> Dict[str, Any]:
         """
@@ -4,6 +4,14 @@ Product Page Template
 from typing import Dict, Any
 from .base_template import Template
 from ..content_blocks import BenefitsBlock, UsageBlock, IngredientsBlock
+from ..output import static_fragment
+
+
+SAFETY_PRECAUTIONS = static_fragment([
+    "Perform a patch test before first use",
+    "Discontinue use if irritation occurs",
+    "Consult a dermatologist if you have concerns"
+])
 
 
 class ProductPageTemplate(Template):
@@ -135,11 +143,7 @@ class ProductPageTemplate(Template):
         return {
             "title": "Safety & Side Effects",
             "side_effects": product.side_effects,
-            "precautions": [
-                "Perform a patch test before first use",
-                "Discontinue use if irritation occurs",
-                "Consult a dermatologist if you have concerns"
-            ],
+            "precautions": SAFETY_PRECAUTIONS,
             "storage": "Store in a cool, dry place away from direct sunlight"
         }
     
@@ -1,46 +1,177 @@
 """
-Logging utilities for the content generation system.
+Logging and other shared utilities for the content generation system.
 """
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import re
 import sys
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .exceptions import DeadlineExceededError
+
+
+class ProductContextFilter(logging.Filter):
+    """Attach the id of the product being processed to each record"""
+    
+    def filter(self, record):
+        from .instrumentation import current_product
+        record.product_id = current_product()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in every N records below WARNING, counted per message template,
+    so repetitive per-product chatter is thinned without hiding any kind of
+    message entirely. Warnings and errors always pass. Counts are shared by
+    every logging thread.
+    """
+    
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, int(round(1.0 / rate))) if rate > 0 else 0
+        self._seen: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.every == 1:
+            return True
+        if self.every == 0:
+            return False
+        
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._seen.get(key, 0)
+            self._seen[key] = count + 1
+        return count % self.every == 0
+
+
+class TextFormatter(logging.Formatter):
+    """Plain ``[agent] message`` lines, with the level for warnings and errors"""
+    
+    def format(self, record):
+        message = record.getMessage()
+        if record.levelno >= logging.WARNING:
+            message = f"{record.levelname}: {message}"
+        line = f"[{getattr(record, 'agent', record.name)}] {message}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line for log shippers"""
+    
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname.lower(),
+            "agent": getattr(record, "agent", record.name),
+            "message": record.getMessage()
+        }
+        if getattr(record, "product_id", None) is not None:
+            entry["product_id"] = record.product_id
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
 
 
 class AgentLogger:
-    """Custom logger for agent activities"""
+    """
+    Custom logger for agent activities.
+    
+    Records are put on an in-memory queue by the calling thread and written
+    by a single background QueueListener, so agents never block on stream
+    I/O. Messages use %-style arguments that are only formatted when the
+    record passes the level check.
+    """
     
     _instances = {}
+    _listener = None
+    _queue_handler = None
+    
+    ROOT = "agents"
     
     def __init__(self, name, log_to_file=False):
         self.name = name
-        self.logger = logging.getLogger(name)
+        self.logger = logging.getLogger(f"{self.ROOT}.{name}")
+        self._extra = {"agent": name}
         
-        if not self.logger.handlers:
-            self.logger.setLevel(logging.INFO)
-            
-            # Console handler
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setLevel(logging.INFO)
-            formatter = logging.Formatter(f'[{name}] %(message)s')
-            console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
+        if AgentLogger._listener is None:
+            AgentLogger.configure(log_to_file=log_to_file)
+    
+    @classmethod
+    def configure(cls, level=None, fmt=None, sample_rate=None, stream=None, log_to_file=None):
+        """
+        (Re)configure agent logging for this run.
+        
+        Args:
+            level: Minimum level name (defaults to Config.LOG_LEVEL)
+            fmt: "text" or "json" (defaults to Config.LOG_FORMAT)
+            sample_rate: Fraction of sub-WARNING records to keep
+                (defaults to Config.LOG_SAMPLE_RATE)
+            stream: Output stream (defaults to stderr)
+            log_to_file: Also write a detailed log under logs/
+                (defaults to Config.LOG_TO_FILE)
+        """
+        from .config import Config
+        
+        level = level or Config.LOG_LEVEL
+        fmt = fmt or Config.LOG_FORMAT
+        sample_rate = Config.LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        log_to_file = Config.LOG_TO_FILE if log_to_file is None else log_to_file
+        
+        cls.shutdown()
+        
+        root = logging.getLogger(cls.ROOT)
+        root.setLevel(level.upper() if Config.ENABLE_LOGGING else logging.CRITICAL + 1)
+        root.propagate = False
+        
+        console_handler = logging.StreamHandler(stream or sys.stderr)
+        console_handler.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+        handlers = [console_handler]
+        
+        # File handler (optional)
+        if log_to_file:
+            log_dir = Path(__file__).parent.parent / "logs"
+            log_dir.mkdir(exist_ok=True)
             
-            # File handler (optional)
-            if log_to_file:
-                log_dir = Path(__file__).parent.parent / "logs"
-                log_dir.mkdir(exist_ok=True)
-                
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                log_file = log_dir / f"{name}_{timestamp}.log"
-                
-                file_handler = logging.FileHandler(log_file)
-                file_handler.setLevel(logging.DEBUG)
-                detailed_formatter = logging.Formatter(
-                    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-                )
-                file_handler.setFormatter(detailed_formatter)
-                self.logger.addHandler(file_handler)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            file_handler = logging.FileHandler(log_dir / f"agents_{timestamp}.log")
+            file_handler.setFormatter(logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            ))
+            handlers.append(file_handler)
+        
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(ProductContextFilter())
+        if sample_rate < 1:
+            queue_handler.addFilter(SamplingFilter(sample_rate))
+        root.addHandler(queue_handler)
+        
+        cls._queue_handler = queue_handler
+        cls._listener = logging.handlers.QueueListener(log_queue, *handlers)
+        cls._listener.start()
+    
+    @classmethod
+    def shutdown(cls):
+        """Flush queued records and stop the background listener"""
+        if cls._listener is not None:
+            cls._listener.stop()
+            for handler in cls._listener.handlers:
+                handler.close()
+            cls._listener = None
+        if cls._queue_handler is not None:
+            logging.getLogger(cls.ROOT).removeHandler(cls._queue_handler)
+            cls._queue_handler = None
     
     @classmethod
     def get_logger(cls, name, log_to_file=False):
@@ -49,18 +180,104 @@ class AgentLogger:
             cls._instances[name] = AgentLogger(name, log_to_file)
         return cls._instances[name]
     
-    def info(self, message):
+    def info(self, message, *args):
         """Log info message"""
-        self.logger.info(message)
+        self.logger.info(message, *args, extra=self._extra)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log error message"""
-        self.logger.error(message)
+        self.logger.error(message, *args, extra=self._extra)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log warning message"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args, extra=self._extra)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log debug message"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args, extra=self._extra)
+
+
+atexit.register(AgentLogger.shutdown)
+
+
+def get_product_id(product_data: Dict[str, Any]) -> str:
+    """
+    Get a stable identifier for a raw product record.
+    
+    Uses the record's ``product_id`` (or ``sku``) field when present and
+    falls back to a slug of the product name.
+    
+    Args:
+        product_data: Raw product data dictionary
+        
+    Returns:
+        str: Product identifier
+    """
+    for key in ('product_id', 'sku'):
+        value = product_data.get(key)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    
+    name = str(product_data.get('product_name', '')).strip().lower()
+    return re.sub(r'[^a-z0-9]+', '-', name).strip('-') or 'product'
+
+
+class Deadline:
+    """
+    A time budget on the monotonic clock.
+    
+    Deadlines are checked cooperatively: the orchestrator checks the
+    per-agent deadline around each stage and binds it to the thread, so
+    every agent, template and content block call checks it before running
+    (see ``check_deadline``). A deadline without a budget never expires.
+    """
+    
+    def __init__(self, seconds: Optional[float] = None, expires_at: Optional[float] = None):
+        """
+        Args:
+            seconds: Budget from now (None or <= 0 for no limit)
+            expires_at: Absolute expiry on time.monotonic() instead
+        """
+        if expires_at is None and seconds is not None and seconds > 0:
+            expires_at = time.monotonic() + seconds
+        self.expires_at = expires_at
+        self.seconds = seconds
+    
+    def remaining(self) -> Optional[float]:
+        """Get the seconds left (never negative), or None without a limit"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        """Check whether the budget is spent"""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+    
+    def child(self, seconds: Optional[float]) -> "Deadline":
+        """
+        Get a deadline for part of the work.
+        
+        Args:
+            seconds: Budget of the part (None or <= 0 for no limit of its own)
+            
+        Returns:
+            A deadline expiring after ``seconds`` or with this one, whichever is first
+        """
+        child = Deadline(seconds)
+        if child.expires_at is None or (self.expires_at is not None and self.expires_at < child.expires_at):
+            return Deadline(self.seconds, expires_at=self.expires_at)
+        return child
+    
+    def check(self, what: str) -> None:
+        """
+        Raise if the budget is spent.
+        
+        Args:
+            what: Work the deadline applies to, for the error message
+            
+        Raises:
+            DeadlineExceededError: If the deadline has expired
+        """
+        if self.expired():
+            budget = f" {self.seconds:g}s" if self.seconds else ""
+            raise DeadlineExceededError(f"{what} exceeded its{budget} deadline")
@@ -0,0 +1,167 @@
+"""
+Tests for catalog ingestion
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.exceptions import DataValidationError
+from src.models import InvalidRecord
+from src.ingestion import CSVProductReader, parse_column_map
+
+
+CSV_HEADER = "SKU,Name,Concentration,Skin Type,Key Ingredients,Benefits,How To Use,Side Effects,Price (INR)\n"
+CSV_ROW = 'SKU-{0},Serum {0},10% Vitamin C,Oily|Dry,"Vitamin C, stabilized|Hyaluronic Acid",Brightening,' \
+          'Apply 2 drops daily,None,699\n'
+
+
+def test_csv_reader(tmp_path):
+    """Test CSV rows are mapped onto product records"""
+    print("Testing CSV reader...")
+    path = tmp_path / "catalog.csv"
+    path.write_text(CSV_HEADER + CSV_ROW.format(1) + "\n" + CSV_ROW.format(2), encoding="utf-8")
+
+    column_map = parse_column_map("Name=product_name, Price (INR)=price")
+    reader = CSVProductReader(str(path), column_map=column_map)
+    records = list(reader)
+
+    assert reader.rows_read == 2
+    assert records[0]["sku"] == "SKU-1"
+    assert records[0]["product_name"] == "Serum 1"
+    assert records[0]["skin_type"] == ["Oily", "Dry"]
+    assert records[0]["key_ingredients"] == ["Vitamin C, stabilized", "Hyaluronic Acid"]
+    assert records[1]["price"] == "699"
+
+    from src.agents import OrchestratorAgent
+    results = OrchestratorAgent().execute(records[1])
+    assert results["metadata"]["product_id"] == "SKU-2"
+
+    print("✓ CSV reader passed")
+
+
+def test_csv_reader_validation(tmp_path):
+    """Test missing columns and empty values are reported with their location"""
+    print("Testing CSV reader validation...")
+    path = tmp_path / "catalog.csv"
+
+    path.write_text(CSV_HEADER + CSV_ROW.format(1), encoding="utf-8")
+    with pytest.raises(DataValidationError, match="product_name, price"):
+        list(CSVProductReader(str(path)))
+
+    # Bad rows become InvalidRecords and the rows after them are still read
+    path.write_text(CSV_HEADER + CSV_ROW.format(1) + "SKU-2,Serum 2,10%,,C,B,Apply daily,None,1\n"
+                    + "SKU-3,Serum 3\n" + CSV_ROW.format(4), encoding="utf-8")
+    column_map = {"Name": "product_name", "Price (INR)": "price"}
+    reader = CSVProductReader(str(path), column_map=column_map)
+    records = list(reader)
+    assert [record["sku"] for record in records] == ["SKU-1", "SKU-2", "SKU-3", "SKU-4"]
+    assert (reader.rows_read, reader.rows_invalid) == (4, 2)
+    assert isinstance(records[1], InvalidRecord) and isinstance(records[2], InvalidRecord)
+    assert "line 3: empty skin_type" in str(records[1].error)
+    assert "line 4: expected 9 columns, got 2" in str(records[2].error)
+
+    from src.agents import DataParserAgent
+    with pytest.raises(DataValidationError, match="line 3: empty skin_type"):
+        DataParserAgent().execute(records[1])
+
+    # In a batch, they go to the dead-letter file
+    import json
+    from src.pipeline import BatchRunner, DeadLetterFile
+    dead_letter = DeadLetterFile(str(tmp_path / "dead_letter.jsonl"), fsync="none")
+    summary = BatchRunner(str(tmp_path / "out"), workers=2, dead_letter=dead_letter).run(
+        CSVProductReader(str(path), column_map=column_map)
+    )
+    dead_letter.close()
+    assert (summary["products"], summary["failed"]) == (2, 2)
+    with open(tmp_path / "dead_letter.jsonl", encoding="utf-8") as f:
+        entries = sorted((json.loads(line) for line in f), key=lambda entry: entry["ordinal"])
+    assert [(entry["product_id"], entry["stage"], entry["error_type"]) for entry in entries] == \
+        [("SKU-2", "parse", "DataValidationError"), ("SKU-3", "parse", "DataValidationError")]
+    assert entries[0]["record"]["product_name"] == "Serum 2"
+
+    with pytest.raises(ValueError):
+        parse_column_map("Name")
+
+    print("✓ CSV reader validation passed")
+
+
+def test_json_lines_reader(tmp_path):
+    """Test that a bad JSON line becomes an InvalidRecord and the stream goes on"""
+    print("Testing JSON Lines reader...")
+    import io
+    import json
+    from src.ingestion import JSONLinesReader
+    from src.pipeline import BatchRunner, DeadLetterFile
+
+    product = {"product_name": "Serum", "concentration": "10% C", "skin_type": ["Oily"],
+               "key_ingredients": ["Vitamin C"], "benefits": ["Brightening"], "how_to_use": "Apply daily",
+               "side_effects": "None", "price": "₹500"}
+    lines = [json.dumps(dict(product, product_id="SKU-1")), '{"product_id": "SKU-2",', "",
+             json.dumps(dict(product, product_id="SKU-3"))]
+    stream = io.StringIO("\n".join(lines) + "\n")
+
+    reader = JSONLinesReader(stream)
+    records = list(reader)
+    assert (reader.items_read, reader.items_invalid) == (3, 1)
+    assert isinstance(records[1], InvalidRecord)
+    assert records[1]["raw_line"] == lines[1]
+    assert "<stdin>, line 2: invalid JSON" in str(records[1].error)
+
+    stream.seek(0)
+    dead_letter = DeadLetterFile(str(tmp_path / "dead_letter.jsonl"), fsync="none")
+    summary = BatchRunner(str(tmp_path / "out"), workers=2, dead_letter=dead_letter).run(JSONLinesReader(stream))
+    dead_letter.close()
+    assert (summary["products"], summary["failed"]) == (2, 1)
+    with open(tmp_path / "dead_letter.jsonl", encoding="utf-8") as f:
+        entry = json.loads(f.read())
+    assert (entry["ordinal"], entry["stage"], entry["record"]) == (1, "parse", {"raw_line": lines[1]})
+
+    print("✓ JSON Lines reader passed")
+
+
+def test_json_array_reader(tmp_path):
+    """Test array elements are decoded incrementally across chunk boundaries"""
+    print("Testing JSON array reader...")
+    import json
+    from src.ingestion import JSONArrayReader, starts_with_array
+
+    products = [
+        {"product_id": f"SKU-{i}", "product_name": "Serum [ä] {x}, \"y\"", "price": 12345 + i, "tags": [1.5, None, True]}
+        for i in range(20)
+    ]
+    path = tmp_path / "catalog.json"
+    path.write_text("\n  " + json.dumps(products, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    assert starts_with_array(str(path))
+
+    for chunk_size in (1, 7, 64, 1 << 16):
+        reader = JSONArrayReader(str(path), chunk_size=chunk_size)
+        assert list(reader) == products
+        assert reader.items_read == 20
+
+    path.write_text("[ ]", encoding="utf-8")
+    assert list(JSONArrayReader(str(path))) == []
+
+    path.write_text('{"product_name": "One"}', encoding="utf-8")
+    assert not starts_with_array(str(path))
+
+    for text, message in (('[{"a": 1} {"b": 2}]', "character 10: Expecting ','"),
+                          ('[{"a": 1}, {"b": ', "Expecting value"),
+                          ('[{"a": 1}] x', "Extra data")):
+        path.write_text(text, encoding="utf-8")
+        records = iter(JSONArrayReader(str(path), chunk_size=4))
+        assert next(records) == {"a": 1}
+        with pytest.raises(DataValidationError, match=message):
+            list(records)
+
+    # A malformed element fails where it is, without reading the rest of
+    # the file (reaching the invalid UTF-8 at the end would raise otherwise)
+    path.write_bytes(b'[{"a": 1 "b": 2}, ' + b'{"x": "padding"}, ' * 50000 + b'\xff]')
+    with pytest.raises(DataValidationError, match="character 9: Expecting ','"):
+        list(JSONArrayReader(str(path), chunk_size=64))
+
+    print("✓ JSON array reader passed")
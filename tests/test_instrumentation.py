@@ -0,0 +1,284 @@
+"""
+Tests for pipeline instrumentation
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+from src.instrumentation import LatencyHistogram, get_registry
+
+
+TEST_DATA = {
+    "product_name": "Test Product",
+    "concentration": "10% Test",
+    "skin_type": ["Oily"],
+    "key_ingredients": ["Vitamin C"],
+    "benefits": ["Brightening"],
+    "how_to_use": "Apply daily in the morning",
+    "side_effects": "None",
+    "price": "₹500"
+}
+
+
+def test_latency_histogram():
+    """Test LatencyHistogram percentiles"""
+    print("Testing LatencyHistogram...")
+    histogram = LatencyHistogram()
+
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+
+    assert histogram.count == 1000
+    assert histogram.max == 1_000_000
+    # Bucket precision is ~3%
+    assert abs(histogram.percentile(50) - 500_000) <= 500_000 * 0.04
+    assert abs(histogram.percentile(99) - 990_000) <= 990_000 * 0.04
+    assert histogram.percentile(100) == histogram.max
+
+    print("✓ LatencyHistogram passed")
+
+
+def test_pipeline_stats_recorded():
+    """Test that agents and content blocks record into the registry"""
+    print("Testing stats registry...")
+    from src.agents import OrchestratorAgent
+
+    registry = get_registry()
+    registry.reset()
+
+    orchestrator = OrchestratorAgent()
+    orchestrator.execute(TEST_DATA)
+
+    assert orchestrator.data_parser.get_stats()['executions'] == 1
+    assert orchestrator.get_stats()['executions'] == 1
+    assert registry.stage_stats("UsageBlock")["count"] == 1
+    assert registry.stage_stats("ComparisonBlock")["p99"] > 0
+
+    print("✓ Stats registry passed")
+
+
+def test_stats_json_dump(tmp_path):
+    """Test JSON export of stage statistics"""
+    print("Testing stats JSON dump...")
+    registry = get_registry()
+    registry.reset()
+    registry.record("Stage", 2_000_000)
+
+    path = tmp_path / "stats.json"
+    registry.dump_json(str(path))
+
+    data = json.loads(path.read_text())
+    assert data["stages"]["Stage"]["count"] == 1
+    assert data["stages"]["Stage"]["max"] == 0.002
+
+    print("✓ Stats JSON dump passed")
+
+
+def test_trace_export(tmp_path):
+    """Test Chrome Trace Event export of pipeline spans"""
+    print("Testing trace export...")
+    from src.agents import OrchestratorAgent
+    from src.instrumentation import get_tracer
+
+    tracer = get_tracer()
+    tracer.enable()
+    try:
+        OrchestratorAgent().execute(dict(TEST_DATA, product_id="SKU-1"))
+    finally:
+        tracer.disable()
+
+    path = tmp_path / "trace.json"
+    tracer.write(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+
+    assert spans["DataParserAgent"]["args"]["product_id"] == "SKU-1"
+    assert spans["ProductPageTemplate"]["cat"] == "template"
+    assert spans["UsageBlock"]["cat"] == "block"
+    # Block spans nest inside their template span
+    template, block = spans["ProductPageTemplate"], spans["UsageBlock"]
+    assert template["ts"] <= block["ts"]
+    assert block["ts"] + block["dur"] <= template["ts"] + template["dur"]
+
+    print("✓ Trace export passed")
+
+
+def test_stage_profiler(tmp_path):
+    """Test per-stage cProfile aggregation"""
+    print("Testing StageProfiler...")
+    from src.agents import OrchestratorAgent
+    from src.instrumentation import StageProfiler, set_profiler
+
+    profiler = StageProfiler("cpu", top_n=5)
+    set_profiler(profiler)
+    try:
+        orchestrator = OrchestratorAgent()
+        for _ in range(2):
+            orchestrator.execute(TEST_DATA)
+    finally:
+        set_profiler(None)
+
+    assert profiler.stage_calls["parse"] == 2
+    written = {path.name for path in profiler.write(str(tmp_path))}
+    assert {"parse.pstats", "comparison.pstats", "cpu_report.txt"} <= written
+
+    print("✓ StageProfiler passed")
+
+
+def test_stage_profiler_concurrent_and_nested(tmp_path):
+    """Test that profiled stages overlap across threads and nest on one thread"""
+    print("Testing StageProfiler concurrency...")
+    import sys
+    import threading
+    from src.instrumentation import StageProfiler
+
+    profiler = StageProfiler("cpu", top_n=5)
+    concurrent = sys.version_info < (3, 12)
+    barrier = threading.Barrier(2, timeout=5)
+    overlapped = []
+
+    def worker():
+        with profiler.profile("render"):
+            with profiler.profile("block"):
+                sum(range(1000))
+            if concurrent:
+                barrier.wait()
+                overlapped.append(True)
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+    if concurrent:
+        assert overlapped == [True, True]
+    assert profiler.stage_calls == {"render": 2, "block": 2}
+    stats = profiler.cpu_stats()
+    assert set(stats) == {"render", "block"}
+    written = {path.name for path in profiler.write(str(tmp_path))}
+    assert {"render.pstats", "block.pstats", "cpu_report.txt"} <= written
+
+    print("✓ StageProfiler concurrency passed")
+
+
+def test_stack_sampler():
+    """Test folded-stack sampling labeled by stage"""
+    print("Testing StackSampler...")
+    import time
+    from src.agents import OrchestratorAgent
+    from src.instrumentation import StackSampler, set_sampler
+
+    orchestrator = OrchestratorAgent()
+    sampler = StackSampler(hz=500)
+    set_sampler(sampler)
+    sampler.start()
+    try:
+        deadline = time.monotonic() + 10
+        while sampler.samples < 20 and time.monotonic() < deadline:
+            orchestrator.execute(TEST_DATA)
+    finally:
+        sampler.stop()
+        set_sampler(None)
+
+    lines = sampler.folded()
+    assert sampler.samples >= 20
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("OrchestratorAgent;" in line for line in lines)
+
+    print("✓ StackSampler passed")
+
+
+def test_agent_logging_levels():
+    """Test level-gated, queued agent logging"""
+    print("Testing agent logging...")
+    import io
+    from src.agents import OrchestratorAgent
+    from src.utils import AgentLogger
+
+    stream = io.StringIO()
+    AgentLogger.configure(level="INFO", stream=stream)
+    try:
+        orchestrator = OrchestratorAgent()
+        orchestrator.execute(TEST_DATA)
+        orchestrator.log("run finished")
+        # Format arguments never turn into the level
+        orchestrator.log("%d products", 3)
+        orchestrator.log("%s skipped", "1", level="debug")
+        orchestrator.warning("%d retried", 2)
+    finally:
+        AgentLogger.shutdown()
+
+    # Per-product progress is DEBUG and must not reach the stream at INFO
+    assert stream.getvalue() == (
+        "[OrchestratorAgent] run finished\n"
+        "[OrchestratorAgent] 3 products\n"
+        "[OrchestratorAgent] WARNING: 2 retried\n"
+    )
+
+    stream = io.StringIO()
+    AgentLogger.configure(level="DEBUG", fmt="json", stream=stream)
+    try:
+        OrchestratorAgent().execute(dict(TEST_DATA, product_id="SKU-9"))
+    finally:
+        AgentLogger.shutdown()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records and all(r["product_id"] == "SKU-9" for r in records)
+
+    print("✓ Agent logging passed")
+
+
+def test_log_sampling_threads():
+    """Test that log sampling counts every record across threads"""
+    print("Testing log sampling...")
+    import logging
+    import threading
+    from src.utils import SamplingFilter
+
+    sampler = SamplingFilter(0.1)
+    passed = []
+
+    def log():
+        record = logging.LogRecord("agent", logging.DEBUG, __file__, 0, "progress %d", (1,), None)
+        passed.append(sum(sampler.filter(record) for _ in range(5000)))
+
+    threads = [threading.Thread(target=log) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(passed) == 4000
+    assert sampler.filter(logging.LogRecord("agent", logging.WARNING, __file__, 0, "x", (), None))
+
+    print("✓ Log sampling passed")
+
+
+def test_openmetrics_exposition():
+    """Test OpenMetrics text rendering"""
+    print("Testing OpenMetrics exposition...")
+    from src.instrumentation import MetricsRegistry
+
+    registry = MetricsRegistry()
+    registry.counter("demo_retries", "Retries.", ["agent"]).inc(agent="A")
+    registry.gauge("demo_queue_depth", "Queue depth.").set(3)
+    histogram = registry.histogram("demo_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    text = registry.exposition()
+    assert 'demo_retries_total{agent="A"} 1' in text
+    assert "demo_queue_depth 3" in text
+    assert 'demo_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'demo_latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "demo_latency_seconds_count 2" in text
+    assert text.endswith("# EOF\n")
+
+    print("✓ OpenMetrics exposition passed")
@@ -0,0 +1,465 @@
+"""
+Tests for output writing
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.output import AtomicFileWriter
+
+
+TEST_DATA = {
+    "product_name": "Test Product",
+    "concentration": "10% Test",
+    "skin_type": ["Oily"],
+    "key_ingredients": ["Vitamin C"],
+    "benefits": ["Brightening"],
+    "how_to_use": "Apply daily in the morning",
+    "side_effects": "None",
+    "price": "₹500"
+}
+
+
+def test_atomic_writer_commit(tmp_path):
+    """Test that staged files only appear on commit"""
+    print("Testing AtomicFileWriter commit...")
+    writer = AtomicFileWriter(fsync="batch", commit_every=100)
+    target = tmp_path / "a" / "page.json"
+
+    writer.write(str(target), b'{"v": 1}')
+    assert not target.exists()
+
+    # A second write of the same path before commit must win
+    writer.write(str(target), b'{"v": 2}')
+    assert writer.commit() == 2
+    assert target.read_bytes() == b'{"v": 2}'
+    assert [p.name for p in target.parent.iterdir()] == ["page.json"]
+
+    stats = writer.stats()
+    assert stats["files"] == 2 and stats["bytes"] == 16 and stats["commits"] == 1
+
+    print("✓ AtomicFileWriter commit passed")
+
+
+def test_atomic_writer_batch_sync(tmp_path, monkeypatch):
+    """Test that a batch commit flushes its own files, never the whole host"""
+    print("Testing AtomicFileWriter batch sync...")
+    import os
+
+    synced = []
+    sync = getattr(os, "fdatasync", os.fsync)
+
+    def record_sync(fd):
+        synced.append(fd)
+        sync(fd)
+
+    def host_sync():
+        raise AssertionError("os.sync() flushes every filesystem on the host")
+
+    monkeypatch.setattr(os, "fdatasync" if hasattr(os, "fdatasync") else "fsync", record_sync)
+    monkeypatch.setattr(os, "sync", host_sync, raising=False)
+
+    writer = AtomicFileWriter(fsync="batch", commit_every=100)
+    for i in range(3):
+        writer.write(str(tmp_path / f"{i}.json"), b"{}")
+    assert writer.commit() == 3
+    assert len(synced) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0.json", "1.json", "2.json"]
+
+    print("✓ AtomicFileWriter batch sync passed")
+
+
+def test_atomic_writer_groups(tmp_path):
+    """Test automatic group commits and abort"""
+    print("Testing AtomicFileWriter grouping...")
+    writer = AtomicFileWriter(fsync="none", commit_every=3)
+
+    for i in range(7):
+        writer.write(str(tmp_path / f"{i}.json"), b"{}")
+    assert writer.commits == 2
+    assert len(list(tmp_path.glob("*.json"))) == 6
+
+    writer.abort()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{i}.json" for i in range(6)]
+
+    print("✓ AtomicFileWriter grouping passed")
+
+
+def test_sharded_layout_and_index(tmp_path):
+    """Test hash-sharded product directories and the product index"""
+    print("Testing sharded layout...")
+    import os
+    from src.output import FileSink, ShardedLayout, get_layout, load_index
+    from src.pipeline import BatchRunner
+
+    layout = ShardedLayout()
+    relative = layout.relative_dir("SKU/1")
+    shard_a, shard_b, leaf = relative.split("/")
+    assert len(shard_a) == len(shard_b) == 2 and leaf.startswith("SKU_1~")
+    assert layout.relative_dir("SKU/1") == relative
+
+    # Ids that would escape the root or share a directory are escaped apart
+    flat = get_layout("flat")
+    assert flat.relative_dir("SKU-1.v2") == "SKU-1.v2"
+    names = [flat.relative_dir(product_id) for product_id in ("SKU/1", "SKU_1", "SKU:1", "..", ".", "", "x" * 300)]
+    assert len(set(names)) == len(names)
+    for name in names:
+        assert "/" not in name and name.strip(".") and len(name) < 255
+    product_dir = flat.product_dir(str(tmp_path / "out"), "..")
+    assert os.path.dirname(os.path.realpath(product_dir)) == os.path.realpath(tmp_path / "out")
+    # A lone surrogate (valid in JSON input) still maps to a directory
+    assert layout.relative_dir("\ud800").split("/")[-1] == flat.relative_dir("\ud800")
+
+    runner = BatchRunner(str(tmp_path), workers=2, sink=FileSink(str(tmp_path), layout=layout))
+    runner.run(dict(TEST_DATA, product_id=f"SKU-{i}") for i in range(5))
+
+    index = load_index(str(tmp_path))
+    assert sorted(index) == [f"SKU-{i}" for i in range(5)]
+    assert (tmp_path / index["SKU-3"] / "faq.json").exists()
+
+    print("✓ Sharded layout passed")
+
+
+def test_bundle_sink(tmp_path):
+    """Test JSONL and tar bundles with their offset index"""
+    print("Testing BundleSink...")
+    import json
+    import tarfile
+    from src.output import BundleSink
+    from src.pipeline import BatchRunner
+
+    for fmt in BundleSink.FORMATS:
+        path = tmp_path / f"pages.{fmt}"
+        sink = BundleSink(str(path), fmt=fmt, commit_every=4)
+        BatchRunner(str(tmp_path), workers=2, sink=sink).run(
+            dict(TEST_DATA, product_id=f"SKU-{i}") for i in range(5)
+        )
+        sink.close()
+
+        data = path.read_bytes()
+        index_lines = (tmp_path / f"pages.{fmt}.index.jsonl").read_text(encoding="utf-8").splitlines()
+        entries = [json.loads(line) for line in index_lines]
+        assert len(entries) == 15 and sink.stats()["pages"] == 15
+
+        for entry in entries:
+            page = json.loads(data[entry["offset"]:entry["offset"] + entry["length"]])
+            assert page, entry
+
+        if fmt == "jsonl":
+            records = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+            assert {r["page_type"] for r in records} == {"faq", "product_page", "comparison"}
+        else:
+            with tarfile.open(path) as tar:
+                assert "SKU-3/faq.json" in tar.getnames()
+
+    print("✓ BundleSink passed")
+
+
+def test_bundle_reader(tmp_path):
+    """Test random-access reads from a bundle"""
+    print("Testing BundleReader...")
+    from src.output import BundleReader, BundleSink
+
+    path = str(tmp_path / "pages.jsonl")
+    sink = BundleSink(path)
+    sink.write_product("B", {"faq": b'{"q":1}', "product_page": b'{"p":1}'})
+    sink.write_product("A", {"faq": b'{"q":0}'})
+    sink.write_product("B", {"faq": b'{"q":2}'})
+    sink.close()
+
+    with BundleReader(path) as reader:
+        assert len(reader) == 3
+        assert reader.product_ids() == ["A", "B"]
+        view = reader.get_view("A", "faq")
+        assert bytes(view) == b'{"q":0}'
+        view.release()
+        # The later write of B's FAQ wins
+        assert reader.pages("B") == {"faq": {"q": 2}, "product_page": {"p": 1}}
+        assert ("B", "comparison") not in reader
+        try:
+            reader.get("C", "faq")
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("Expected KeyError for a missing page")
+
+    print("✓ BundleReader passed")
+
+
+def test_gzip_variants(tmp_path):
+    """Test pre-compressed page variants for files and bundles"""
+    print("Testing gzip variants...")
+    import gzip
+    from src.output import BundleReader, BundleSink, FileSink, GzipCompressor
+
+    sink = FileSink(str(tmp_path / "files"), compressor=GzipCompressor(level=1))
+    sink.write_product("SKU-1", {"faq": b'{"q":1}'})
+    sink.close()
+    page = tmp_path / "files" / "SKU-1" / "faq.json"
+    assert gzip.decompress((tmp_path / "files" / "SKU-1" / "faq.json.gz").read_bytes()) == page.read_bytes()
+    assert sink.stats()["gzip_raw_bytes"] == 7
+
+    path = str(tmp_path / "pages.jsonl")
+    sink = BundleSink(path, compressor=GzipCompressor())
+    sink.write_product("A", {"faq": b'{"q":0}', "product_page": b'{"p":0}'})
+    sink.close()
+
+    with BundleReader(path) as reader:
+        view = reader.get_gzip_view("A", "product_page")
+        assert gzip.decompress(view) == b'{"p":0}'
+        view.release()
+
+    print("✓ Gzip variants passed")
+
+
+def test_gzip_backpressure():
+    """Test that submit() blocks once max_pending pages are in flight"""
+    print("Testing gzip backpressure...")
+    import gzip
+    import threading
+    import pytest
+    from src.output import GzipCompressor
+
+    compressor = GzipCompressor(workers=1, max_pending=2)
+    release = threading.Event()
+    results = []
+
+    def handle(gz_data):
+        release.wait(5)
+        results.append(gzip.decompress(gz_data))
+
+    for page in (b"1", b"2"):
+        compressor.submit(page, handle)
+    third = threading.Thread(target=compressor.submit, args=(b"3", handle))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()
+    release.set()
+    third.join(5)
+    compressor.wait()
+    assert sorted(results) == [b"1", b"2", b"3"]
+
+    # Errors surface from the next wait(), once
+    compressor.submit(b"4", lambda gz_data: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        compressor.wait()
+    compressor.wait()
+    compressor.shutdown()
+
+    print("✓ Gzip backpressure passed")
+
+
+def test_json_serializer():
+    """Test serializer modes, backends and static fragments"""
+    print("Testing JSONSerializer...")
+    import json
+    from src.output import JSONSerializer, static_fragment
+    from src.output.serialization import orjson
+
+    fragment = static_fragment(["Patch test first", {"avoid": ["eyes"]}])
+    page = {"title": "Café", "steps": fragment, "nested": [{"more": fragment}], "n": 2}
+    expected = {"title": "Café", "steps": list(fragment), "nested": [{"more": list(fragment)}], "n": 2}
+
+    backends = ["json"] + (["orjson"] if orjson is not None else [])
+    for backend in backends:
+        compact = JSONSerializer(compact=True, backend=backend).dumps(page)
+        pretty = JSONSerializer(compact=False, backend=backend).dumps(page)
+        assert json.loads(compact) == json.loads(pretty) == expected
+        assert compact == json.dumps(expected, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+        assert pretty == json.dumps(expected, ensure_ascii=False, indent=2).encode("utf-8")
+
+    print("✓ JSONSerializer passed")
+
+
+def test_template_static_fragments():
+    """Test that constant page sections are shared, frozen fragments"""
+    print("Testing template static fragments...")
+    import json
+    import pytest
+    from src.agents import OrchestratorAgent
+    from src.output import JSONSerializer, StaticFragment
+
+    first = OrchestratorAgent().execute(dict(TEST_DATA, product_id="A"))["product_page"]
+    second = OrchestratorAgent().execute(dict(TEST_DATA, product_id="B"))["product_page"]
+
+    steps = first["usage_section"]["steps"]
+    assert isinstance(steps, StaticFragment)
+    assert steps is second["usage_section"]["steps"]
+    assert steps[0]["action"] == "Cleanse" and len(steps) == 4
+
+    # Pages are plain JSON to any encoder, and the shared sections can't be changed
+    results = OrchestratorAgent().execute(dict(TEST_DATA, product_id="C"))
+    for page_type in ("faq", "product_page", "comparison"):
+        assert json.loads(json.dumps(results[page_type], ensure_ascii=False)) == \
+            json.loads(JSONSerializer(compact=True, backend="json").dumps(results[page_type]))
+    for mutate in (lambda: steps.append({}), lambda: steps[0].update(action="Rinse"),
+                   lambda: first["safety_section"]["precautions"].clear()):
+        with pytest.raises(TypeError):
+            mutate()
+    copied = list(steps)
+    copied.append({"step": 5})
+    assert len(steps) == 4
+
+    page = json.loads(JSONSerializer(compact=True, backend="json").dumps(first))
+    assert page["safety_section"]["precautions"][0] == "Perform a patch test before first use"
+    assert page["ingredients_section"]["ingredients"][0]["scientific_name"] == "Ascorbic Acid"
+
+    print("✓ Template static fragments passed")
+
+
+def test_section_store(tmp_path):
+    """Test shared sections are stored once and resolved back into pages"""
+    print("Testing section store...")
+    import json
+    import pytest
+    from src.agents import OrchestratorAgent
+    from src.output import AtomicFileWriter, FileSink, JSONSerializer, SectionResolver, SectionStore
+
+    root = str(tmp_path / "out")
+    writer = AtomicFileWriter(fsync="none")
+    sink = FileSink(root, writer=writer, compact=True, sections=SectionStore(root, writer=writer))
+    serializer = JSONSerializer(compact=True, backend="json")
+
+    plain = {}
+    for product_id in ("A", "B"):
+        page = OrchestratorAgent().execute(dict(TEST_DATA, product_id=product_id))["product_page"]
+        plain[product_id] = json.loads(serializer.dumps(page))
+        sink.write_product(product_id, {"product_page": serializer.dumps(sink.prepare_page(page))})
+    sink.close()
+
+    stats = sink.stats()
+    assert stats["sections_stored"] > 0
+    assert stats["sections_referenced_bytes"] > stats["sections_stored_bytes"]
+    assert len(list((tmp_path / "out" / "sections").glob("*/*.json"))) == stats["sections_stored"]
+
+    # Sections unique to one product stay inline
+    unique = {"notes": ["unique to this product " * 20]}
+    assert SectionStore(root).dedupe(unique) == unique
+
+    resolver = SectionResolver(root)
+    for product_id, expected in plain.items():
+        stored = json.loads((tmp_path / "out" / product_id / "product_page.json").read_text())
+        assert "$ref" in json.dumps(stored)
+        assert resolver.resolve(stored) == expected
+
+    with pytest.raises(ValueError):
+        FileSink(root, sections=SectionStore(root))
+
+    print("✓ Section store passed")
+
+
+def test_section_store_concurrent_writes(tmp_path):
+    """Test that a shared section is staged before any page can reference it"""
+    print("Testing section store concurrency...")
+    import threading
+    import pytest
+    from src.exceptions import OutputGenerationError
+    from src.output import AtomicFileWriter, SectionStore
+
+    class SlowWriter(AtomicFileWriter):
+        """Fails its first write, and holds the second until released"""
+
+        def __init__(self):
+            super().__init__(fsync="none")
+            self.calls = 0
+            self.writing = threading.Event()
+            self.release = threading.Event()
+
+        def write(self, path, data):
+            self.calls += 1
+            if self.calls == 1:
+                raise OutputGenerationError("disk full")
+            self.writing.set()
+            self.release.wait(5)
+            super().write(path, data)
+
+    writer = SlowWriter()
+    store = SectionStore(str(tmp_path), min_bytes=1, writer=writer)
+    # A section seen once stays inline; it is stored when it repeats
+    assert store.dedupe({"section": ["shared"]}) == {"section": ["shared"]}
+    assert writer.calls == 0
+    with pytest.raises(OutputGenerationError):
+        store.dedupe({"section": ["shared"]})
+
+    # The failed digest was forgotten: the next page writes the blob again,
+    # and a page rendered meanwhile waits for it to be staged
+    first = threading.Thread(target=store.dedupe, args=({"section": ["shared"]},))
+    first.start()
+    assert writer.writing.wait(5)
+    second_done = threading.Event()
+    second = threading.Thread(target=lambda: (store.dedupe({"section": ["shared"]}), second_done.set()))
+    second.start()
+    assert not second_done.wait(0.1)
+    writer.release.set()
+    first.join()
+    second.join()
+    assert second_done.is_set() and writer.calls == 2
+    assert store.stats()["sections_stored"] == 1
+    # Only the digest is kept once the blob is staged
+    assert not store._pending and len(store._stored) == 1 and not store._seen
+
+    print("✓ Section store concurrency passed")
+
+
+def test_sqlite_sink(tmp_path):
+    """Test pages and FAQ search in the SQLite sink"""
+    print("Testing SQLite sink...")
+    import json
+    import sqlite3
+    from src.agents import OrchestratorAgent
+    from src.output import JSONSerializer, SQLiteSink, search_faq
+
+    path = str(tmp_path / "pages.db")
+    sink = SQLiteSink(path, fsync="none", commit_every=4)
+    serializer = JSONSerializer(compact=True, backend="json")
+    for product_id in ("A", "B"):
+        results = OrchestratorAgent().execute(dict(TEST_DATA, product_id=product_id))
+        sink.write_product(product_id, {
+            page_type: serializer.dumps(results[page_type])
+            for page_type in ("faq", "product_page", "comparison")
+        })
+    # Rewriting a product replaces its rows
+    sink.write_product("B", {"faq": b'{"questions":[{"category":"Usage","question":"Q?","answer":"Rinse well"}]}'})
+    sink.close()
+
+    stats = sink.stats()
+    assert stats["pages"] == 7 and stats["commits"] == 2
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    row = conn.execute("SELECT page FROM pages WHERE product_id = 'A' AND page_type = 'product_page'").fetchone()
+    assert json.loads(row[0])["product_name"] == TEST_DATA["product_name"]
+    assert conn.execute("SELECT COUNT(*) FROM faq WHERE product_id = 'B'").fetchone()[0] == 1
+    conn.close()
+
+    hits = search_faq(path, "rinse")
+    assert [hit["product_id"] for hit in hits] == ["B"]
+    question = json.loads(serializer.dumps(OrchestratorAgent().execute(TEST_DATA)["faq"]))["questions"][0]["question"]
+    word = max(question.strip("?").split(), key=len)
+    assert any(hit["product_id"] == "A" for hit in search_faq(path, word))
+
+    print("✓ SQLite sink passed")
+
+
+def test_stream_sink():
+    """Test one flushed JSON line per product"""
+    print("Testing stream sink...")
+    import io
+    import json
+    from src.output import StreamSink
+
+    stream = io.BytesIO()
+    sink = StreamSink(stream)
+    sink.write_product("SKU-\"1\"", {"faq": b'{"q":1}', "product_page": b'{"p":[1,2]}'})
+    sink.write_product("SKU-2", {"faq": b'{"q":2}'})
+    sink.close()
+
+    lines = stream.getvalue().decode("utf-8").splitlines()
+    assert json.loads(lines[0]) == {"product_id": "SKU-\"1\"", "faq": {"q": 1}, "product_page": {"p": [1, 2]}}
+    assert json.loads(lines[1])["faq"] == {"q": 2}
+    assert sink.stats()["records"] == 2 and sink.stats()["pages"] == 3
+
+    print("✓ Stream sink passed")
@@ -0,0 +1,318 @@
+"""
+Tests for batch pipeline execution
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+from src.pipeline import BatchRunner
+
+
+TEST_DATA = {
+    "product_name": "Test Product",
+    "concentration": "10% Test",
+    "skin_type": ["Oily"],
+    "key_ingredients": ["Vitamin C"],
+    "benefits": ["Brightening"],
+    "how_to_use": "Apply daily in the morning",
+    "side_effects": "None",
+    "price": "₹500"
+}
+
+
+def make_records(count):
+    """Build distinct product records"""
+    return [dict(TEST_DATA, product_id=f"SKU-{i}", price=f"₹{500 + i}") for i in range(count)]
+
+
+def test_batch_runner(tmp_path):
+    """Test rendering a batch on worker threads"""
+    print("Testing BatchRunner...")
+    from src.instrumentation import get_metrics
+
+    rendered = get_metrics().counter("pipeline_products_rendered", "Products rendered.")
+    before = rendered.get()
+
+    runner = BatchRunner(str(tmp_path), workers=3, queue_size=2)
+    summary = runner.run(iter(make_records(10)))
+
+    assert summary["products"] == 10
+    assert rendered.get() - before == 10
+    faq = json.loads((tmp_path / "SKU-7" / "faq.json").read_text(encoding="utf-8"))
+    assert faq["product_name"] == "Test Product"
+
+    print("✓ BatchRunner passed")
+
+
+def test_batch_runner_stops_on_error(tmp_path):
+    """Test that a failing product stops the batch"""
+    print("Testing BatchRunner error handling...")
+    records = make_records(5)
+    records[2] = dict(records[2], skin_type="not-a-list")
+
+    runner = BatchRunner(str(tmp_path), workers=2)
+    try:
+        runner.run(records)
+    except Exception:
+        pass
+    else:
+        raise AssertionError("Expected the batch to fail")
+
+    print("✓ BatchRunner error handling passed")
+
+
+def test_batch_runner_dedupe(tmp_path):
+    """Test that records with the same content are rendered once"""
+    print("Testing BatchRunner dedupe...")
+    from src.instrumentation import get_metrics
+    from src.pipeline import fingerprint
+
+    records = make_records(3)
+    # Same content under other listing ids, modulo whitespace
+    records += [dict(records[0], product_id="LISTING-A"),
+                dict(records[1], product_id="LISTING-B", product_name=" Test Product ", skin_type=["Oily", " "])]
+    assert fingerprint(records[1]) == fingerprint(records[4])
+
+    rendered = get_metrics().counter("pipeline_products_rendered", "Products rendered.")
+    before = rendered.get()
+
+    runner = BatchRunner(str(tmp_path), workers=2)
+    summary = runner.run(records)
+
+    assert summary["products"] == 5
+    assert rendered.get() - before == 3
+    assert summary["dedupe"] == {"records": 5, "distinct": 3, "dedupe_ratio": 0.4}
+    page = json.loads((tmp_path / "LISTING-B" / "product_page.json").read_text(encoding="utf-8"))
+    assert page == json.loads((tmp_path / "SKU-1" / "product_page.json").read_text(encoding="utf-8"))
+
+    summary = BatchRunner(str(tmp_path), workers=2, dedupe=False).run(records)
+    assert "dedupe" not in summary and rendered.get() - before == 8
+
+    print("✓ BatchRunner dedupe passed")
+
+
+def test_batch_runner_resume(tmp_path):
+    """Test that a resumed batch skips committed products and drops the uncommitted tail"""
+    print("Testing BatchRunner checkpoint and resume...")
+    from src.output import BundleReader, BundleSink
+    from src.pipeline import Checkpoint
+
+    bundle = str(tmp_path / "pages.jsonl")
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    records = make_records(12)
+    broken = list(records)
+    broken[7] = dict(records[7], skin_type="not-a-list")
+
+    sink = BundleSink(bundle, fsync="none", commit_every=3)
+    runner = BatchRunner(str(tmp_path), workers=2, sink=sink, checkpoint=Checkpoint(checkpoint_file), checkpoint_every=2)
+    try:
+        runner.run(broken)
+    except Exception:
+        pass
+    else:
+        raise AssertionError("Expected the batch to fail")
+    # Pages appended after the last commit, as if the process had died
+    sink._file.write(b'{"product_id": "SKU-0", "page_type": "faq", "page": {}}\n')
+    sink.close()
+
+    with open(checkpoint_file, encoding="utf-8") as f:
+        state = json.load(f)
+    assert 0 < state["watermark"] <= 7
+
+    checkpoint = Checkpoint(checkpoint_file)
+    assert checkpoint.load()
+    summary = BatchRunner(
+        str(tmp_path), workers=2, sink=BundleSink(bundle, fsync="none", commit_every=3), checkpoint=checkpoint
+    ).run(records)
+
+    assert summary["checkpoint"] == {"watermark": 12, "skipped": 12 - summary["products"]}
+    with BundleReader(bundle) as reader:
+        assert sorted(reader.product_ids()) == sorted(record["product_id"] for record in records)
+        assert reader.skipped == 0
+    # Every page exactly once
+    for path in (bundle, bundle + ".index.jsonl"):
+        with open(path, "rb") as f:
+            assert sum(1 for _ in f) == 36
+
+    # Done-ness is by position: a record sharing its id with a committed one still runs
+    with open(checkpoint_file, "w", encoding="utf-8") as f:
+        json.dump({"version": 2, "watermark": 0, "completed": [[1, "SKU-1"]], "sink": {}}, f)
+    duplicates = [records[0], records[1], dict(records[2], product_id="SKU-1")]
+    checkpoint = Checkpoint(checkpoint_file)
+    assert checkpoint.load()
+    summary = BatchRunner(str(tmp_path / "dupes"), workers=2, checkpoint=checkpoint).run(duplicates)
+    assert summary["products"] == 2
+    assert summary["checkpoint"] == {"watermark": 3, "skipped": 1}
+    page = json.loads((tmp_path / "dupes" / "SKU-1" / "product_page.json").read_text(encoding="utf-8"))
+    assert page["pricing_section"]["price"] == records[2]["price"]
+
+    print("✓ BatchRunner checkpoint and resume passed")
+
+
+KILLED_TAR_RUN = """
+import json, os, signal, sys, tarfile, time
+sys.path.insert(0, sys.argv[1])
+from src.output import BundleSink
+from src.pipeline import BatchRunner, Checkpoint
+
+out, records = sys.argv[2], json.loads(sys.argv[3])
+checkpoint_file = os.path.join(out, "checkpoint.json")
+sink = BundleSink(os.path.join(out, "pages.tar"), fmt="tar", fsync="none", commit_every=3)
+
+def feed():
+    for record in records[:8]:
+        yield record
+    while not os.path.exists(checkpoint_file):
+        time.sleep(0.01)
+    with sink._lock:
+        # Die halfway through a member header
+        sink._file.write(tarfile.TarInfo("torn/faq.json").tobuf(tarfile.PAX_FORMAT)[:200])
+        sink._file.flush()
+        os.kill(os.getpid(), signal.SIGKILL)
+    yield from records[8:]
+
+BatchRunner(out, workers=2, sink=sink, checkpoint=Checkpoint(checkpoint_file), checkpoint_every=2).run(feed())
+"""
+
+
+def test_batch_runner_resume_killed_tar(tmp_path):
+    """Test resuming a tar bundle after the process was killed mid-write"""
+    print("Testing tar bundle resume after kill...")
+    import signal
+    import subprocess
+    import tarfile
+    from src.output import BundleReader, BundleSink
+    from src.pipeline import Checkpoint
+
+    records = make_records(12)
+    result = subprocess.run(
+        [sys.executable, "-c", KILLED_TAR_RUN, str(project_root), str(tmp_path), json.dumps(records)],
+        capture_output=True, timeout=60
+    )
+    assert result.returncode == -signal.SIGKILL, result.stderr.decode()
+
+    bundle = str(tmp_path / "pages.tar")
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+    assert checkpoint.load()
+    summary = BatchRunner(
+        str(tmp_path), workers=2, sink=BundleSink(bundle, fmt="tar", fsync="none", commit_every=3),
+        checkpoint=checkpoint
+    ).run(records)
+
+    assert summary["checkpoint"]["watermark"] == 12
+    with tarfile.open(bundle) as tar:
+        assert len(tar.getnames()) == 36
+    with BundleReader(bundle) as reader:
+        assert sorted(reader.product_ids()) == sorted(record["product_id"] for record in records)
+
+    print("✓ Tar bundle resume after kill passed")
+
+
+def test_batch_runner_dead_letter(tmp_path):
+    """Test that failing products go to the dead-letter file and the batch goes on"""
+    print("Testing BatchRunner dead-letter file...")
+    from src.pipeline import DeadLetterFile
+
+    records = make_records(6)
+    # Parses, then breaks the price comparison
+    records[4] = dict(records[4], price="N/A")
+    # Id that cannot name a directory (a lone surrogate, valid in JSON)
+    records[2] = dict(records[2], product_id="\ud800")
+
+    dead_letter = DeadLetterFile(str(tmp_path / "dead_letter.jsonl"), fsync="none")
+    summary = BatchRunner(str(tmp_path), workers=2, dead_letter=dead_letter).run(records)
+    dead_letter.close()
+
+    assert summary["products"] == 4 and summary["failed"] == 2
+    assert summary["dead_letter"]["by_stage"] == {"comparison": 1, "parse": 1}
+    assert (tmp_path / "SKU-5" / "faq.json").exists()
+    assert not (tmp_path / "SKU-4").exists()
+
+    with open(tmp_path / "dead_letter.jsonl", encoding="utf-8") as f:
+        entries = sorted((json.loads(line) for line in f), key=lambda entry: entry["ordinal"])
+    assert len(entries) == 2
+    entry = entries[1]
+    assert (entry["ordinal"], entry["product_id"], entry["stage"]) == (4, "SKU-4", "comparison")
+    assert entry["record"] == records[4]
+    assert entry["traceback"].startswith("Traceback")
+    assert (entries[0]["ordinal"], entries[0]["stage"]) == (2, "parse")
+    assert entries[0]["record"] == records[2]
+
+    print("✓ BatchRunner dead-letter file passed")
+
+
+def test_batch_runner_dead_letter_shared_failure(tmp_path):
+    """Test that duplicates failing on one shared render are dead-lettered under their own ids"""
+    print("Testing BatchRunner dead-letter file with duplicates...")
+    import time
+    from src.pipeline import DeadLetterFile
+
+    records = [dict(TEST_DATA, product_id=f"DUP-{i}", price="N/A") for i in range(2)]
+    dead_letter = DeadLetterFile(str(tmp_path / "dead_letter.jsonl"), fsync="none")
+    runner = BatchRunner(str(tmp_path), workers=2, dead_letter=dead_letter)
+    execute = runner.orchestrator.execute
+
+    def slow_execute(record):
+        # Keep the render running until the duplicate waits on it
+        time.sleep(0.2)
+        return execute(record)
+
+    runner.orchestrator.execute = slow_execute
+    summary = runner.run(records)
+    dead_letter.close()
+
+    assert summary["failed"] == 2 and summary["dedupe"]["distinct"] == 1
+    with open(tmp_path / "dead_letter.jsonl", encoding="utf-8") as f:
+        entries = sorted((entry["ordinal"], entry["product_id"]) for entry in map(json.loads, f))
+    assert entries == [(0, "DUP-0"), (1, "DUP-1")]
+
+    print("✓ BatchRunner dead-letter file with duplicates passed")
+
+
+def test_priority_scheduling(tmp_path):
+    """Test that urgent records are taken first and waiting records age"""
+    print("Testing priority scheduling...")
+    import time
+    from src.exceptions import DataValidationError
+    from src.pipeline import AgingPriorityQueue, PriorityResolver, load_priority_file
+
+    resolver = PriorityResolver({"SKU-2": 0})
+    queue = AgingPriorityQueue(resolver.level, maxsize=10, aging_seconds=60)
+    for record in [{"product_id": "SKU-0", "priority": "low"}, {"product_id": "SKU-1"},
+                   {"product_id": "SKU-2", "priority": "low"}, {"product_id": "SKU-3", "priority": "HIGH"},
+                   {"product_id": "SKU-4", "priority": "soon"}]:
+        queue.put(record)
+    assert [queue.get()["product_id"] for _ in range(5)] == ["SKU-2", "SKU-3", "SKU-1", "SKU-4", "SKU-0"]
+    assert resolver.invalid == 1
+    assert set(queue.wait_stats()) == {"urgent", "high", "normal", "low"}
+
+    # A low record that has waited three aging periods overtakes new urgent work
+    queue = AgingPriorityQueue(resolver.level, aging_seconds=0.01)
+    queue.put({"product_id": "SKU-0", "priority": "low"})
+    time.sleep(0.05)
+    queue.put({"product_id": "SKU-1", "priority": "urgent"})
+    assert queue.get()["product_id"] == "SKU-0"
+
+    priority_file = tmp_path / "priorities.csv"
+    priority_file.write_text("product_id,priority\nSKU-1,urgent\nSKU-2,3\n", encoding="utf-8")
+    assert load_priority_file(str(priority_file)) == {"SKU-1": 0, "SKU-2": 3}
+    priority_file.write_text("product_id,priority\nSKU-1,later\n", encoding="utf-8")
+    try:
+        load_priority_file(str(priority_file))
+    except DataValidationError as e:
+        assert "line 2" in str(e)
+    else:
+        raise AssertionError("Expected an invalid priority error")
+
+    records = make_records(8)
+    records[5] = dict(records[5], priority="urgent")
+    summary = BatchRunner(str(tmp_path), workers=2, priorities=PriorityResolver()).run(records)
+    assert summary["products"] == 8
+    assert summary["queue_wait"]["urgent"]["count"] == 1
+    assert summary["queue_wait"]["normal"]["count"] == 7
+
+    print("✓ Priority scheduling passed")
@@ -160,6 +160,198 @@ def test_full_pipeline():
     print("✓ Full Pipeline passed")
 
 
+def test_deadlines():
+    """Test that stages and retries stop at their deadlines"""
+    print("Testing Deadlines...")
+    import time
+    from src.agents import BaseAgent, RetryPolicy
+    from src.content_blocks import BenefitsBlock
+    from src.exceptions import DeadlineExceededError, PipelineStageError
+    from src.utils import Deadline
+    
+    test_data = {
+        "product_name": "Test Product",
+        "concentration": "10% Test",
+        "skin_type": ["Oily"],
+        "key_ingredients": ["Vitamin C"],
+        "benefits": ["Brightening"],
+        "how_to_use": "Apply daily in the morning",
+        "side_effects": "None",
+        "price": "₹500"
+    }
+    
+    deadline = Deadline(60)
+    assert Deadline().remaining() is None and not Deadline().expired()
+    assert deadline.child(0.01).remaining() <= 0.01
+    assert deadline.child(None).expires_at == deadline.expires_at
+    
+    # A slow block: the product page stage is stopped at its next block call
+    generate = BenefitsBlock.generate
+    
+    def slow_generate(self, data):
+        time.sleep(0.1)
+        return generate(self, data)
+    
+    BenefitsBlock.generate = slow_generate
+    try:
+        OrchestratorAgent(agent_timeout=0.05).execute(test_data)
+    except PipelineStageError as e:
+        assert e.stage == "product_page"
+        assert isinstance(e.cause, DeadlineExceededError)
+    else:
+        raise AssertionError("Expected the product page stage to time out")
+    finally:
+        BenefitsBlock.generate = generate
+    
+    # Retries stop when the remaining budget cannot cover the backoff
+    class FlakyAgent(BaseAgent):
+        def execute(self, input_data):
+            self.calls = getattr(self, "calls", 0) + 1
+            raise TimeoutError("flaky")
+    
+    agent = FlakyAgent("FlakyAgent")
+    agent.retry_policy = RetryPolicy(max_attempts=5, base_delay=0.1, jitter=False)
+    try:
+        agent.execute_with_retry({}, deadline=Deadline(0.15))
+    except DeadlineExceededError:
+        assert agent.calls == 2
+    else:
+        raise AssertionError("Expected the retries to run out of time")
+    
+    print("✓ Deadlines passed")
+
+
+def test_retry_policy():
+    """Test retryable errors, the retry budget and the circuit breaker"""
+    print("Testing Retry Policy...")
+    from src.agents import BaseAgent, CircuitBreaker, RetryBudget, RetryPolicy
+    from src.exceptions import AgentExecutionError, CircuitOpenError
+    
+    class Agent(BaseAgent):
+        def __init__(self, errors):
+            super().__init__("RetryTestAgent")
+            self.errors = list(errors)
+            self.calls = 0
+        
+        def execute(self, input_data):
+            self.calls += 1
+            if self.errors:
+                raise self.errors.pop(0)
+            return "ok"
+    
+    policy = RetryPolicy(base_delay=0.01, max_delay=0.04)
+    assert all(0 <= policy.backoff(retry) <= 0.04 for retry in range(10))
+    
+    # Transient errors are retried; deterministic ones fail on the first attempt
+    agent = Agent([OSError("disk busy"), TimeoutError("slow")])
+    agent.retry_policy = policy
+    assert agent.execute_with_retry({}) == "ok" and agent.calls == 3
+    
+    agent = Agent([ValueError("bad price")])
+    agent.retry_policy = policy
+    try:
+        agent.execute_with_retry({})
+    except ValueError:
+        assert agent.calls == 1
+    else:
+        raise AssertionError("Expected the validation error")
+    
+    # The budget allows min_retries plus a ratio of first attempts
+    budget = RetryBudget(ratio=0.5, min_retries=2)
+    agent = Agent([OSError("down")] * 10)
+    agent.retry_policy = RetryPolicy(max_attempts=10, base_delay=0, budget=budget)
+    try:
+        agent.execute_with_retry({})
+    except AgentExecutionError:
+        assert budget.stats() == {"attempts": 1, "retries": 3, "denied": 1}
+    else:
+        raise AssertionError("Expected the retry budget to run out")
+    
+    # Consecutive transient failures open the circuit until the reset timeout
+    agent = Agent([OSError("down")] * 3)
+    agent.retry_policy = RetryPolicy(max_attempts=1)
+    agent.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    for _ in range(2):
+        try:
+            agent.execute_with_retry({})
+        except AgentExecutionError:
+            pass
+    try:
+        agent.execute_with_retry({})
+    except CircuitOpenError:
+        assert agent.calls == 2
+    else:
+        raise AssertionError("Expected the circuit to be open")
+    
+    import time
+    time.sleep(0.06)
+    try:
+        agent.execute_with_retry({})  # Trial call fails: open again
+    except AgentExecutionError:
+        assert agent.circuit_breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    assert agent.execute_with_retry({}) == "ok"
+    assert agent.circuit_breaker.state == CircuitBreaker.CLOSED
+    
+    print("✓ Retry Policy passed")
+
+
+def test_cli_cold_start():
+    """Test that the CLI does not import the pipeline just to parse arguments"""
+    print("Testing CLI cold start...")
+    import subprocess
+    
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(project_root / "src" / "main.py"), "--help"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    imported = {line.split("|")[-1].strip() for line in result.stderr.splitlines() if "|" in line}
+    
+    assert "src.config" in imported
+    assert not any(name.split(".")[0] == "pydantic" for name in imported)
+    assert "src.agents.orchestrator_agent" not in imported
+    assert "http.server" not in imported
+    
+    print("✓ CLI cold start passed")
+
+
+def test_cli_stdin_stdout():
+    """Test that --stdin/--stdout streams JSON Lines and keeps stdout clean"""
+    print("Testing CLI stdin/stdout streaming...")
+    import subprocess
+    
+    product = {
+        "product_name": "Test Product",
+        "concentration": "10% Test",
+        "skin_type": ["Oily"],
+        "key_ingredients": ["Ingredient A"],
+        "benefits": ["Benefit A"],
+        "how_to_use": "Apply daily in the morning",
+        "side_effects": "None",
+        "price": "₹500"
+    }
+    lines = "".join(json.dumps(dict(product, product_id=f"SKU-{i}")) + "\n" for i in range(3))
+    
+    result = subprocess.run(
+        [sys.executable, str(project_root / "src" / "main.py"), "--stdin", "--stdout", "--workers", "1"],
+        input=lines,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        check=True
+    )
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    
+    assert [record["product_id"] for record in records] == ["SKU-0", "SKU-1", "SKU-2"]
+    assert set(records[0]) == {"product_id", "faq", "product_page", "comparison"}
+    assert records[2]["faq"]["product_name"] == "Test Product"
+    assert "Batch Complete" in result.stderr
+    
+    print("✓ CLI stdin/stdout streaming passed")
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -173,6 +365,10 @@ def main():
         test_content_blocks()
         test_templates()
         test_full_pipeline()
+        test_deadlines()
+        test_retry_policy()
+        test_cli_cold_start()
+        test_cli_stdin_stdout()
         
         print()
         print("=" * 60)